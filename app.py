@@ -6,6 +6,9 @@ from datetime import timedelta
 import altair as alt
 import plotly.express as px
 import logging
+import io
+import os
+import tempfile
 
 # Import our custom modules
 from src.data import (
@@ -26,8 +29,23 @@ from src.data import (
     get_tracked_keywords_with_positions,
     get_ga4_event_summary,
     get_ga4_daily_users,
-    get_position_distribution
+    get_position_distribution,
+    get_query_count,
+    reset_query_count,
+    get_table_last_modified,
+    get_dataset_last_modified,
+    EXPORT_DATASETS,
+    stream_export_dataset,
+    update_booking_store,
+    get_daily_with_booking_metrics
 )
+from src.data.export import (
+    EXPORT_FORMATS, cleanup_exports, export_file_name, export_to_file, new_export_path, write_export
+)
+from src.data.refresh import RefreshScheduler
+from src.data.swr_cache import swr_cached
+from src.data.comparison import compare_periods, comparison_windows
+from src.config.settings import settings
 from src.components.enhanced_components import (
     load_enhanced_css,
     create_enhanced_metric_card,
@@ -44,6 +62,22 @@ from src.components.charts import (
     create_keyword_cloud,
     create_performance_gauge
 )
+from src.components.downsampling import (
+    annotate_point_counts,
+    downsample_frame
+)
+from src.components.lazy_sections import (
+    lazy_section,
+    show_query_budget
+)
+from src.components.auto_refresh import auto_refresh_panel
+from src.components.fragments import (
+    SHOW_LOG_KEY,
+    begin_script_run,
+    end_script_run,
+    panel,
+    show_rerun_log
+)
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -57,6 +91,10 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
+# Count the queries this run triggers, for the page-load budget
+reset_query_count()
+begin_script_run()
+
 # Load custom CSS
 load_enhanced_css()
 
@@ -120,54 +158,30 @@ domain = st.sidebar.selectbox(
 # Additional Filters
 st.sidebar.subheader("🔧 Additional Filters")
 
-# Device filter
-device_filter = st.sidebar.multiselect(
-    "Device Type",
-    ["DESKTOP", "MOBILE", "TABLET"],
-    default=["DESKTOP", "MOBILE", "TABLET"]
-)
-
-# Country filter
-country_filter = st.sidebar.text_input(
-    "Country (comma-separated codes)",
-    placeholder="e.g., US,GB,CA",
-    help="Leave empty for all countries"
-)
-
 # Page type filter
 page_type_filter = st.sidebar.selectbox(
     "Page Type",
     ["All pages", "Homepage only", "Landing pages", "Blog posts", "Service pages"]
 )
 
-# CTR threshold
-ctr_threshold = st.sidebar.slider(
-    "Minimum CTR %",
-    min_value=0.0,
-    max_value=10.0,
-    value=0.0,
-    step=0.1,
-    help="Filter results by minimum Click-Through Rate"
-)
-
-# Position threshold
-position_threshold = st.sidebar.slider(
-    "Maximum Average Position",
-    min_value=1,
-    max_value=100,
-    value=100,
-    help="Filter results by maximum average position"
-)
-
 # Auto-refresh option
 st.sidebar.subheader("⚙️ Settings")
-auto_refresh = st.sidebar.checkbox("Auto-refresh (30s)", value=False)
-if auto_refresh:
-    st.experimental_rerun()
+auto_refresh = st.sidebar.checkbox("Auto-refresh", value=False)
+refresh_interval = st.sidebar.number_input(
+    "Refresh check interval (seconds)",
+    min_value=10,
+    max_value=3600,
+    value=settings.auto_refresh_interval,
+    step=10,
+    disabled=not auto_refresh
+)
 
 # Data source toggle
 use_real_data = st.sidebar.checkbox("Use Real Data", value=True)
 
+# Rerun instrumentation toggle
+st.sidebar.checkbox("Show rerun instrumentation", value=False, key=SHOW_LOG_KEY)
+
 # Test connection button
 if st.sidebar.button("🔍 Test Data Connection"):
     with st.spinner("Testing connection..."):
@@ -180,11 +194,57 @@ if st.sidebar.button("🔍 Test Data Connection"):
 st.sidebar.subheader("📥 Export Data")
 export_format = st.sidebar.selectbox(
     "Export Format",
-    ["CSV", "Excel", "JSON"]
+    list(EXPORT_FORMATS),
+    help="JSON exports are newline-delimited, one record per line"
 )
+export_dataset = st.sidebar.selectbox(
+    "Export Dataset",
+    list(EXPORT_DATASETS),
+    format_func=lambda name: EXPORT_DATASETS[name][0]
+)
+
+# Full exports are streamed to disk in chunks, so any row count fits in memory.
+# The browser download holds the file in memory, so it is only offered up to
+# export_max_download_mb; larger files stay on the server until cleaned up.
+if st.sidebar.button("📦 Prepare Full Export", disabled=not use_real_data):
+    export_dir = settings.export_dir or os.path.join(tempfile.gettempdir(), 'marketing-exports')
+    export_name = export_file_name(export_dataset, export_format, f"{start_date}_{end_date}")
+    export_path = new_export_path(export_dir, export_dataset, export_format, f"{start_date}_{end_date}")
+    try:
+        cleanup_exports(export_dir, settings.export_retention_hours * 3600)
+        with st.sidebar:
+            with st.spinner("Exporting..."):
+                result = export_to_file(
+                    stream_export_dataset(
+                        export_dataset,
+                        start_date.strftime('%Y-%m-%d'),
+                        end_date.strftime('%Y-%m-%d')
+                    ),
+                    export_format,
+                    export_path
+                )
+        size_mb = result.bytes / 1024 / 1024
+        st.sidebar.success(f"✅ Exported {result.rows:,} rows ({size_mb:.1f} MB)")
+        if size_mb <= settings.export_max_download_mb:
+            with open(export_path, 'rb') as export_file:
+                st.sidebar.download_button(
+                    label=f"Download {export_format}",
+                    data=export_file.read(),
+                    file_name=export_name,
+                    mime=EXPORT_FORMATS[export_format].mime
+                )
+        else:
+            st.sidebar.info(
+                f"The export is over the {settings.export_max_download_mb} MB browser download limit. "
+                f"It was saved on the server at {export_path} and is kept for "
+                f"{settings.export_retention_hours} hours."
+            )
+    except Exception as e:
+        logger.error(f"Error exporting {export_dataset}: {e}")
+        st.sidebar.error(f"Export failed: {e}")
 
 # Generate sample data (fallback)
-def generate_sample_data():
+def generate_sample_data(start_date, end_date):
     dates = pd.date_range(start=start_date, end=end_date, freq='D')
     
     df_list = []
@@ -213,9 +273,11 @@ def generate_sample_data():
     
     return pd.DataFrame(df_list)
 
-# Load data with caching and domain filtering
-@st.cache_data(ttl=300)  # Cache for 5 minutes
-def load_search_data(start_date, end_date, domain_filter):
+# Load data with caching and domain filtering. Cached loaders may be re-run on
+# a background thread, so every input is an argument and nothing calls st.*
+@swr_cached(ttl=300)  # Cache for 5 minutes
+def load_search_data(start_date, end_date, domain_filter, use_real_data):
+    """Load search data; returns the data and a (level, message) notice or None"""
     try:
         if use_real_data:
             # Use domain filter - if "All domains" is selected, use None
@@ -227,18 +289,16 @@ def load_search_data(start_date, end_date, domain_filter):
                 domain=selected_domain
             )
             if data.empty:
-                st.warning("No real data available, using sample data instead.")
-                return generate_sample_data()
-            return data
+                return generate_sample_data(start_date, end_date), ('warning', "No real data available, using sample data instead.")
+            return data, None
         else:
-            return generate_sample_data()
+            return generate_sample_data(start_date, end_date), None
     except Exception as e:
         logger.error(f"Error loading search data: {e}")
-        st.error(f"Error loading data: {e}")
-        return generate_sample_data()
+        return generate_sample_data(start_date, end_date), ('error', f"Error loading data: {e}")
 
-@st.cache_data(ttl=600)  # Cache for 10 minutes
-def load_keyword_data(domain_filter):
+@swr_cached(ttl=600)  # Cache for 10 minutes
+def load_keyword_data(domain_filter, use_real_data):
     try:
         if use_real_data:
             selected_domain = None if domain_filter == "All domains" else domain_filter
@@ -261,144 +321,151 @@ def load_keyword_data(domain_filter):
         logger.error(f"Error loading keyword data: {e}")
         return pd.DataFrame()
 
-# Main content
-try:
-    # Data Overview Section - ALWAYS AT THE TOP
-    create_section_header("🗃️ BigQuery Data Overview")
+@swr_cached(ttl=300)  # Cache for 5 minutes
+def load_device_data(start_date, end_date):
+    return get_traffic_by_device(
+        start_date.strftime('%Y-%m-%d'),
+        end_date.strftime('%Y-%m-%d'),
+        domain=None
+    )
+
+@swr_cached(ttl=300)
+def load_country_data(start_date, end_date):
+    return get_traffic_by_country(
+        start_date.strftime('%Y-%m-%d'),
+        end_date.strftime('%Y-%m-%d'),
+        limit=10,
+        domain=None
+    )
+
+# Loaders for the lazy sections; they only run once a section is opened
+@swr_cached(ttl=600)  # Cache for 10 minutes
+def load_funnel_data(start_date, end_date):
+    return get_conversion_funnel_data(
+        start_date.strftime('%Y-%m-%d'),
+        end_date.strftime('%Y-%m-%d'),
+        domain=None
+    )
+
+@swr_cached(ttl=600)
+def load_query_category_data():
+    return get_query_category_performance(domain=None)
+
+@swr_cached(ttl=600)
+def load_tracked_keywords():
+    return get_tracked_keywords_with_positions(50)
+
+@swr_cached(ttl=600)
+def load_position_distribution():
+    return get_position_distribution()
+
+@swr_cached(ttl=600)
+def load_daily_trend():
+    return get_search_console_daily_trend(30)
+
+@swr_cached(ttl=3600)
+def load_daily_trend_with_bookings():
+    # Only booking days after the store's watermark are fetched; the join is by date index
+    update_booking_store()
+    return get_daily_with_booking_metrics(get_search_console_daily_trend(30))
+
+@swr_cached(ttl=600)
+def load_ga4_daily_users():
+    return get_ga4_daily_users(7)
+
+@swr_cached(ttl=600)
+def load_ga4_events():
+    return get_ga4_event_summary(7)
+
+@swr_cached(ttl=600)
+def load_top_pages():
+    return get_top_pages_from_view(20)
+
+@swr_cached(ttl=600)
+def load_data_overview():
+    return get_data_overview(None)
+
+@swr_cached(ttl=600)
+def load_daily_volume():
+    return get_daily_data_volume(60, None)
+
+def keyword_tracking_modified():
+    """Latest modification time of the keyword tracking tables"""
+    times = [get_table_last_modified(table) for table in ('keyword_tracking', 'organic_results')]
+    times = [t for t in times if t is not None]
+    return max(times) if times else None
+
+# Refresh scheduler shared by all sessions; reloads only datasets that changed
+@st.cache_resource
+def get_refresh_scheduler():
+    scheduler = RefreshScheduler(settings.auto_refresh_interval)
+    scheduler.register(
+        'search_console',
+        lambda: get_table_last_modified('search_console_data'),
+        [load_search_data.clear, load_keyword_data.clear, load_device_data.clear,
+         load_country_data.clear, load_data_overview.clear, load_daily_volume.clear,
+         load_funnel_data.clear, load_query_category_data.clear,
+         load_daily_trend.clear, load_daily_trend_with_bookings.clear, load_top_pages.clear]
+    )
+    scheduler.register(
+        'keyword_tracking',
+        keyword_tracking_modified,
+        [load_tracked_keywords.clear, load_position_distribution.clear]
+    )
+    scheduler.register(
+        'ga4',
+        lambda: get_dataset_last_modified('analytics_399277695'),
+        [load_ga4_daily_users.clear, load_ga4_events.clear]
+    )
+    return scheduler
+
+if auto_refresh and use_real_data:
+    with st.sidebar:
+        auto_refresh_panel(get_refresh_scheduler(), int(refresh_interval))
+
+# Panels; each reruns on its own when one of its inputs changes
+@panel("performance", inputs=["ctr_threshold", "position_threshold", "device_filter"])
+def render_performance_panel():
+    """Render overview metrics, traffic trends and keyword performance"""
     
-    # Get data overview
-    data_overview = get_data_overview(None)
+    # Panel-local filters; changing them reruns only this panel
+    col1, col2, col3 = st.columns(3)
     
-    if data_overview:
-        # Display data overview metrics
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            st.metric(
-                "Total Rows",
-                f"{data_overview.get('total_rows', 0):,}",
-                help="Total number of rows in search console data"
-            )
-            st.metric(
-                "Unique Queries",
-                f"{data_overview.get('unique_queries', 0):,}",
-                help="Number of unique search queries"
-            )
-        
-        with col2:
-            earliest = data_overview.get('earliest_date')
-            latest = data_overview.get('latest_date')
-            if earliest and latest:
-                st.metric(
-                    "Data Range",
-                    f"{data_overview.get('days_with_data', 0)} days",
-                    help=f"From {earliest} to {latest}"
-                )
-            st.metric(
-                "Unique Pages",
-                f"{data_overview.get('unique_pages', 0):,}",
-                help="Number of unique pages with data"
-            )
-        
-        with col3:
-            last_update = data_overview.get('last_data_date')
-            days_since = data_overview.get('days_since_update', 0)
-            if last_update:
-                st.metric(
-                    "Last Data Update",
-                    f"{last_update}",
-                    f"{days_since} days ago" if days_since > 0 else "Today",
-                    delta_color="inverse" if days_since > 3 else "normal"
-                )
-            st.metric(
-                "Total Clicks",
-                f"{data_overview.get('total_clicks', 0):,}",
-                help="Total clicks across all data"
-            )
-        
-        with col4:
-            st.metric(
-                "Total Impressions", 
-                f"{data_overview.get('total_impressions', 0):,}",
-                help="Total impressions across all data"
-            )
-            st.metric(
-                "Countries",
-                f"{data_overview.get('unique_countries', 0):,}",
-                help="Number of countries in the data"
-            )
-    
-    # Daily Data Volume Chart - Real Search Console Data
-    create_section_header("📈 Daily Search Console Activity")
+    with col1:
+        ctr_threshold = st.slider(
+            "Minimum CTR %",
+            min_value=0.0,
+            max_value=10.0,
+            value=0.0,
+            step=0.1,
+            key="ctr_threshold",
+            help="Filter results by minimum Click-Through Rate"
+        )
     
-    # Get 60 days to show more data points since data is sparse
-    volume_data = get_daily_data_volume(60, None)
-    if not volume_data.empty:
-        # Create a more informative chart
-        col1, col2 = st.columns([3, 1])
-        
-        with col1:
-            fig = px.bar(
-                volume_data,
-                x='date',
-                y='total_clicks',
-                title="Daily Clicks from Search Console (Last 60 Days)",
-                labels={'total_clicks': 'Total Clicks', 'date': 'Date'},
-                color='total_impressions',
-                color_continuous_scale='Blues',
-                hover_data={
-                    'row_count': ':,.0f',
-                    'unique_queries': ':,.0f',
-                    'unique_pages': ':,.0f',
-                    'total_impressions': ':,.0f'
-                }
-            )
-            fig.update_layout(
-                height=400,
-                showlegend=False,
-                hovermode='x unified',
-                xaxis_tickformat='%Y-%m-%d'
-            )
-            fig.update_traces(
-                hovertemplate='<b>Date:</b> %{x}<br>' +
-                             '<b>Clicks:</b> %{y:,.0f}<br>' +
-                             '<b>Impressions:</b> %{customdata[3]:,.0f}<br>' +
-                             '<b>Queries:</b> %{customdata[1]:,.0f}<br>' +
-                             '<b>Pages:</b> %{customdata[2]:,.0f}<br>' +
-                             '<b>Rows:</b> %{customdata[0]:,.0f}<extra></extra>'
-            )
-            st.plotly_chart(fig, use_container_width=True)
-        
-        with col2:
-            # Summary statistics
-            st.metric(
-                "Days with Data",
-                f"{len(volume_data)}",
-                help="Number of days with search console data in the last 60 days"
-            )
-            st.metric(
-                "Total Clicks",
-                f"{volume_data['total_clicks'].sum():,}",
-                help="Sum of all clicks in the displayed period"
-            )
-            st.metric(
-                "Avg Daily Clicks",
-                f"{volume_data['total_clicks'].mean():.1f}",
-                help="Average clicks per day (when data exists)"
-            )
-            st.metric(
-                "Total Queries",
-                f"{volume_data['unique_queries'].sum():,}",
-                help="Total unique queries across all days"
-            )
-    else:
-        st.info("No daily data available for the selected period")
+    with col2:
+        position_threshold = st.slider(
+            "Maximum Average Position",
+            min_value=1,
+            max_value=100,
+            value=100,
+            key="position_threshold",
+            help="Filter results by maximum average position"
+        )
     
-    st.divider()
+    with col3:
+        device_filter = st.multiselect(
+            "Device Type",
+            ["DESKTOP", "MOBILE", "TABLET"],
+            default=["DESKTOP", "MOBILE", "TABLET"],
+            key="device_filter"
+        )
     
     # Load data (domain filter is ignored in simplified queries)
-    search_data = load_search_data(start_date, end_date, None)
-    keyword_data = load_keyword_data(None)
+    search_data, notice = load_search_data(start_date, end_date, None, use_real_data)
+    if notice is not None:
+        level, message = notice
+        (st.warning if level == 'warning' else st.error)(message)
+    keyword_data = load_keyword_data(None, use_real_data)
     
     # Apply additional filters if data is loaded
     if not search_data.empty and 'avg_ctr' in search_data.columns:
@@ -418,8 +485,6 @@ try:
         active_filters.append(f"CTR ≥ {ctr_threshold}%")
     if position_threshold < 100:
         active_filters.append(f"Position ≤ {position_threshold}")
-    if country_filter:
-        active_filters.append(f"Countries: {country_filter}")
     if len(device_filter) < 3:
         active_filters.append(f"Devices: {', '.join(device_filter)}")
     
@@ -436,12 +501,16 @@ try:
         avg_ctr = (total_clicks / total_impressions * 100) if total_impressions > 0 else 0
         avg_position = search_data['avg_position'].mean()
         
-        # Calculate week-over-week changes
-        if len(search_data) > 7:
-            last_week = search_data.tail(7)['total_clicks'].sum()
-            prev_week = search_data.iloc[-14:-7]['total_clicks'].sum() if len(search_data) > 14 else last_week
-            click_change = ((last_week - prev_week) / prev_week * 100) if prev_week > 0 else 0
-        else:
+        # Calculate week-over-week changes over calendar windows, so missing days count as zero
+        week_over_week = compare_periods(
+            search_data,
+            comparison_windows('wow', pd.to_datetime(search_data['date']).max().date()),
+            sums=['total_clicks'],
+            ratios={}
+        )
+        click_change = week_over_week['total_clicks_prev_pct_change'].iloc[0] * 100
+        # No clicks in the previous week gives inf (or NaN); show no change as before
+        if not np.isfinite(click_change):
             click_change = 0
         
         # Display metrics
@@ -497,11 +566,7 @@ try:
         
         with col2:
             # Get device breakdown
-            device_data = get_traffic_by_device(
-                start_date.strftime('%Y-%m-%d'),
-                end_date.strftime('%Y-%m-%d'),
-                domain=None
-            )
+            device_data = load_device_data(start_date, end_date)
             
             # Apply device filter
             if not device_data.empty and device_filter:
@@ -533,14 +598,14 @@ try:
             
             # Add export button
             if st.button("📥 Export Keywords"):
-                if export_format == "CSV":
-                    csv = keyword_data.to_csv(index=False)
-                    st.download_button(
-                        label="Download CSV",
-                        data=csv,
-                        file_name=f"keywords_{start_date}_{end_date}.csv",
-                        mime="text/csv"
-                    )
+                buffer = io.BytesIO()
+                write_export([keyword_data], export_format, buffer)
+                st.download_button(
+                    label=f"Download {export_format}",
+                    data=buffer.getvalue(),
+                    file_name=export_file_name('keywords', export_format, f"{start_date}_{end_date}"),
+                    mime=EXPORT_FORMATS[export_format].mime
+                )
             
             st.dataframe(
                 keyword_data.head(10).style.format({
@@ -562,20 +627,26 @@ try:
                     "Top Keywords by Clicks"
                 )
                 st.plotly_chart(fig, use_container_width=True)
+
+@panel("geography", inputs=["country_filter"])
+def render_geography_panel():
+    """Render traffic by country"""
     
-    # Geographic Performance
     create_section_header("🌍 Geographic Performance")
     
+    # Panel-local filter; changing it reruns only this panel
+    country_filter = st.text_input(
+        "Country (comma-separated codes)",
+        placeholder="e.g., US,GB,CA",
+        key="country_filter",
+        help="Leave empty for all countries"
+    )
+    
     col1, col2 = st.columns(2)
     
     with col1:
         # Get country data
-        country_data = get_traffic_by_country(
-            start_date.strftime('%Y-%m-%d'),
-            end_date.strftime('%Y-%m-%d'),
-            limit=10,
-            domain=None
-        )
+        country_data = load_country_data(start_date, end_date)
         
         # Apply country filter if specified
         if country_filter and not country_data.empty:
@@ -612,25 +683,27 @@ try:
                 yaxis={'categoryorder': 'total ascending'}
             )
             st.plotly_chart(fig, use_container_width=True)
-    
-    # Conversion Funnel
-    create_section_header("🎯 Conversion Funnel")
+
+@panel("section:{0}", inputs=["load_section_{0}"])
+def render_lazy_panel(key, title, render):
+    """Render a lazy section as its own panel"""
+    lazy_section(key, title, render)
+
+# Lazy sections
+def render_conversion_funnel_section():
+    """Render the conversion funnel section"""
     
     # Get funnel data
-    funnel_data = get_conversion_funnel_data(
-        start_date.strftime('%Y-%m-%d'),
-        end_date.strftime('%Y-%m-%d'),
-        domain=None
-    )
+    funnel_data = load_funnel_data(start_date, end_date)
     
     if funnel_data:
         fig = create_conversion_funnel(funnel_data)
         st.plotly_chart(fig, use_container_width=True)
+
+def render_query_type_section():
+    """Render the branded vs. non-branded query section"""
     
-    # Query Category Performance
-    create_section_header("📊 Performance by Query Type")
-    
-    query_category_data = get_query_category_performance(domain=None)
+    query_category_data = load_query_category_data()
     
     if not query_category_data.empty:
         col1, col2 = st.columns(2)
@@ -654,15 +727,15 @@ try:
                     f"{row['total_clicks']:,} clicks",
                     f"CTR: {row['avg_ctr_percentage']:.2f}%"
                 )
-    
-    # Keyword Position Tracking
-    create_section_header("📍 Keyword Position Tracking")
+
+def render_position_tracking_section():
+    """Render the keyword position tracking section"""
     
     col1, col2 = st.columns([2, 1])
     
     with col1:
         # Tracked keywords with positions
-        tracked_keywords = get_tracked_keywords_with_positions(50)
+        tracked_keywords = load_tracked_keywords()
         if not tracked_keywords.empty:
             st.subheader("Top Tracked Keywords by Position")
             st.dataframe(
@@ -675,7 +748,7 @@ try:
     
     with col2:
         # Position distribution
-        position_dist = get_position_distribution()
+        position_dist = load_position_distribution()
         if not position_dist.empty:
             st.subheader("Position Distribution")
             fig = px.pie(
@@ -688,18 +761,23 @@ try:
             fig.update_traces(textposition='inside', textinfo='percent+label')
             fig.update_layout(height=400, showlegend=False)
             st.plotly_chart(fig, use_container_width=True)
+
+def render_daily_trend_view_section():
+    """Render the daily trends from the search_console_overview view"""
     
-    # Search Console Daily Trends from View
-    create_section_header("📈 Search Console Daily Trends (View)")
-    
-    daily_trend = get_search_console_daily_trend(30)
+    daily_trend = load_daily_trend()
     if not daily_trend.empty:
         # Create tabs for different metrics
-        tab1, tab2, tab3 = st.tabs(["Clicks & Impressions", "CTR Trend", "Position Trend"])
+        tab1, tab2, tab3, tab4 = st.tabs(
+            ["Clicks & Impressions", "CTR Trend", "Position Trend", "Clicks vs Bookings"]
+        )
         
         with tab1:
+            trend_plot, sampling = downsample_frame(
+                daily_trend, 'date', ['total_clicks', 'total_impressions']
+            )
             fig = px.line(
-                daily_trend,
+                trend_plot,
                 x='date',
                 y=['total_clicks', 'total_impressions'],
                 title="Daily Clicks and Impressions",
@@ -711,11 +789,13 @@ try:
                 hovermode='x unified',
                 yaxis2=dict(overlaying='y', side='right')
             )
+            annotate_point_counts(fig, [sampling])
             st.plotly_chart(fig, use_container_width=True)
         
         with tab2:
+            trend_plot, sampling = downsample_frame(daily_trend, 'date', ['ctr_percentage'])
             fig = px.area(
-                daily_trend,
+                trend_plot,
                 x='date',
                 y='ctr_percentage',
                 title="Click-Through Rate Trend",
@@ -723,29 +803,59 @@ try:
                 line_shape='spline'
             )
             fig.update_layout(height=400)
+            annotate_point_counts(fig, [sampling])
             st.plotly_chart(fig, use_container_width=True)
         
         with tab3:
+            trend_plot, sampling = downsample_frame(daily_trend, 'date', ['avg_position'])
             fig = px.line(
-                daily_trend,
+                trend_plot,
                 x='date',
                 y='avg_position',
                 title="Average Position Trend (Lower is Better)",
                 labels={'avg_position': 'Average Position'},
                 line_shape='spline'
             )
-            fig.update_yaxis(autorange='reversed')
+            fig.update_yaxes(autorange='reversed')
             fig.update_layout(height=400)
+            annotate_point_counts(fig, [sampling])
             st.plotly_chart(fig, use_container_width=True)
-    
-    # GA4 Analytics Section
-    create_section_header("📊 Google Analytics 4 Data")
+        
+        with tab4:
+            with_bookings = load_daily_trend_with_bookings()
+            if 'bookings' in with_bookings.columns:
+                fig = px.line(
+                    with_bookings,
+                    x='date',
+                    y='total_clicks',
+                    title="Daily Clicks and Bookings",
+                    labels={'total_clicks': 'Clicks'},
+                    line_shape='spline'
+                )
+                fig.add_scatter(
+                    x=with_bookings['date'],
+                    y=with_bookings['bookings'],
+                    name='Bookings',
+                    mode='lines',
+                    yaxis='y2'
+                )
+                fig.update_layout(
+                    height=400,
+                    hovermode='x unified',
+                    yaxis2=dict(title='Bookings', overlaying='y', side='right')
+                )
+                st.plotly_chart(fig, use_container_width=True)
+            else:
+                st.info("Booking metrics are not available; check the booking API connection")
+
+def render_ga4_section():
+    """Render the GA4 users and events section"""
     
     col1, col2 = st.columns(2)
     
     with col1:
         # GA4 Daily Users
-        ga4_users = get_ga4_daily_users(7)
+        ga4_users = load_ga4_daily_users()
         if not ga4_users.empty:
             st.subheader("Daily Active Users")
             fig = px.bar(
@@ -762,7 +872,7 @@ try:
     
     with col2:
         # GA4 Event Summary
-        ga4_events = get_ga4_event_summary(7)
+        ga4_events = load_ga4_events()
         if not ga4_events.empty:
             st.subheader("Top Events (Last 7 Days)")
             st.dataframe(
@@ -773,11 +883,11 @@ try:
                 use_container_width=True,
                 height=350
             )
+
+def render_top_pages_section():
+    """Render the top pages from the page_performance view"""
     
-    # Top Pages from View
-    create_section_header("📄 Top Performing Pages (from View)")
-    
-    top_pages = get_top_pages_from_view(20)
+    top_pages = load_top_pages()
     if not top_pages.empty:
         # Clean URLs for display
         top_pages['clean_url'] = top_pages['url'].apply(
@@ -817,6 +927,152 @@ try:
                 "Avg Position",
                 f"{top_pages['avg_position'].mean():.1f}"
             )
+
+# Main content
+try:
+    # Data Overview Section - ALWAYS AT THE TOP
+    create_section_header("🗃️ BigQuery Data Overview")
+    
+    # Get data overview
+    data_overview = load_data_overview()
+    
+    if data_overview:
+        # Display data overview metrics
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.metric(
+                "Total Rows",
+                f"{data_overview.get('total_rows', 0):,}",
+                help="Total number of rows in search console data"
+            )
+            st.metric(
+                "Unique Queries",
+                f"{data_overview.get('unique_queries', 0):,}",
+                help="Number of unique search queries"
+            )
+        
+        with col2:
+            earliest = data_overview.get('earliest_date')
+            latest = data_overview.get('latest_date')
+            if earliest and latest:
+                st.metric(
+                    "Data Range",
+                    f"{data_overview.get('days_with_data', 0)} days",
+                    help=f"From {earliest} to {latest}"
+                )
+            st.metric(
+                "Unique Pages",
+                f"{data_overview.get('unique_pages', 0):,}",
+                help="Number of unique pages with data"
+            )
+        
+        with col3:
+            last_update = data_overview.get('last_data_date')
+            days_since = data_overview.get('days_since_update', 0)
+            if last_update:
+                st.metric(
+                    "Last Data Update",
+                    f"{last_update}",
+                    f"{days_since} days ago" if days_since > 0 else "Today",
+                    delta_color="inverse" if days_since > 3 else "normal"
+                )
+            st.metric(
+                "Total Clicks",
+                f"{data_overview.get('total_clicks', 0):,}",
+                help="Total clicks across all data"
+            )
+        
+        with col4:
+            st.metric(
+                "Total Impressions", 
+                f"{data_overview.get('total_impressions', 0):,}",
+                help="Total impressions across all data"
+            )
+            st.metric(
+                "Countries",
+                f"{data_overview.get('unique_countries', 0):,}",
+                help="Number of countries in the data"
+            )
+    
+    # Daily Data Volume Chart - Real Search Console Data
+    create_section_header("📈 Daily Search Console Activity")
+    
+    # Get 60 days to show more data points since data is sparse
+    volume_data = load_daily_volume()
+    if not volume_data.empty:
+        # Create a more informative chart
+        col1, col2 = st.columns([3, 1])
+        
+        with col1:
+            fig = px.bar(
+                volume_data,
+                x='date',
+                y='total_clicks',
+                title="Daily Clicks from Search Console (Last 60 Days)",
+                labels={'total_clicks': 'Total Clicks', 'date': 'Date'},
+                color='total_impressions',
+                color_continuous_scale='Blues',
+                hover_data={
+                    'row_count': ':,.0f',
+                    'unique_queries': ':,.0f',
+                    'unique_pages': ':,.0f',
+                    'total_impressions': ':,.0f'
+                }
+            )
+            fig.update_layout(
+                height=400,
+                showlegend=False,
+                hovermode='x unified',
+                xaxis_tickformat='%Y-%m-%d'
+            )
+            fig.update_traces(
+                hovertemplate='<b>Date:</b> %{x}<br>' +
+                             '<b>Clicks:</b> %{y:,.0f}<br>' +
+                             '<b>Impressions:</b> %{customdata[3]:,.0f}<br>' +
+                             '<b>Queries:</b> %{customdata[1]:,.0f}<br>' +
+                             '<b>Pages:</b> %{customdata[2]:,.0f}<br>' +
+                             '<b>Rows:</b> %{customdata[0]:,.0f}<extra></extra>'
+            )
+            st.plotly_chart(fig, use_container_width=True)
+        
+        with col2:
+            # Summary statistics
+            st.metric(
+                "Days with Data",
+                f"{len(volume_data)}",
+                help="Number of days with search console data in the last 60 days"
+            )
+            st.metric(
+                "Total Clicks",
+                f"{volume_data['total_clicks'].sum():,}",
+                help="Sum of all clicks in the displayed period"
+            )
+            st.metric(
+                "Avg Daily Clicks",
+                f"{volume_data['total_clicks'].mean():.1f}",
+                help="Average clicks per day (when data exists)"
+            )
+            st.metric(
+                "Total Queries",
+                f"{volume_data['unique_queries'].sum():,}",
+                help="Total unique queries across all days"
+            )
+    else:
+        st.info("No daily data available for the selected period")
+    
+    st.divider()
+    
+    render_performance_panel()
+    render_geography_panel()
+    
+    # Sections below load their data only once opened
+    render_lazy_panel("conversion_funnel", "🎯 Conversion Funnel", render_conversion_funnel_section)
+    render_lazy_panel("query_type", "📊 Performance by Query Type", render_query_type_section)
+    render_lazy_panel("position_tracking", "📍 Keyword Position Tracking", render_position_tracking_section)
+    render_lazy_panel("daily_trend_view", "📈 Search Console Daily Trends (View)", render_daily_trend_view_section)
+    render_lazy_panel("ga4", "📊 Google Analytics 4 Data", render_ga4_section)
+    render_lazy_panel("top_pages", "📄 Top Performing Pages (from View)", render_top_pages_section)
     
     # Info box
     create_info_box(
@@ -829,6 +1085,12 @@ except Exception as e:
     st.error(f"An error occurred while loading the dashboard: {str(e)}")
     st.info("Please check your data connection and try again.")
 
+# Page-load budget
+show_query_budget(get_query_count(), settings.page_query_budget)
+show_rerun_log()
+
 # Footer
 st.write("---")
-st.write("Dashboard last updated: " + datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
\ No newline at end of file
+st.write("Dashboard last updated: " + datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+
+end_script_run()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark the booking API clients against the booking API stand-in
+
+The stand-in (``booking_api_standin.py``) answers after an injected delay and
+can fail a share of requests with 503, so serial calls, threaded
+``fetch_many`` calls, the asyncio client and retries can be compared offline.
+Responses carry ETag and Last-Modified validators and conditional GETs are
+answered with 304, to measure the response cache. Usage:
+
+    python benchmark_api.py --latency 0.2 --failure-rate 0.1 --rounds 5
+"""
+
+import argparse
+import logging
+import time
+
+from booking_api_standin import BookingAPIStandIn, Latency, StandInConfig
+from src.config.settings import settings
+from src.data import api_client
+from src.data.api_client import MarketingAPIClient
+from src.data.async_api_client import get_booking_overview_sync, run_api_calls
+from src.data.http_cache import get_response_cache_stats, response_cache
+
+# Endpoints that rarely change, fetched repeatedly to measure the response cache
+RARELY_CHANGING = {
+    'vehicles': lambda client: client.get_vehicle_stats(),
+    'system/customer-stats': lambda client: client.get_customer_stats(),
+    'system/route-performance': lambda client: client.get_route_performance(500)
+}
+
+
+def serial_overview(client: MarketingAPIClient, start_date: str, end_date: str):
+    """The booking overview with one endpoint after another"""
+    return {
+        'booking_stats': client.get_booking_stats(start_date, end_date),
+        'revenue': client.get_revenue_data('30d'),
+        'quote_stats': client.get_quote_stats(30),
+        'customer_stats': client.get_customer_stats(),
+        'payment_stats': client.get_payment_stats(30),
+        'route_performance': client.get_route_performance(10)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the booking API client')
+    parser.add_argument('--latency', type=float, default=0.2, help='Seconds the stand-in waits per request')
+    parser.add_argument('--failure-rate', type=float, default=0.1, help='Share of requests answered with 503')
+    parser.add_argument('--rounds', type=int, default=5, help='Overviews fetched per mode')
+    parser.add_argument('--fan-out', type=int, default=10,
+                        help='Overviews fetched at once to compare threads with asyncio')
+    parser.add_argument('--per-host', type=int, default=settings.api_per_host_limit,
+                        help='Requests in flight per host for the asyncio client')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    # Fanning out threads overflows the connection pool; count that, don't log it
+    logging.getLogger('urllib3.connectionpool').setLevel(logging.ERROR)
+
+    # Large vehicle and route lists, so cached payloads are worth keeping
+    server = BookingAPIStandIn(config=StandInConfig(
+        latency=Latency('fixed', args.latency), error_rate=args.failure_rate,
+        error_statuses=(503,), vehicles=200, routes=500
+    )).start()
+    settings.api_base_url = server.base_url
+    settings.api_backoff_factor = 0.05
+    settings.api_per_host_limit = args.per_host
+
+    # Measure the transport on its own first; the rate limiter stays off
+    # throughout (benchmark_rate_limit.py covers it)
+    settings.api_cache_enabled = False
+    settings.api_rate_limit_enabled = False
+    client = MarketingAPIClient()
+    start_date, end_date = '2025-05-01', '2025-05-31'
+
+    print(f"{args.latency * 1000:.0f} ms latency, {args.failure_rate:.0%} of requests fail with 503, "
+          f"{settings.api_pool_size} pooled connections, {args.per_host} async requests per host")
+    print("-" * 70)
+
+    def fan_out_threads():
+        results = client.fetch_many({
+            str(i): (lambda: client.get_booking_overview(start_date, end_date)) for i in range(args.fan_out)
+        }, max_workers=args.fan_out)
+        return {f"{i}.{name}": value for i, overview in results.items() for name, value in overview.items()}
+
+    def fan_out_async():
+        async def overviews(async_client):
+            return await async_client.fetch_many({
+                str(i): async_client.get_booking_overview(start_date, end_date) for i in range(args.fan_out)
+            })
+        results = run_api_calls(overviews)
+        return {f"{i}.{name}": value for i, overview in results.items() for name, value in overview.items()}
+
+    modes = (
+        ('serial', 1, lambda: serial_overview(client, start_date, end_date)),
+        ('fetch_many', 1, lambda: client.get_booking_overview(start_date, end_date)),
+        ('async', 1, lambda: get_booking_overview_sync(start_date, end_date)),
+        (f"threads x{args.fan_out}", args.fan_out, fan_out_threads),
+        (f"async x{args.fan_out}", args.fan_out, fan_out_async)
+    )
+    for label, overviews, fetch in modes:
+        fetch()  # Warm up connections
+        server.reset_stats()
+        missing = 0
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            missing += sum(result is None for result in fetch().values())
+        seconds = (time.perf_counter() - start) / args.rounds
+        print(f"{label:<12} {seconds * 1000:>8.0f} ms per {overviews} overview(s)  "
+              f"{server.requests:>4} requests over {server.connections:>3} new connections, "
+              f"{missing} endpoints missing")
+
+    # Rarely changing endpoints fetched over and over, without and with the cache
+    server.config.error_rate = 0
+    settings.api_cache_enabled = True
+    cached_client = MarketingAPIClient()
+
+    print("-" * 70)
+    for label, fetch_client, ttls in (('no cache', client, None),
+                                      ('304 revalidation', cached_client, {}),
+                                      ('fresh hits', cached_client, None)):
+        if ttls is not None:
+            # Expire every entry immediately so each call revalidates
+            api_client.ENDPOINT_CACHE_TTLS, saved_ttls = ttls, api_client.ENDPOINT_CACHE_TTLS
+            response_cache.ttl, saved_ttl = 0, response_cache.ttl
+        fetch_client.get_vehicle_stats()  # Warm up
+        server.reset_stats()
+        start = time.perf_counter()
+        for _ in range(args.rounds * 10):
+            for fetch in RARELY_CHANGING.values():
+                fetch(fetch_client)
+        seconds = (time.perf_counter() - start) / (args.rounds * 10 * len(RARELY_CHANGING))
+        print(f"{label:<18} {seconds * 1000:>7.1f} ms per call  {server.requests:>4} requests")
+        if ttls is not None:
+            api_client.ENDPOINT_CACHE_TTLS, response_cache.ttl = saved_ttls, saved_ttl
+
+    stats = get_response_cache_stats()
+    print(f"Cache: {stats['fresh_hits']} fresh hits, {stats['not_modified']} 304s, "
+          f"{stats['misses']} downloads, 304 rate {stats['not_modified_rate']:.0%}, "
+          f"{stats['bytes_saved'] / 1024:,.0f} KiB saved of "
+          f"{(stats['bytes_saved'] + stats['bytes_downloaded']) / 1024:,.0f} KiB")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark decoding and DataFrame conversion of booking API payloads
+
+Builds large ``revenue_by_day`` and ``quotes_by_day`` payloads and compares
+the previous path (``json.loads`` and a DataFrame built from a list of dicts)
+with the current one (orjson and column-by-column conversion). Also compares
+vehicle records kept as dicts and as slotted dataclasses. Usage:
+
+    python benchmark_api_parsing.py --rows 200000
+"""
+
+import argparse
+import json
+import random
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+import pandas as pd
+
+from src.data.api_client import (
+    _parse_vehicle_stats, quote_timeline_to_dataframe, revenue_timeline_to_dataframe
+)
+from src.data.api_records import decode_json, orjson
+
+
+def make_payloads(rows: int):
+    """Build revenue and quote timelines with one record per day and route"""
+    random.seed(3)
+    start = date(2023, 1, 1)
+    revenue = [{
+        'date': (start + timedelta(days=i % 730)).isoformat(),
+        'route': f"route-{i % 300}",
+        'revenue': round(random.uniform(50, 5000), 2),
+        'bookings': random.randint(0, 60),
+        'avg_booking_value': round(random.uniform(40, 160), 2)
+    } for i in range(rows)]
+    quotes = [{
+        'date': (start + timedelta(days=i % 730)).isoformat(),
+        'route': f"route-{i % 300}",
+        'quotes': random.randint(0, 400),
+        'converted': random.randint(0, 40),
+        'average_quote_value': round(random.uniform(40, 160), 2)
+    } for i in range(rows)]
+    return (json.dumps({'revenue_by_day': revenue}).encode(),
+            json.dumps({'quotes_by_day': quotes}).encode())
+
+
+def previous_frame(payload: bytes, key: str) -> pd.DataFrame:
+    """Decode and convert the way the client used to"""
+    df = pd.DataFrame(json.loads(payload)[key])
+    df['date'] = pd.to_datetime(df['date'])
+    return df
+
+
+def timed(func, repeat: int = 3):
+    """Best of a few runs, in seconds"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark API payload decoding and conversion')
+    parser.add_argument('--rows', type=int, default=200000, help='Records per timeline')
+    parser.add_argument('--vehicles', type=int, default=100000, help='Vehicle records')
+    args = parser.parse_args()
+
+    revenue_payload, quote_payload = make_payloads(args.rows)
+    print(f"{args.rows:,} records per timeline, {len(revenue_payload) / 1e6:.1f} MB revenue payload, "
+          f"decoder: {'orjson' if orjson is not None else 'json (orjson not installed)'}")
+    print("-" * 70)
+
+    for name, payload, key, convert in (
+            ('revenue_by_day', revenue_payload, 'revenue_by_day', revenue_timeline_to_dataframe),
+            ('quotes_by_day', quote_payload, 'quotes_by_day', quote_timeline_to_dataframe)):
+        old_decode, old_data = timed(lambda: json.loads(payload))
+        old_total, old_frame = timed(lambda: previous_frame(payload, key))
+        new_decode, new_data = timed(lambda: decode_json(payload))
+        new_convert, new_frame = timed(lambda: convert(new_data))
+        new_total = new_decode + new_convert
+
+        same = old_frame.equals(new_frame.astype(old_frame.dtypes.to_dict()))
+        print(f"{name:<15} previous: decode {old_decode * 1000:6.0f} ms, total {old_total * 1000:6.0f} ms")
+        print(f"{'':<15} current:  decode {new_decode * 1000:6.0f} ms, total {new_total * 1000:6.0f} ms  "
+              f"({old_total / new_total:.1f}x, same frame: {same})")
+
+    vehicles = [{'name': f"Vehicle {i}", 'capacity': 4 + i % 12, 'price_per_km': 1.5,
+                 'bookings_count': i * 3, 'total_revenue': i * 260.0} for i in range(args.vehicles)]
+
+    def as_dicts():
+        return [{
+            'vehicle_type': vehicle.get('name', 'Unknown'),
+            'capacity': vehicle.get('capacity', 0),
+            'price_per_km': vehicle.get('price_per_km', 0),
+            'bookings_count': vehicle.get('bookings_count', 0),
+            'revenue': vehicle.get('total_revenue', 0)
+        } for vehicle in vehicles]
+
+    print("-" * 70)
+    for label, build in (('vehicle dicts', as_dicts), ('slotted records', lambda: _parse_vehicle_stats(vehicles))):
+        seconds, _ = timed(build)
+        tracemalloc.start()
+        records = build()
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{label:<15} {seconds * 1000:6.0f} ms, {size / len(records):5.0f} bytes per record")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Load-test the booking API client against the booking API stand-in
+
+Simulated users call client methods back to back, picked by weight from a
+mix, for a fixed time, with either the threaded sync client or the asyncio
+client. Throughput, failures and latency percentiles are reported per method
+together with how the server answered. By default a stand-in is started
+in-process with the latency and failure options below; ``--url`` targets one
+already running (``python booking_api_standin.py``). Usage:
+
+    python benchmark_booking_load.py --users 32 --seconds 20 --latency lognormal:40:0.6 --error-rate 0.02
+    python benchmark_booking_load.py --mode async --mix overview=1 --cache
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from booking_api_standin import BookingAPIStandIn, add_standin_arguments, config_from_args
+from src.config.settings import settings
+from src.data.api_client import MarketingAPIClient
+from src.data.async_api_client import AsyncMarketingAPIClient
+from src.data.http_cache import get_response_cache_stats
+from src.data.rate_limit import get_rate_limit_stats
+
+END_DATE = date.today().isoformat()
+START_DATE = (date.today() - timedelta(days=29)).isoformat()
+
+# Client calls a simulated user makes; the same for the sync and async clients
+CALLS = {
+    'booking_stats': lambda client: client.get_booking_stats(START_DATE, END_DATE),
+    'revenue': lambda client: client.get_revenue_data('30d'),
+    'vehicles': lambda client: client.get_vehicle_stats(),
+    'quotes': lambda client: client.get_quote_stats(30),
+    'customers': lambda client: client.get_customer_stats(),
+    'routes': lambda client: client.get_route_performance(10),
+    'payments': lambda client: client.get_payment_stats(30),
+    'health': lambda client: client.test_connection(),
+    'overview': lambda client: client.get_booking_overview(START_DATE, END_DATE)
+}
+
+DEFAULT_MIX = 'booking_stats=3,revenue=3,quotes=2,payments=2,routes=2,customers=1,vehicles=1,health=1'
+
+
+def succeeded(name: str, result: Any) -> bool:
+    """Whether a call returned data; an overview needs every part"""
+    if name == 'overview':
+        return all(value is not None for value in result.values())
+    return result is not None and result is not False
+
+
+def parse_mix(spec: str) -> Tuple[List[str], List[float]]:
+    """Parse ``name=weight,...`` into call names and weights"""
+    names, weights = [], []
+    for item in spec.split(','):
+        name, _, weight = item.partition('=')
+        if name not in CALLS:
+            raise SystemExit(f"Unknown call {name}; choose from {', '.join(CALLS)}")
+        names.append(name)
+        weights.append(float(weight or 1))
+    return names, weights
+
+
+def run_sync(users: int, seconds: float, names: List[str], weights: List[float], seed: int):
+    """Users as threads sharing one pooled MarketingAPIClient"""
+    client = MarketingAPIClient()
+    stop = time.perf_counter() + seconds
+    samples = []
+    lock = threading.Lock()
+
+    def user(rng: random.Random):
+        local = []
+        while time.perf_counter() < stop:
+            name = rng.choices(names, weights)[0]
+            start = time.perf_counter()
+            result = CALLS[name](client)
+            local.append((name, time.perf_counter() - start, succeeded(name, result)))
+        with lock:
+            samples.extend(local)
+
+    threads = [threading.Thread(target=user, args=(random.Random(seed + i),)) for i in range(users)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples
+
+
+def run_async(users: int, seconds: float, names: List[str], weights: List[float], seed: int):
+    """Users as coroutines sharing one AsyncMarketingAPIClient"""
+    async def main():
+        samples = []
+        async with AsyncMarketingAPIClient() as client:
+            stop = time.perf_counter() + seconds
+
+            async def user(rng: random.Random):
+                while time.perf_counter() < stop:
+                    name = rng.choices(names, weights)[0]
+                    start = time.perf_counter()
+                    result = await CALLS[name](client)
+                    samples.append((name, time.perf_counter() - start, succeeded(name, result)))
+
+            await asyncio.gather(*(user(random.Random(seed + i)) for i in range(users)))
+        return samples
+
+    return asyncio.run(main())
+
+
+def report(samples, seconds: float) -> None:
+    """Print throughput, failures and latency percentiles per call and overall"""
+    by_call: Dict[str, list] = defaultdict(list)
+    for name, elapsed, ok in samples:
+        by_call[name].append((elapsed, ok))
+    by_call['all'] = [(elapsed, ok) for _, elapsed, ok in samples]
+
+    print(f"{'call':<14} {'calls':>7} {'calls/s':>8} {'failed':>7} "
+          f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for name, calls in sorted(by_call.items(), key=lambda item: (item[0] == 'all', item[0])):
+        if not calls:
+            continue
+        latency = np.array([elapsed for elapsed, _ in calls]) * 1000
+        failed = sum(1 for _, ok in calls if not ok)
+        p50, p95, p99 = np.percentile(latency, [50, 95, 99])
+        print(f"{name:<14} {len(calls):>7} {len(calls) / seconds:>8.1f} {failed / len(calls):>7.1%} "
+              f"{p50:>8.1f} {p95:>8.1f} {p99:>8.1f} {latency.max():>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test the booking API client')
+    parser.add_argument('--url', default=None, help='Base URL of a running stand-in; starts one if omitted')
+    parser.add_argument('--mode', choices=('sync', 'async'), default='sync', help='Client to drive')
+    parser.add_argument('--users', type=int, default=16, help='Simulated users calling back to back')
+    parser.add_argument('--seconds', type=float, default=10, help='Length of the run')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help=f"Calls and weights, from: {', '.join(CALLS)}")
+    parser.add_argument('--cache', action='store_true', help='Enable the response cache')
+    parser.add_argument('--client-rate-limit', action='store_true', help='Enable the client rate limiter')
+    parser.add_argument('--per-host', type=int, default=settings.api_per_host_limit,
+                        help='Requests in flight per host for the asyncio client')
+    add_standin_arguments(parser)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+    names, weights = parse_mix(args.mix)
+
+    server = None
+    if args.url:
+        settings.api_base_url = args.url.rstrip('/')
+    else:
+        server = BookingAPIStandIn(config=config_from_args(args)).start()
+        settings.api_base_url = server.base_url
+    settings.api_cache_enabled = args.cache
+    settings.api_rate_limit_enabled = args.client_rate_limit
+    settings.api_per_host_limit = args.per_host
+    settings.api_pool_size = max(settings.api_pool_size, args.users)
+    settings.api_backoff_factor = 0.05
+
+    target = 'in-process stand-in' if server else settings.api_base_url
+    print(f"{args.users} {args.mode} users for {args.seconds:.0f} s against {target}, "
+          f"cache {'on' if args.cache else 'off'}, client rate limit {'on' if args.client_rate_limit else 'off'}")
+    print("-" * 78)
+
+    run = run_sync if args.mode == 'sync' else run_async
+    start = time.perf_counter()
+    samples = run(args.users, args.seconds, names, weights, args.seed)
+    report(samples, time.perf_counter() - start)
+
+    print("-" * 78)
+    if server is not None:
+        stats = server.stats()
+        statuses = ', '.join(f"{status}: {count}" for status, count in sorted(stats['statuses'].items(), key=str))
+        print(f"Server: {stats['requests']} requests over {stats['connections']} connections, "
+              f"{stats['bytes_sent'] / 1024:,.0f} KiB sent ({statuses})")
+        server.shutdown()
+    if args.cache:
+        cache = get_response_cache_stats()
+        print(f"Cache: {cache['fresh_hits']} fresh hits, {cache['not_modified']} 304s, {cache['misses']} downloads")
+    if args.client_rate_limit:
+        for group, limits in get_rate_limit_stats().items():
+            print(f"Rate limit {group}: {limits['admitted']} admitted, {limits['rejected']} rejected, "
+                  f"{limits['throttled']} throttled, rate {limits['rate']:.1f}/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark the booking time-series store against re-fetching full histories
+
+The booking API stand-in (``booking_api_standin.py``) returns one
+``revenue_by_day`` or ``quotes_by_day`` record per day of the requested
+period or date range. The previous refresh fetches the whole history of both
+timelines and merges them with Search Console daily aggregates; the store
+fetches only the days after its watermarks and joins through its date
+index. Usage:
+
+    python benchmark_booking_store.py --days 730 --latency 0.05
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+import pandas as pd
+
+from booking_api_standin import BookingAPIStandIn, Latency, StandInConfig
+from src.config.settings import settings
+from src.data.api_client import MarketingAPIClient, quote_timeline_to_dataframe, revenue_timeline_to_dataframe
+from src.data.booking_store import BookingTimeSeriesStore
+
+
+def search_console_daily(days: int) -> pd.DataFrame:
+    """Daily Search Console aggregates as the dashboard loads them"""
+    today = date.today()
+    return pd.DataFrame({
+        'date': pd.date_range(today - timedelta(days=days), periods=days, freq='D'),
+        'clicks': [random.randint(100, 2000) for _ in range(days)],
+        'impressions': [random.randint(5000, 90000) for _ in range(days)]
+    })
+
+
+def full_refresh(client: MarketingAPIClient, daily: pd.DataFrame, days: int) -> pd.DataFrame:
+    """Re-fetch both full histories and merge them with the daily aggregates"""
+    # The period counts back from today, so one more day reaches the store's first day
+    revenue = revenue_timeline_to_dataframe(client.get_revenue_data(period=f"{days + 1}d"))
+    end = date.today() - timedelta(days=1)
+    quotes = quote_timeline_to_dataframe(client.get_quote_stats(
+        start_date=(end - timedelta(days=days - 1)).isoformat(), end_date=end.isoformat()
+    ))
+    merged = daily.merge(revenue, on='date', how='left')
+    return merged.merge(quotes, on='date', how='left')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the booking time-series store')
+    parser.add_argument('--days', type=int, default=730, help='Days of booking history')
+    parser.add_argument('--latency', type=float, default=0.05, help='Seconds the stand-in waits per request')
+    parser.add_argument('--refreshes', type=int, default=10, help='Refreshes to time')
+    args = parser.parse_args()
+
+    server = BookingAPIStandIn(config=StandInConfig(latency=Latency('fixed', args.latency),
+                                                    history_days=args.days + 1)).start()
+    settings.api_base_url = server.base_url
+    settings.api_cache_enabled = False
+    client = MarketingAPIClient()
+    daily = search_console_daily(min(args.days, 480))
+
+    print(f"{args.days} days of history, {args.latency * 1000:.0f} ms latency, "
+          f"{len(daily)} Search Console days")
+    print("-" * 70)
+
+    server.reset_stats()
+    start = time.perf_counter()
+    for _ in range(args.refreshes):
+        previous = full_refresh(client, daily, args.days)
+    elapsed = (time.perf_counter() - start) / args.refreshes
+    print(f"{'full re-fetch + merge':<26} {elapsed * 1000:7.1f} ms per refresh, "
+          f"{server.records / args.refreshes:7.0f} records fetched")
+
+    with tempfile.TemporaryDirectory() as store_dir:
+        store = BookingTimeSeriesStore(store_dir, backfill_days=args.days)
+        server.reset_stats()
+        start = time.perf_counter()
+        store.update(client)
+        print(f"{'store backfill':<26} {(time.perf_counter() - start) * 1000:7.1f} ms once, "
+              f"{server.records:7d} records fetched")
+
+        server.reset_stats()
+        start = time.perf_counter()
+        for _ in range(args.refreshes):
+            # A new day: drop the last stored day so the update has one to fetch
+            for name in list(store._frames):
+                store._frames[name] = store._frames[name].iloc[:-1]
+            store.update(client)
+            joined = store.join_daily(daily)
+        elapsed = (time.perf_counter() - start) / args.refreshes
+        print(f"{'store new day + join':<26} {elapsed * 1000:7.1f} ms per refresh, "
+              f"{server.records / args.refreshes:7.0f} records fetched")
+
+        server.reset_stats()
+        start = time.perf_counter()
+        for _ in range(args.refreshes):
+            # Same day: the watermark is yesterday, so nothing is requested
+            store.update(client)
+            joined = store.join_daily(daily)
+        elapsed = (time.perf_counter() - start) / args.refreshes
+        print(f"{'store same day + join':<26} {elapsed * 1000:7.1f} ms per refresh, "
+              f"{server.requests / args.refreshes:7.0f} requests")
+
+        reloaded = BookingTimeSeriesStore(store_dir, backfill_days=args.days)
+        same_reload = all(reloaded.frame(name).equals(store.frame(name)) for name in ('revenue', 'quotes'))
+
+    columns = ['revenue', 'bookings', 'quotes', 'converted']
+    expected = previous.set_index('date')[columns]
+    actual = joined.set_index('date')[columns]
+    # The previous path also picks up today's incomplete day, which the store leaves out
+    complete = expected.index < pd.Timestamp(date.today())
+    same = actual[complete].astype(float).equals(expected[complete].astype(float))
+    print("-" * 70)
+    print(f"joined frame matches full merge: {same}, reloaded store matches: {same_reload}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
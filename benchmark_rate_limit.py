@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark the API rate limiter against a stand-in that enforces its own limit
+
+The booking API stand-in (``booking_api_standin.py``) is run with a
+server-side token bucket and returns 429 with Retry-After once it is empty,
+the way a rate-limited API does. Interactive threads and background-refresh
+threads call it concurrently, first with only the client's retries and then
+through the rate limiter configured above the server's (unknown) limit, so
+it has to find the limit from the 429s. Usage:
+
+    python benchmark_rate_limit.py --server-rate 20 --client-rate 50 --seconds 10
+"""
+
+import argparse
+import logging
+import threading
+import time
+
+import numpy as np
+
+from booking_api_standin import BookingAPIStandIn, Latency, StandInConfig
+from src.config.settings import settings
+from src.data.api_client import MarketingAPIClient
+from src.data.rate_limit import RateLimiter, background_requests
+
+
+def run_load(client: MarketingAPIClient, seconds: float, interactive: int, background: int):
+    """Call the API from interactive and background threads; return latencies per priority"""
+    stop = time.monotonic() + seconds
+    results = {'interactive': [], 'background': []}
+    lock = threading.Lock()
+
+    def worker(kind: str):
+        def loop():
+            while time.monotonic() < stop:
+                start = time.perf_counter()
+                if kind == 'interactive':
+                    result = client.get_booking_stats('2025-05-01', '2025-05-31')
+                else:
+                    result = client.get_revenue_data('30d')
+                with lock:
+                    results[kind].append((time.perf_counter() - start, result is not None))
+
+        if kind == 'background':
+            with background_requests():
+                loop()
+        else:
+            loop()
+
+    threads = [threading.Thread(target=worker, args=('interactive',)) for _ in range(interactive)]
+    threads += [threading.Thread(target=worker, args=('background',)) for _ in range(background)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def report(label: str, results, seconds: float, server: BookingAPIStandIn):
+    """Print goodput, failures, 429s and latency per priority"""
+    statuses = server.stats()['statuses']
+    print(f"{label}: {statuses.get(200, 0) / seconds:5.1f} served/s, {statuses.get(429, 0):5d} answered 429")
+    for kind, calls in results.items():
+        if not calls:
+            continue
+        latency = np.array([elapsed for elapsed, _ in calls]) * 1000
+        ok = sum(1 for _, succeeded in calls if succeeded)
+        print(f"  {kind:<12} {ok / seconds:5.1f} ok/s, {len(calls) - ok:4d} failed, "
+              f"p50 {np.percentile(latency, 50):6.0f} ms, p95 {np.percentile(latency, 95):6.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the API rate limiter')
+    parser.add_argument('--server-rate', type=float, default=20, help='Requests per second the server accepts')
+    parser.add_argument('--client-rate', type=float, default=50, help='Rate the client limiter starts at')
+    parser.add_argument('--latency', type=float, default=0.02, help='Seconds the stand-in takes per request')
+    parser.add_argument('--interactive', type=int, default=4, help='Interactive threads')
+    parser.add_argument('--background', type=int, default=12, help='Background refresh threads')
+    parser.add_argument('--seconds', type=float, default=10, help='Seconds per run')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    settings.api_cache_enabled = False
+    settings.api_backoff_factor = 0.05
+
+    print(f"server accepts {args.server_rate:.0f}/s, {args.interactive} interactive and "
+          f"{args.background} background threads, {args.seconds:.0f} s per run")
+    print("-" * 70)
+
+    for label, limited in (('retries only', False), ('rate limiter', True)):
+        server = BookingAPIStandIn(config=StandInConfig(latency=Latency('fixed', args.latency),
+                                                        rate_limit=args.server_rate, rate_burst=10)).start()
+        settings.api_base_url = server.base_url
+        settings.api_rate_limit_enabled = limited
+        client = MarketingAPIClient()
+        if limited:
+            client.limiter = RateLimiter(rate=args.client_rate, burst=10, max_wait=settings.api_rate_max_wait,
+                                         max_queue=settings.api_rate_max_queue)
+
+        results = run_load(client, args.seconds, args.interactive, args.background)
+        report(label, results, args.seconds, server)
+        if limited:
+            stats = client.limiter.stats()['system']
+            print(f"  limiter: {stats['admitted']} admitted, {stats['rejected']} rejected, "
+                  f"{stats['throttled']} throttled, rate now {stats['rate']:.1f}/s, "
+                  f"queue wait p95 {stats['wait_ms_p95']:.0f} ms")
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Supabase change feed against local stand-ins
+
+A websocket server speaking the Phoenix protocol used by Supabase Realtime
+publishes postgres change events, and the in-memory PostgREST stand-in from
+benchmark_supabase.py serves the initial snapshot, so the feed can be
+exercised offline. Prints event throughput and apply latency, and checks
+the cached DataFrame against the expected table. Usage:
+
+    python benchmark_realtime.py --rows 50000 --events 20000
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone
+
+import websockets
+
+from benchmark_supabase import PostgRESTStandIn, make_rows
+from src.config.settings import settings
+from src.data.supabase_client import MarketingSupabaseClient
+
+
+class RealtimeStandIn:
+    """Websocket server that publishes postgres changes to joined channels"""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.port = None
+        self._bindings = {}  # (schema, table) -> [(socket, topic, binding id)]
+        self._next_id = 1
+
+    def start(self) -> None:
+        """Serve on a free local port from a background thread"""
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
+        asyncio.run_coroutine_threadsafe(self._serve(), self.loop).result(10)
+
+    async def _serve(self):
+        self.server = await websockets.serve(self._handle, '127.0.0.1', 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def _reply(self, socket, topic, ref, response=None):
+        await socket.send(json.dumps({
+            'event': 'phx_reply', 'topic': topic, 'ref': ref,
+            'payload': {'status': 'ok', 'response': response or {}}
+        }))
+
+    async def _handle(self, socket):
+        async for raw in socket:
+            message = json.loads(raw)
+            event, topic, ref = message['event'], message['topic'], message.get('ref')
+            if event == 'phx_join':
+                config = message['payload'].get('config', {})
+                config = config.get('config', config)
+                bindings = []
+                for binding in config.get('postgres_changes', []):
+                    binding = {**binding, 'id': self._next_id}
+                    self._next_id += 1
+                    bindings.append(binding)
+                    target = (binding.get('schema', 'public'), binding.get('table'))
+                    self._bindings.setdefault(target, []).append((socket, topic, binding['id']))
+                await self._reply(socket, topic, ref, {'postgres_changes': bindings})
+            else:
+                # Heartbeats, leaves and token updates are simply acknowledged
+                await self._reply(socket, topic, ref)
+
+    def publish(self, table: str, kind: str, record=None, old_record=None, schema: str = 'public') -> None:
+        """Publish a change event to every channel bound to the table"""
+        data = {
+            'schema': schema,
+            'table': table,
+            'commit_timestamp': datetime.now(timezone.utc).isoformat(),
+            'type': kind,
+            'errors': None,
+            'columns': [],
+            'record': record or {},
+            'old_record': old_record or {}
+        }
+        for socket, topic, binding_id in self._bindings.get((schema, table), []):
+            message = json.dumps({
+                'event': 'postgres_changes', 'topic': topic, 'ref': None,
+                'payload': {'data': data, 'ids': [binding_id]}
+            })
+            self.loop.call_soon_threadsafe(asyncio.ensure_future, socket.send(message))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the Supabase change feed')
+    parser.add_argument('--rows', type=int, default=50000, help='Rows in the snapshot')
+    parser.add_argument('--events', type=int, default=20000, help='Change events to publish')
+    parser.add_argument('--rate', type=float, default=0,
+                        help='Events per second to publish (0 publishes as fast as possible)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    rest = PostgRESTStandIn(('127.0.0.1', 0))
+    threading.Thread(target=rest.serve_forever, daemon=True).start()
+    realtime = RealtimeStandIn()
+    realtime.start()
+
+    settings.supabase_url = f"http://127.0.0.1:{rest.server_address[1]}"
+    settings.supabase_realtime_url = f"http://127.0.0.1:{realtime.port}"
+    settings.supabase_key = 'benchmark-key'
+
+    client = MarketingSupabaseClient()
+    rows = make_rows(args.rows)
+    client.insert_data('rankings', rows)
+    expected = {row['id']: row for row in rows}
+
+    start = time.perf_counter()
+    table = client.get_realtime_subscription('rankings', key='id')
+    if table is None:
+        raise SystemExit("Subscription failed")
+    print(f"Snapshot of {len(table.frame()):,} rows loaded and subscribed in "
+          f"{time.perf_counter() - start:.2f}s")
+
+    # A mix of updates, inserts and deletes over existing and new keys
+    random.seed(42)
+    next_id = args.rows
+    start = time.perf_counter()
+    for _ in range(args.events):
+        choice = random.random()
+        if choice < 0.6:
+            key = random.randrange(next_id)
+            if key not in expected:
+                continue
+            record = {**expected[key], 'position': random.randint(1, 100), 'clicks': random.randint(0, 50)}
+            expected[key] = record
+            realtime.publish('rankings', 'UPDATE', record=record, old_record={'id': key})
+        elif choice < 0.9:
+            record = {'id': next_id, 'keyword': f"keyword {next_id}", 'url': 'https://example.com/new',
+                      'position': 50, 'clicks': 0, 'impressions': 0}
+            expected[next_id] = record
+            next_id += 1
+            realtime.publish('rankings', 'INSERT', record=record)
+        else:
+            key = random.randrange(next_id)
+            if key in expected:
+                del expected[key]
+                realtime.publish('rankings', 'DELETE', old_record={'id': key})
+        if args.rate:
+            time.sleep(1 / args.rate)
+    published = time.perf_counter() - start
+
+    # Wait until the feed goes quiet
+    deadline = time.time() + 60
+    seen = -1
+    while time.time() < deadline and (table.metrics.events != seen or table.pending):
+        seen = table.metrics.events
+        time.sleep(0.5)
+    applied = time.perf_counter() - start
+
+    metrics = client.get_realtime_metrics()['rankings']
+    frame = table.frame()
+    matches = (len(frame) == len(expected) and all(
+        frame.at[key, 'position'] == row['position'] and frame.at[key, 'clicks'] == row['clicks']
+        for key, row in expected.items()))
+
+    print("-" * 70)
+    print(f"Events applied:        {metrics['events']:,} in {metrics['batches']:,} batches "
+          f"({metrics['inserts']:,} inserts, {metrics['updates']:,} updates, {metrics['deletes']:,} deletes)")
+    print(f"Throughput:            {metrics['events'] / applied:,.0f} events/s "
+          f"(published in {published:.2f}s, all applied after {applied:.2f}s)")
+    print(f"Apply latency:         p50 {metrics['apply_latency_ms_p50']:.2f} ms, "
+          f"p95 {metrics['apply_latency_ms_p95']:.2f} ms")
+    print(f"Commit to applied:     p50 {metrics['commit_lag_ms_p50']:.2f} ms")
+    print(f"Cached frame:          {len(frame):,} rows, matches expected: {matches}")
+
+    client.feed.close()
+    rest.shutdown()
+
+
+if __name__ == "__main__":
+    main()
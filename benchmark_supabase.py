@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Benchmark bulk writes and paged reads of MarketingSupabaseClient
+
+Runs against a local PostgREST-compatible stand-in that keeps tables in
+memory, so batch size, write concurrency and page size can be tuned without
+touching the real project. Usage:
+
+    python benchmark_supabase.py --rows 100000 --batch-size 500 --workers 4
+"""
+
+import argparse
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlparse
+
+from src.config.settings import settings
+from src.data.supabase_client import MarketingSupabaseClient
+
+
+class PostgRESTStandIn(ThreadingHTTPServer):
+    """In-memory tables served over a subset of the PostgREST API"""
+
+    daemon_threads = True
+
+    def __init__(self, address, latency: float = 0.0):
+        super().__init__(address, PostgRESTHandler)
+        self.tables = {}
+        self.lock = threading.Lock()
+        self.latency = latency
+
+
+class PostgRESTHandler(BaseHTTPRequestHandler):
+    """Handle select, insert and upsert requests on /rest/v1/<table>"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _parse(self):
+        url = urlparse(self.path)
+        table = url.path.rsplit('/', 1)[-1]
+        return table, parse_qsl(url.query, keep_blank_values=True)
+
+    def _reply(self, status: int, body=None, headers=None):
+        payload = json.dumps(body).encode('utf-8') if body is not None else b''
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        time.sleep(self.server.latency)
+        table, params = self._parse()
+        columns, offset, limit, order = None, 0, None, None
+        conditions = []
+        for key, value in params:
+            if key == 'select':
+                columns = None if value == '*' else value.split(',')
+            elif key == 'offset':
+                offset = int(value)
+            elif key == 'limit':
+                limit = int(value)
+            elif key == 'order':
+                order = value.split('.')[0]
+            else:
+                op, _, operand = value.partition('.')
+                conditions.append((key, op, operand))
+
+        # A Range header (rows a-b) is honoured as well as offset/limit
+        range_header = self.headers.get('Range')
+        if range_header:
+            first, _, last = range_header.partition('-')
+            offset, limit = int(first), int(last) - int(first) + 1
+
+        with self.server.lock:
+            rows = list(self.server.tables.get(table, {}).values())
+        for column, op, operand in conditions:
+            if op == 'eq':
+                rows = [row for row in rows if str(row.get(column)) == operand]
+            elif op == 'gt':
+                rows = [row for row in rows if _compare_key(row.get(column)) > _compare_key(operand)]
+        if order:
+            rows.sort(key=lambda row: _compare_key(row.get(order)))
+        end = len(rows) if limit is None else offset + limit
+        page = rows[offset:end]
+        if columns:
+            page = [{column: row.get(column) for column in columns} for row in page]
+        last = offset + len(page) - 1
+        self._reply(200, page, {'Content-Range': f"{offset}-{last}/*" if page else '*/*'})
+
+    def do_POST(self):
+        time.sleep(self.server.latency)
+        table, params = self._parse()
+        rows = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+        rows = [rows] if isinstance(rows, dict) else rows
+        prefer = self.headers.get('Prefer', '')
+        merge = 'resolution=merge-duplicates' in prefer
+        key_columns = dict(params).get('on_conflict') or 'id'
+        key_columns = key_columns.split(',')
+
+        with self.server.lock:
+            stored = self.server.tables.setdefault(table, {})
+            for row in rows:
+                key = tuple(row.get(column) for column in key_columns)
+                if key[0] is None:
+                    key = (len(stored),)
+                if key in stored:
+                    if not merge:
+                        self._reply(409, {'message': 'duplicate key value violates unique constraint'})
+                        return
+                    stored[key] = {**stored[key], **row}
+                else:
+                    stored[key] = row
+        if 'return=minimal' in prefer:
+            self._reply(201)
+        else:
+            self._reply(201, rows)
+
+
+def _compare_key(value):
+    """Compare keys numerically where possible, as text otherwise"""
+    try:
+        return (0, float(value), '')
+    except (TypeError, ValueError):
+        return (1, 0.0, str(value))
+
+
+def make_rows(count: int):
+    """Build keyword ranking rows like those the dashboard stores"""
+    return [{
+        'id': i,
+        'keyword': f"keyword {i}",
+        'url': f"https://example.com/page/{i % 500}",
+        'position': (i % 100) + 1,
+        'clicks': i % 37,
+        'impressions': i % 1000
+    } for i in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Supabase bulk writes and paged reads')
+    parser.add_argument('--rows', type=int, default=50000, help='Rows to write and read back')
+    parser.add_argument('--batch-size', type=int, default=settings.supabase_batch_size)
+    parser.add_argument('--workers', type=int, default=settings.supabase_write_workers)
+    parser.add_argument('--page-size', type=int, default=settings.supabase_page_size)
+    parser.add_argument('--latency', type=float, default=0.005,
+                        help='Simulated network latency per request in seconds')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    server = PostgRESTStandIn(('127.0.0.1', 0), latency=args.latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    settings.supabase_url = f"http://127.0.0.1:{server.server_address[1]}"
+    settings.supabase_key = 'benchmark-key'
+
+    client = MarketingSupabaseClient()
+    rows = make_rows(args.rows)
+
+    def timed(label, func):
+        start = time.perf_counter()
+        result = func()
+        seconds = time.perf_counter() - start
+        print(f"{label:<40} {args.rows / seconds:>12,.0f} rows/s  ({seconds:.2f}s)")
+        return result
+
+    print(f"{args.rows:,} rows, {args.latency * 1000:.0f} ms latency per request")
+    print("-" * 70)
+    timed("insert, single batch", lambda: client.insert_data(
+        'bench_single', rows, batch_size=len(rows), workers=1))
+    timed(f"insert, batches of {args.batch_size}, 1 worker", lambda: client.insert_data(
+        'bench_serial', rows, batch_size=args.batch_size, workers=1))
+    timed(f"insert, batches of {args.batch_size}, {args.workers} workers", lambda: client.insert_data(
+        'bench_parallel', rows, batch_size=args.batch_size, workers=args.workers))
+    timed(f"upsert, batches of {args.batch_size}, {args.workers} workers", lambda: client.upsert_data(
+        'bench_parallel', rows, on_conflict='id', batch_size=args.batch_size, workers=args.workers))
+
+    read = timed(f"iter_table, all columns, pages of {args.page_size}", lambda: sum(
+        len(page) for page in client.iter_table('bench_parallel', page_size=args.page_size)))
+    keyed = timed(f"iter_table, 2 columns, pages of {args.page_size}", lambda: sum(
+        len(page) for page in client.iter_table('bench_parallel', columns=['keyword', 'clicks'],
+                                                page_size=args.page_size)))
+    print("-" * 70)
+    print(f"Read back {read:,} rows with all columns and {keyed:,} rows with two")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
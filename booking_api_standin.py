@@ -0,0 +1,528 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the booking API
+
+Serves synthetic payloads for every endpoint ``MarketingAPIClient`` calls:
+booking-stats, revenue-stats, vehicles, quotes/stats, customer-stats,
+route-performance, payments/stats and health. The numbers come from one
+seeded daily series, so a day has the same bookings in every endpoint and in
+every response, and date ranges, periods and limits are honoured. Responses
+carry ETag and Last-Modified validators and conditional GETs get a 304.
+
+Delays are drawn from a latency distribution (per endpoint if wanted), a
+share of requests can fail with 5xx or a dropped connection, and an optional
+server-side rate limit answers 429 with Retry-After. Run it on its own and
+point the dashboard or a load test at it:
+
+    python booking_api_standin.py --port 8765 --latency lognormal:40:0.5 --error-rate 0.02
+    API_BASE_URL=http://127.0.0.1:8765/api/v1 streamlit run app.py
+
+or start it in-process with ``BookingAPIStandIn(config=...).start()``.
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import socket
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from email.utils import formatdate
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+API_PREFIX = '/api/v1/'
+
+# Vehicle classes: name, seats, price per km and share of bookings
+VEHICLE_CLASSES = [
+    ('Economy Sedan', 3, 1.2, 0.30), ('Comfort Sedan', 3, 1.5, 0.20), ('Minivan', 7, 1.8, 0.22),
+    ('VIP Vito', 6, 2.9, 0.12), ('Minibus', 14, 2.6, 0.10), ('Sprinter', 16, 3.2, 0.06)
+]
+
+DESTINATIONS = ['Lara', 'Belek', 'Side', 'Alanya', 'Kemer', 'Kundu', 'Manavgat', 'Beldibi',
+                'Tekirova', 'Kas', 'Kalkan', 'Olympos', 'Konakli', 'Avsallar', 'Cirali', 'Demre']
+
+PAYMENT_METHODS = {'card': 0.78, 'paypal': 0.12, 'bank_transfer': 0.06, 'cash': 0.04}
+
+
+@dataclass
+class Latency:
+    """Distribution of the delay before a response, in seconds"""
+    kind: str = 'fixed'
+    a: float = 0.0
+    b: float = 0.0
+
+    @classmethod
+    def parse(cls, spec: str) -> 'Latency':
+        """
+        Parse a latency spec in milliseconds
+
+        ``fixed:MS``, ``uniform:LOW:HIGH``, ``lognormal:MEDIAN:SIGMA`` or
+        ``pareto:SCALE:ALPHA`` (heavy-tailed; smaller alpha, longer tail).
+        """
+        kind, *values = spec.split(':')
+        values = [float(value) for value in values]
+        if kind == 'fixed' and len(values) == 1:
+            return cls(kind, values[0] / 1000)
+        if kind == 'uniform' and len(values) == 2:
+            return cls(kind, values[0] / 1000, values[1] / 1000)
+        if kind in ('lognormal', 'pareto') and len(values) == 2:
+            return cls(kind, values[0] / 1000, values[1])
+        raise ValueError(f"Invalid latency spec: {spec}")
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw one delay"""
+        if self.kind == 'uniform':
+            return rng.uniform(self.a, self.b)
+        if self.kind == 'lognormal':
+            return self.a * math.exp(rng.gauss(0, self.b))
+        if self.kind == 'pareto':
+            return self.a * rng.paretovariate(self.b)
+        return self.a
+
+
+@dataclass
+class StandInConfig:
+    """Behaviour and payload sizes of the stand-in"""
+    latency: Latency = field(default_factory=Latency)
+    endpoint_latency: Dict[str, Latency] = field(default_factory=dict)
+    error_rate: float = 0.0
+    error_statuses: Tuple[int, ...] = (500, 502, 503, 504)
+    drop_rate: float = 0.0
+    rate_limit: Optional[float] = None
+    rate_burst: int = 10
+    retry_after: int = 1
+    history_days: int = 730
+    vehicles: int = len(VEHICLE_CLASSES)
+    routes: int = 50
+    seed: int = 7
+
+
+@lru_cache(maxsize=8192)
+def day_metrics(seed: int, ordinal: int) -> Dict[str, Any]:
+    """Bookings, revenue and quotes of one whole day"""
+    day = date.fromordinal(ordinal)
+    rng = random.Random(seed * 1000003 + ordinal)
+    # Summer peak and busier weekends
+    season = 1 + 0.6 * math.sin(2 * math.pi * (day.timetuple().tm_yday - 105) / 365)
+    base = 40 * season * (1.2 if day.weekday() >= 5 else 1.0)
+    bookings = max(0, int(rng.gauss(base, base * 0.15)))
+    conversion = rng.uniform(0.035, 0.055)
+    return {
+        'bookings': bookings,
+        'revenue': round(bookings * rng.uniform(75, 105), 2),
+        'quotes': int(bookings / conversion),
+        'cancelled': int(bookings * rng.uniform(0.01, 0.05))
+    }
+
+
+class SyntheticBookingData:
+    """Consistent synthetic answers for the booking API endpoints"""
+
+    def __init__(self, config: StandInConfig):
+        """Initialize the generator"""
+        self.config = config
+        self.vehicles = self._vehicles(config.vehicles)
+        self.routes = self._routes(config.routes)
+        self.handlers = {
+            'system/booking-stats': self.booking_stats,
+            'system/revenue-stats': self.revenue_stats,
+            'vehicles': self.vehicle_stats,
+            'quotes/stats': self.quote_stats,
+            'system/customer-stats': self.customer_stats,
+            'system/route-performance': self.route_performance,
+            'payments/stats': self.payment_stats,
+            'system/health': self.health
+        }
+
+    def respond(self, endpoint: str, query: Dict[str, str]) -> Tuple[Any, int]:
+        """
+        Build the body of an endpoint
+
+        Returns:
+            tuple: Body and number of daily records in it
+
+        Raises:
+            KeyError: Unknown endpoint
+            ValueError: Invalid parameters
+        """
+        return self.handlers[endpoint](query)
+
+    def day(self, day: date) -> Dict[str, Any]:
+        """Metrics of a day; today's so far, none outside the history"""
+        today = date.today()
+        if day > today or day <= today - timedelta(days=self.config.history_days):
+            return {'bookings': 0, 'revenue': 0.0, 'quotes': 0, 'cancelled': 0}
+        metrics = day_metrics(self.config.seed, day.toordinal())
+        if day == today:
+            # Scale by the hours gone, so it stays the same within an hour
+            share = (datetime.now().hour + 1) / 24
+            metrics = {key: round(value * share, 2) if isinstance(value, float) else int(value * share)
+                       for key, value in metrics.items()}
+        return metrics
+
+    def days(self, query: Dict[str, str], default_days: int = 30) -> List[date]:
+        """Days of a start_date/end_date range, or the last ``default_days``"""
+        if 'start_date' in query or 'end_date' in query:
+            start = date.fromisoformat(query['start_date'])
+            end = date.fromisoformat(query['end_date'])
+        else:
+            end = date.today()
+            start = end - timedelta(days=default_days - 1)
+        if end < start:
+            raise ValueError('end_date is before start_date')
+        first = max(start, date.today() - timedelta(days=self.config.history_days - 1))
+        last = min(end, date.today())
+        return [first + timedelta(days=i) for i in range((last - first).days + 1)]
+
+    def totals(self, days: List[date]) -> Dict[str, Any]:
+        """Summed metrics of some days"""
+        totals = Counter()
+        for day in days:
+            totals.update(self.day(day))
+        return totals
+
+    def booking_stats(self, query: Dict[str, str]) -> Tuple[Any, int]:
+        totals = self.totals(self.days(query))
+        bookings = totals['bookings']
+        pending = int(bookings * 0.05)
+        return {
+            'total_bookings': bookings,
+            'confirmed_bookings': bookings - pending - totals['cancelled'],
+            'pending_bookings': pending,
+            'cancelled_bookings': totals['cancelled'],
+            'conversion_rate': round(100 * bookings / totals['quotes'], 2) if totals['quotes'] else 0,
+            'average_booking_value': round(totals['revenue'] / bookings, 2) if bookings else 0
+        }, 0
+
+    def revenue_stats(self, query: Dict[str, str]) -> Tuple[Any, int]:
+        period = query.get('period', '30d')
+        if not period.endswith('d') or not period[:-1].isdigit():
+            raise ValueError(f"Invalid period: {period}")
+        days = self.days({}, int(period[:-1]))
+        timeline = []
+        for day in days:
+            metrics = self.day(day)
+            timeline.append({'date': day.isoformat(), 'revenue': metrics['revenue'],
+                             'bookings': metrics['bookings']})
+        revenue = sum(record['revenue'] for record in timeline)
+        bookings = sum(record['bookings'] for record in timeline)
+        return {
+            'total_revenue': round(revenue, 2),
+            'revenue_by_day': timeline,
+            'revenue_by_vehicle': {vehicle['name']: round(revenue * vehicle['share'], 2)
+                                   for vehicle in self.vehicles},
+            'avg_booking_value': round(revenue / bookings, 2) if bookings else 0,
+            'top_routes': self._route_rows(days, 5)
+        }, len(timeline)
+
+    def vehicle_stats(self, query: Dict[str, str]) -> Tuple[Any, int]:
+        totals = self.totals(self.days({}, 365))
+        return [{
+            'name': vehicle['name'],
+            'capacity': vehicle['capacity'],
+            'price_per_km': vehicle['price_per_km'],
+            'bookings_count': int(totals['bookings'] * vehicle['share']),
+            'total_revenue': round(totals['revenue'] * vehicle['share'], 2)
+        } for vehicle in self.vehicles], 0
+
+    def quote_stats(self, query: Dict[str, str]) -> Tuple[Any, int]:
+        timeline = []
+        for day in self.days(query):
+            metrics = self.day(day)
+            timeline.append({'date': day.isoformat(), 'quotes': metrics['quotes'],
+                             'converted': metrics['bookings']})
+        quotes = sum(record['quotes'] for record in timeline)
+        converted = sum(record['converted'] for record in timeline)
+        return {
+            'total_quotes': quotes,
+            'quotes_converted': converted,
+            'conversion_rate': round(100 * converted / quotes, 2) if quotes else 0,
+            'average_quote_value': 91.0,
+            'quotes_by_day': timeline
+        }, len(timeline)
+
+    def customer_stats(self, query: Dict[str, str]) -> Tuple[Any, int]:
+        history = self.totals(self.days({}, self.config.history_days))
+        recent = self.totals(self.days({}, 30))
+        customers = int(history['bookings'] * 0.85)
+        repeat = history['bookings'] - customers
+        return {
+            'total_customers': customers,
+            'new_customers': int(recent['bookings'] * 0.85),
+            'repeat_customers': repeat,
+            'retention_rate': round(100 * repeat / customers, 1) if customers else 0,
+            'average_customer_value': round(history['revenue'] / customers, 2) if customers else 0
+        }, 0
+
+    def route_performance(self, query: Dict[str, str]) -> Tuple[Any, int]:
+        return self._route_rows(self.days({}, 30), int(query.get('limit', 10))), 0
+
+    def payment_stats(self, query: Dict[str, str]) -> Tuple[Any, int]:
+        totals = self.totals(self.days(query))
+        payments = totals['bookings'] - totals['cancelled']
+        failed = int(payments * 0.02)
+        return {
+            'payment_methods': {method: int(payments * share) for method, share in PAYMENT_METHODS.items()},
+            'success_rate': round(100 * (payments - failed) / payments, 1) if payments else 0,
+            'failed_payments': failed,
+            'average_transaction': round(totals['revenue'] / payments, 2) if payments else 0
+        }, 0
+
+    def health(self, query: Dict[str, str]) -> Tuple[Any, int]:
+        return {'status': 'ok'}, 0
+
+    def _route_rows(self, days: List[date], limit: int) -> List[Dict[str, Any]]:
+        """Busiest routes over some days"""
+        totals = self.totals(days)
+        return [{
+            'route': route['route'],
+            'bookings': int(totals['bookings'] * route['share']),
+            'revenue': round(totals['revenue'] * route['share'], 2)
+        } for route in self.routes[:limit]]
+
+    @staticmethod
+    def _vehicles(count: int) -> List[Dict[str, Any]]:
+        """Vehicle types, cycling through the classes when more are asked for"""
+        vehicles = []
+        for i in range(count):
+            name, capacity, price, share = VEHICLE_CLASSES[i % len(VEHICLE_CLASSES)]
+            round_ = i // len(VEHICLE_CLASSES)
+            vehicles.append({'name': f"{name} {round_ + 1}" if round_ else name, 'capacity': capacity,
+                             'price_per_km': price, 'share': share})
+        total = sum(vehicle['share'] for vehicle in vehicles)
+        for vehicle in vehicles:
+            vehicle['share'] /= total
+        return vehicles
+
+    @staticmethod
+    def _routes(count: int) -> List[Dict[str, Any]]:
+        """Airport transfer routes with Zipf-distributed shares of bookings"""
+        weights = [1 / (i + 1) for i in range(count)]
+        total = sum(weights) or 1
+        return [{
+            'route': f"AYT - {DESTINATIONS[i % len(DESTINATIONS)]}"
+                     + (f" {i // len(DESTINATIONS) + 1}" if i >= len(DESTINATIONS) else ''),
+            'share': weight / total
+        } for i, weight in enumerate(weights)]
+
+
+class BookingAPIStandIn(ThreadingHTTPServer):
+    """HTTP stand-in for the booking API with latency, failure and rate-limit injection"""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int] = ('127.0.0.1', 0), config: Optional[StandInConfig] = None):
+        """Bind the server; call ``start`` or ``serve_forever`` to answer requests"""
+        super().__init__(address, BookingAPIHandler)
+        self.config = config or StandInConfig()
+        self.data = SyntheticBookingData(self.config)
+        self.last_modified = formatdate(time.time(), usegmt=True)
+        self.lock = threading.Lock()
+        self.rng = random.Random(self.config.seed)
+        self.tokens = float(self.config.rate_burst)
+        self.updated = time.monotonic()
+        self.reset_stats()
+
+    @property
+    def base_url(self) -> str:
+        """Value for ``settings.api_base_url``"""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX.rstrip('/')}"
+
+    def start(self) -> 'BookingAPIStandIn':
+        """Serve from a daemon thread"""
+        threading.Thread(target=self.serve_forever, name='booking-api-standin', daemon=True).start()
+        return self
+
+    def reset_stats(self) -> None:
+        """Zero the counters"""
+        with self.lock:
+            self.requests = 0
+            self.connections = 0
+            self.records = 0
+            self.bytes_sent = 0
+            self.statuses = Counter()
+            self.endpoints = Counter()
+
+    def stats(self) -> Dict[str, Any]:
+        """Requests, connections, statuses and bytes served so far"""
+        with self.lock:
+            return {
+                'requests': self.requests,
+                'connections': self.connections,
+                'records': self.records,
+                'bytes_sent': self.bytes_sent,
+                'statuses': dict(self.statuses),
+                'endpoints': dict(self.endpoints)
+            }
+
+    def admit(self, endpoint: str) -> Tuple[Any, float]:
+        """
+        Count a request and decide what happens to it
+
+        Returns:
+            tuple: 429, 'drop', an error status or None to answer, and the delay
+        """
+        config = self.config
+        with self.lock:
+            self.requests += 1
+            self.endpoints[endpoint] += 1
+            if config.rate_limit:
+                now = time.monotonic()
+                self.tokens = min(config.rate_burst, self.tokens + (now - self.updated) * config.rate_limit)
+                self.updated = now
+                if self.tokens < 1:
+                    # Turned away before any work, as rate limiters do
+                    return 429, 0.0
+                self.tokens -= 1
+            delay = config.endpoint_latency.get(endpoint, config.latency).sample(self.rng)
+            draw = self.rng.random()
+            if draw < config.drop_rate:
+                return 'drop', delay
+            if draw < config.drop_rate + config.error_rate:
+                return self.rng.choice(config.error_statuses), delay
+            return None, delay
+
+    def count(self, status: Any, size: int = 0, records: int = 0) -> None:
+        """Record how a request was answered"""
+        with self.lock:
+            self.statuses[status] += 1
+            self.bytes_sent += size
+            self.records += records
+
+
+class BookingAPIHandler(BaseHTTPRequestHandler):
+    """Answer GET requests for the booking API endpoints"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out in two writes; don't hold the body back
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status: int, body: Any = None, headers: Optional[Dict[str, str]] = None,
+               records: int = 0) -> None:
+        payload = json.dumps(body, separators=(',', ':')).encode('utf-8') if body is not None else b''
+        etag = f'"{hashlib.md5(payload).hexdigest()}"'
+        if status == 200 and self.headers.get('If-None-Match') == etag:
+            status, payload = 304, b''
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        if status in (200, 304):
+            self.send_header('ETag', etag)
+            self.send_header('Last-Modified', self.server.last_modified)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+        self.server.count(status, len(payload), records if status == 200 else 0)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if not url.path.startswith(API_PREFIX):
+            self._reply(404, {'error': 'not found'})
+            return
+        endpoint = url.path[len(API_PREFIX):].strip('/')
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        outcome, delay = self.server.admit(endpoint)
+        if outcome == 429:
+            self._reply(429, {'error': 'rate limit exceeded'},
+                        headers={'Retry-After': str(self.server.config.retry_after)})
+            return
+        time.sleep(delay)
+        if outcome == 'drop':
+            # Close without answering, like a crashed upstream
+            self.server.count('dropped')
+            self.close_connection = True
+            return
+        if outcome is not None:
+            self._reply(outcome, {'error': 'injected failure'})
+            return
+
+        try:
+            body, records = self.server.data.respond(endpoint, query)
+        except KeyError:
+            self._reply(404, {'error': f"unknown endpoint {endpoint}"})
+            return
+        except (TypeError, ValueError) as e:
+            self._reply(400, {'error': str(e)})
+            return
+        self._reply(200, body, records=records)
+
+
+def add_standin_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the stand-in's options to a command line parser"""
+    group = parser.add_argument_group('booking API stand-in')
+    group.add_argument('--latency', default='fixed:20',
+                       help='Latency spec in ms: fixed:MS, uniform:LOW:HIGH, lognormal:MEDIAN:SIGMA or pareto:SCALE:ALPHA')
+    group.add_argument('--endpoint-latency', action='append', default=[], metavar='ENDPOINT=SPEC',
+                       help='Latency of one endpoint, e.g. system/revenue-stats=lognormal:200:0.5')
+    group.add_argument('--error-rate', type=float, default=0.0, help='Share of requests answered with 5xx')
+    group.add_argument('--error-statuses', default='500,502,503,504', help='Statuses injected errors use')
+    group.add_argument('--drop-rate', type=float, default=0.0, help='Share of connections dropped unanswered')
+    group.add_argument('--rate-limit', type=float, default=None, help='Requests per second before 429s')
+    group.add_argument('--rate-burst', type=int, default=10, help='Burst allowed by the rate limit')
+    group.add_argument('--history-days', type=int, default=730, help='Days of booking history')
+    group.add_argument('--vehicles', type=int, default=len(VEHICLE_CLASSES), help='Vehicle types served')
+    group.add_argument('--routes', type=int, default=50, help='Routes served')
+    group.add_argument('--seed', type=int, default=7, help='Seed of the synthetic data and injected faults')
+
+
+def config_from_args(args: argparse.Namespace) -> StandInConfig:
+    """Build a stand-in config from parsed ``add_standin_arguments`` options"""
+    endpoint_latency = {}
+    for option in args.endpoint_latency:
+        endpoint, spec = option.split('=', 1)
+        endpoint_latency[endpoint.strip('/')] = Latency.parse(spec)
+    return StandInConfig(
+        latency=Latency.parse(args.latency),
+        endpoint_latency=endpoint_latency,
+        error_rate=args.error_rate,
+        error_statuses=tuple(int(status) for status in args.error_statuses.split(',')),
+        drop_rate=args.drop_rate,
+        rate_limit=args.rate_limit,
+        rate_burst=args.rate_burst,
+        history_days=args.history_days,
+        vehicles=args.vehicles,
+        routes=args.routes,
+        seed=args.seed
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve a local stand-in of the booking API')
+    parser.add_argument('--host', default='127.0.0.1', help='Address to listen on')
+    parser.add_argument('--port', type=int, default=8765, help='Port to listen on')
+    add_standin_arguments(parser)
+    args = parser.parse_args()
+
+    server = BookingAPIStandIn((args.host, args.port), config_from_args(args))
+    print(f"Booking API stand-in on {server.base_url}")
+    print(f"Point the dashboard at it with API_BASE_URL={server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(server.stats(), indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,10 +4,14 @@ Base queries for Search Console data from BigQuery.
 
 from datetime import datetime, timedelta
 import pandas as pd
+import google.auth
+import requests
+from google.auth.transport.requests import AuthorizedSession
 from google.cloud import bigquery
 from google.oauth2 import service_account
 import os
 import logging
+import threading
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -18,6 +22,74 @@ PROJECT_ID = "gtm-management-twelvetransfers"
 DATASET_ID = "seo_data"
 TABLE_ID = "search_console_data"
 OVERVIEW_VIEW_ID = "search_console_overview"
+HOST_TABLE_ID = "search_console_url_hosts"
+
+# Connections kept open per host by the shared HTTP session
+HTTP_POOL_SIZE = 32
+
+# Metrics aggregated per window by the multi-window query
+WINDOW_METRICS = ['days_count', 'total_clicks', 'total_impressions', 'average_ctr', 'average_position']
+
+# Process-wide BigQuery clients, keyed by credentials file (None for default credentials)
+_client_pool = {}
+_client_pool_lock = threading.Lock()
+
+def _create_client(credentials_path=None):
+    """
+    Create a BigQuery client with a pooled HTTP session
+    
+    Args:
+        credentials_path (str, optional): Service account key file
+        
+    Returns:
+        bigquery.Client: BigQuery client
+    """
+    if credentials_path:
+        credentials = service_account.Credentials.from_service_account_file(
+            credentials_path,
+            scopes=["https://www.googleapis.com/auth/bigquery"]
+        )
+    else:
+        credentials, _ = google.auth.default(scopes=bigquery.Client.SCOPE)
+        
+    # Size the connection pool for concurrent queries sharing this client
+    session = AuthorizedSession(credentials)
+    adapter = requests.adapters.HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+    session.mount('https://', adapter)
+    
+    return bigquery.Client(
+        credentials=credentials,
+        project=PROJECT_ID,
+        _http=session
+    )
+
+def get_shared_client(credentials_path=None):
+    """
+    Get the process-wide BigQuery client, creating it on first use
+    
+    Every query class shares one client (and its credentials and HTTP
+    connections) per credentials file; the client is safe to use from
+    several threads.
+    
+    Args:
+        credentials_path (str, optional): Service account key file; default
+            credentials are used if it is not given or does not exist
+            
+    Returns:
+        bigquery.Client: Shared BigQuery client
+    """
+    key = os.path.abspath(credentials_path) if credentials_path and os.path.exists(credentials_path) else None
+    
+    with _client_pool_lock:
+        client = _client_pool.get(key)
+        if client is None:
+            client = _create_client(key)
+            _client_pool[key] = client
+            if key:
+                logger.info(f"Initialized BigQuery client with provided credentials")
+            else:
+                logger.info(f"Initialized BigQuery client with application default credentials")
+        return client
 
 class SearchConsoleQueries:
     """Base class for Search Console queries"""
@@ -31,22 +103,8 @@ class SearchConsoleQueries:
     def _initialize_client(self):
         """Initialize BigQuery client with credentials"""
         try:
-            # Try to use provided credentials
-            if self.credentials_path and os.path.exists(self.credentials_path):
-                credentials = service_account.Credentials.from_service_account_file(
-                    self.credentials_path,
-                    scopes=["https://www.googleapis.com/auth/bigquery"]
-                )
-                self.client = bigquery.Client(
-                    credentials=credentials,
-                    project=PROJECT_ID
-                )
-                logger.info(f"Initialized BigQuery client with provided credentials")
-            else:
-                # Try to use application default credentials
-                self.client = bigquery.Client(project=PROJECT_ID)
-                logger.info(f"Initialized BigQuery client with application default credentials")
-                
+            # Reuse the process-wide client for these credentials
+            self.client = get_shared_client(self.credentials_path)
         except Exception as e:
             logger.error(f"Error initializing BigQuery client: {e}")
             raise
@@ -106,6 +164,84 @@ class SearchConsoleQueries:
             {domain_filter}
         """
         
+    def get_multi_window_metrics(self, windows, domain=None):
+        """
+        Get search console metrics for several look-back windows in one scan
+        
+        The longest window is scanned once with conditional aggregation for
+        every window, instead of running one query per window.
+        
+        Args:
+            windows (list): Numbers of days to look back, e.g. [7, 30, 90]
+            domain (str, optional): Domain to filter by
+            
+        Returns:
+            dict: DataFrame with search console metrics for each window
+        """
+        end_date = datetime.now().date()
+        
+        query = self._build_multi_window_metrics_query(windows, end_date, domain)
+        
+        try:
+            logger.info(f"Executing query for windows of {windows} days back")
+            query_job = self.client.query(query)
+            results = query_job.result().to_dataframe()
+        except Exception as e:
+            logger.error(f"Error executing query: {e}")
+            return {days_back: pd.DataFrame() for days_back in windows}
+            
+        if results.empty:
+            return {days_back: pd.DataFrame() for days_back in windows}
+            
+        # One row of window-suffixed columns becomes one DataFrame per window
+        row = results.iloc[0]
+        metrics = {}
+        for days_back in windows:
+            metrics[days_back] = pd.DataFrame([{
+                'start_date': end_date - timedelta(days=days_back),
+                'end_date': end_date,
+                **{column: row[f"{column}_{days_back}d"] for column in WINDOW_METRICS}
+            }])
+        return metrics
+        
+    def _build_multi_window_metrics_query(self, windows, end_date, domain=None):
+        """
+        Build query for search console metrics over several windows
+        
+        Args:
+            windows (list): Numbers of days to look back
+            end_date (date): End date shared by every window
+            domain (str, optional): Domain to filter by
+            
+        Returns:
+            str: SQL query with one row of ``<metric>_<days>d`` columns
+        """
+        domain_filter = f"AND (url LIKE '%{domain}%' OR page_path LIKE '%{domain}%')" if domain else ""
+        start_date = end_date - timedelta(days=max(windows))
+        
+        columns = []
+        for days_back in windows:
+            in_window = f"DATE(date) >= '{end_date - timedelta(days=days_back)}'"
+            columns += [
+                f"COUNT(DISTINCT IF({in_window}, DATE(date), NULL)) AS days_count_{days_back}d",
+                f"SUM(IF({in_window}, clicks, NULL)) AS total_clicks_{days_back}d",
+                f"SUM(IF({in_window}, impressions, NULL)) AS total_impressions_{days_back}d",
+                f"SAFE_DIVIDE(SUM(IF({in_window}, clicks, NULL)), SUM(IF({in_window}, impressions, NULL))) "
+                f"AS average_ctr_{days_back}d",
+                f"AVG(IF({in_window}, position, NULL)) AS average_position_{days_back}d"
+            ]
+        select_list = ",\n            ".join(columns)
+        
+        return f"""
+        SELECT 
+            {select_list}
+        FROM 
+            `{PROJECT_ID}.{DATASET_ID}.{TABLE_ID}`
+        WHERE 
+            DATE(date) BETWEEN '{start_date}' AND '{end_date}'
+            {domain_filter}
+        """
+        
     def get_daily_metrics(self, days_back, domain=None):
         """
         Get daily search console metrics for the specified number of days back
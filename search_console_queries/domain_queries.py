@@ -2,54 +2,186 @@
 Domain specific queries for Search Console data.
 """
 
-from .base_queries import SearchConsoleQueries
+from .base_queries import SearchConsoleQueries, PROJECT_ID, DATASET_ID, TABLE_ID, HOST_TABLE_ID
 import pandas as pd
 import logging
+import threading
+import time
 from google.cloud import bigquery
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Host part of a URL
+HOST_PATTERN = r'https?://([^/]+)'
+
+# Seconds before the cached domain catalog is brought up to date again
+DOMAIN_CATALOG_TTL = 3600
+
+# Process-wide domain catalog shared by every DomainQueries instance
+_domain_catalog = {'domains': None, 'updated': 0.0}
+_domain_catalog_lock = threading.Lock()
+
 class DomainQueries:
     """Queries for specific domains and domain comparisons"""
     
     def __init__(self, credentials_path=None):
         """Initialize with base query client"""
         self.base_client = SearchConsoleQueries(credentials_path)
+        self.host_table_ready = False
         
-    def get_available_domains(self):
+    def host_table_exists(self):
         """
-        Get list of available domains in the search console data
+        Check whether the URL to host dimension table has been created
+        
+        This is a metadata lookup, not a query, so read paths can call it
+        without being billed; the table is created and kept up to date by
+        ``update_host_table`` run as a maintenance step.
         
         Returns:
-            list: List of domains
+            bool: True if the host table can be queried
         """
-        logger.info("Getting available domains")
+        if not self.host_table_ready:
+            try:
+                self.base_client.client.get_table(f"{PROJECT_ID}.{DATASET_ID}.{HOST_TABLE_ID}")
+                self.host_table_ready = True
+            except Exception as e:
+                logger.info(f"URL host table not available, extracting hosts from URLs: {e}")
+        return self.host_table_ready
         
-        query = """
-        SELECT 
-            DISTINCT REGEXP_EXTRACT(url, r'https?://([^/]+)') AS domain
-        FROM 
-            `gtm-management-twelvetransfers.seo_data.search_console_data`
-        WHERE 
-            url IS NOT NULL
-        ORDER BY 
-            domain
+    def update_host_table(self):
+        """
+        Bring the URL to host dimension table up to date
+        
+        Only rows from the last update's date onwards are scanned, so the host
+        of each URL is extracted once rather than on every query. This is a
+        billed write (CREATE TABLE and MERGE), so it is run as a scheduled
+        maintenance step (``run_queries.py --update-host-table``), never from
+        the read paths.
+        
+        Returns:
+            bool: True if the host table is ready to use
+        """
+        host_table = f"{PROJECT_ID}.{DATASET_ID}.{HOST_TABLE_ID}"
+        
+        query = f"""
+        CREATE TABLE IF NOT EXISTS `{host_table}` (
+            url STRING,
+            host STRING,
+            first_seen DATE,
+            last_seen DATE
+        )
+        CLUSTER BY host;
+        
+        MERGE `{host_table}` AS hosts
+        USING (
+            SELECT 
+                url,
+                REGEXP_EXTRACT(url, r'{HOST_PATTERN}') AS host,
+                MIN(DATE(date)) AS first_seen,
+                MAX(DATE(date)) AS last_seen
+            FROM 
+                `{PROJECT_ID}.{DATASET_ID}.{TABLE_ID}`
+            WHERE 
+                url IS NOT NULL
+                AND DATE(date) >= COALESCE((SELECT MAX(last_seen) FROM `{host_table}`), DATE '1970-01-01')
+            GROUP BY
+                url
+        ) AS new_urls
+        ON hosts.url = new_urls.url
+        WHEN MATCHED AND new_urls.last_seen > hosts.last_seen THEN
+            UPDATE SET last_seen = new_urls.last_seen
+        WHEN NOT MATCHED THEN
+            INSERT (url, host, first_seen, last_seen)
+            VALUES (new_urls.url, new_urls.host, new_urls.first_seen, new_urls.last_seen)
         """
         
         try:
-            query_job = self.base_client.client.query(query)
-            results = query_job.result()
-            domains = [row.domain for row in results if row.domain]
-            return domains
+            logger.info("Updating URL host table")
+            self.base_client.client.query(query).result()
+            self.host_table_ready = True
         except Exception as e:
-            logger.error(f"Error getting available domains: {e}")
-            return []
+            logger.error(f"Error updating URL host table: {e}")
+            self.host_table_ready = False
+        return self.host_table_ready
+        
+    def get_available_domains(self, refresh=False):
+        """
+        Get list of available domains in the search console data
+        
+        The catalog is cached for the process and read again once it is older
+        than DOMAIN_CATALOG_TTL, from the host table when it exists plus the
+        hosts of rows added since the table's last update.
+        
+        Args:
+            refresh (bool): Read the catalog again even if the cache is fresh
+            
+        Returns:
+            list: List of domains
+        """
+        with _domain_catalog_lock:
+            cached = _domain_catalog['domains']
+            if cached is not None and not refresh and time.time() - _domain_catalog['updated'] < DOMAIN_CATALOG_TTL:
+                return list(cached)
+                
+            logger.info("Getting available domains")
+            
+            if self.host_table_exists():
+                # The table is only as new as its last update, so hosts of
+                # rows since then are extracted and added
+                host_table = f"{PROJECT_ID}.{DATASET_ID}.{HOST_TABLE_ID}"
+                query = f"""
+                SELECT domain FROM (
+                    SELECT 
+                        host AS domain
+                    FROM 
+                        `{host_table}`
+                    UNION DISTINCT
+                    SELECT 
+                        REGEXP_EXTRACT(url, r'{HOST_PATTERN}') AS domain
+                    FROM 
+                        `{PROJECT_ID}.{DATASET_ID}.{TABLE_ID}`
+                    WHERE 
+                        url IS NOT NULL
+                        AND DATE(date) >= COALESCE((SELECT MAX(last_seen) FROM `{host_table}`), DATE '1970-01-01')
+                )
+                WHERE 
+                    domain IS NOT NULL
+                ORDER BY 
+                    domain
+                """
+            else:
+                # Without the host table, extract hosts from the full table
+                query = f"""
+                SELECT 
+                    DISTINCT REGEXP_EXTRACT(url, r'{HOST_PATTERN}') AS domain
+                FROM 
+                    `{PROJECT_ID}.{DATASET_ID}.{TABLE_ID}`
+                WHERE 
+                    url IS NOT NULL
+                ORDER BY 
+                    domain
+                """
+                
+            try:
+                query_job = self.base_client.client.query(query)
+                results = query_job.result()
+                domains = [row.domain for row in results if row.domain]
+            except Exception as e:
+                logger.error(f"Error getting available domains: {e}")
+                return list(cached) if cached is not None else []
+                
+            _domain_catalog['domains'] = domains
+            _domain_catalog['updated'] = time.time()
+            return list(domains)
             
     def get_domain_comparison(self, domains, days_back=30):
         """
         Compare metrics for multiple domains
         
+        Rows are grouped by date and host once and pivoted into per-domain
+        columns locally, so the query costs the same for any number of domains.
+        
         Args:
             domains (list): List of domains to compare
             days_back (int): Number of days to look back
@@ -63,40 +195,92 @@ class DomainQueries:
             
         logger.info(f"Comparing {len(domains)} domains for last {days_back} days")
         
-        # Create a SQL CASE statement for each domain
-        domain_cases = []
-        for domain in domains:
-            domain_case = f"""
-            SUM(CASE WHEN REGEXP_EXTRACT(url, r'https?://([^/]+)') = '{domain}' THEN clicks ELSE 0 END) AS {domain.replace('.', '_')}_clicks,
-            SUM(CASE WHEN REGEXP_EXTRACT(url, r'https?://([^/]+)') = '{domain}' THEN impressions ELSE 0 END) AS {domain.replace('.', '_')}_impressions,
-            SAFE_DIVIDE(
-                SUM(CASE WHEN REGEXP_EXTRACT(url, r'https?://([^/]+)') = '{domain}' THEN clicks ELSE 0 END),
-                SUM(CASE WHEN REGEXP_EXTRACT(url, r'https?://([^/]+)') = '{domain}' THEN impressions ELSE 0 END)
-            ) AS {domain.replace('.', '_')}_ctr,
-            AVG(CASE WHEN REGEXP_EXTRACT(url, r'https?://([^/]+)') = '{domain}' THEN position ELSE NULL END) AS {domain.replace('.', '_')}_position
+        if self.host_table_exists():
+            # URLs first seen since the host table's last update are not in
+            # it yet, so their host is extracted
+            source = f"""
+            SELECT 
+                data.date,
+                COALESCE(hosts.host, REGEXP_EXTRACT(data.url, r'{HOST_PATTERN}')) AS host,
+                data.clicks, data.impressions, data.position
+            FROM 
+                `{PROJECT_ID}.{DATASET_ID}.{TABLE_ID}` AS data
+            LEFT JOIN 
+                `{PROJECT_ID}.{DATASET_ID}.{HOST_TABLE_ID}` AS hosts
+            ON hosts.url = data.url
+            """
+        else:
+            source = f"""
+            SELECT 
+                date, REGEXP_EXTRACT(url, r'{HOST_PATTERN}') AS host, clicks, impressions, position
+            FROM 
+                `{PROJECT_ID}.{DATASET_ID}.{TABLE_ID}`
             """
-            domain_cases.append(domain_case)
             
-        domain_case_sql = ",\n            ".join(domain_cases)
-        
         query = f"""
         SELECT 
             DATE(date) AS date,
-            {domain_case_sql}
+            IF(host IN UNNEST(@domains), host, NULL) AS domain,
+            SUM(clicks) AS clicks,
+            SUM(impressions) AS impressions,
+            AVG(position) AS position
         FROM 
-            `gtm-management-twelvetransfers.seo_data.search_console_data`
+            ({source})
         WHERE 
             DATE(date) >= DATE_SUB(CURRENT_DATE(), INTERVAL {days_back} DAY)
         GROUP BY
-            DATE(date)
-        ORDER BY
-            date DESC
+            date, domain
         """
         
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[bigquery.ArrayQueryParameter('domains', 'STRING', list(domains))]
+        )
+        
         try:
-            query_job = self.base_client.client.query(query)
-            results = query_job.result()
-            return results.to_dataframe()
+            query_job = self.base_client.client.query(query, job_config=job_config)
+            results = query_job.result().to_dataframe()
         except Exception as e:
             logger.error(f"Error comparing domains: {e}")
             return pd.DataFrame()
+            
+        return self._pivot_domain_metrics(results, domains)
+        
+    @staticmethod
+    def _pivot_domain_metrics(results, domains):
+        """
+        Pivot per-date, per-domain rows into one row per date
+        
+        Args:
+            results (pd.DataFrame): Rows of date, domain, clicks, impressions, position
+            domains (list): Domains in column order
+            
+        Returns:
+            pd.DataFrame: Date plus <domain>_clicks/_impressions/_ctr/_position columns
+        """
+        if results.empty:
+            return pd.DataFrame()
+            
+        # Every date in range keeps a row, as with per-domain conditional sums
+        dates = pd.Index(sorted(results['date'].unique(), reverse=True), name='date')
+        compared = results[results['domain'].notna()].set_index(['date', 'domain'])
+        
+        comparison = pd.DataFrame(index=dates)
+        for domain in domains:
+            prefix = domain.replace('.', '_')
+            metrics = compared.xs(domain, level='domain') if domain in compared.index.get_level_values('domain') else None
+            
+            if metrics is None:
+                clicks = pd.Series(0, index=dates)
+                impressions = pd.Series(0, index=dates)
+                position = pd.Series(float('nan'), index=dates)
+            else:
+                clicks = metrics['clicks'].reindex(dates).fillna(0)
+                impressions = metrics['impressions'].reindex(dates).fillna(0)
+                position = metrics['position'].reindex(dates)
+                
+            comparison[f"{prefix}_clicks"] = clicks
+            comparison[f"{prefix}_impressions"] = impressions
+            comparison[f"{prefix}_ctr"] = clicks / impressions.where(impressions != 0)
+            comparison[f"{prefix}_position"] = position
+            
+        return comparison.reset_index()
@@ -7,8 +7,12 @@ import argparse
 import pandas as pd
 import os
 import sys
+import time
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from datetime import datetime
+from typing import Callable, List, Optional
 
 # Add the parent directory to the path so we can import the package
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -19,7 +23,11 @@ from search_console_queries import (
     KeywordQueries,
     PageQueries
 )
-from search_console_queries.utils import format_metrics, save_to_csv
+from search_console_queries.utils import (
+    format_metrics,
+    save_to_csv,
+    save_to_parquet
+)
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -31,7 +39,11 @@ def parse_args():
     
     parser.add_argument('--credentials', type=str, help='Path to Google Cloud credentials file')
     parser.add_argument('--domain', type=str, help='Domain to filter by')
-    parser.add_argument('--output-dir', type=str, default='./output', help='Output directory for CSV files')
+    parser.add_argument('--output-dir', type=str, default='./output', help='Output directory for result files')
+    parser.add_argument('--format', type=str, choices=['csv', 'parquet'], default='csv',
+                        help='Output format; parquet appends to a partitioned dataset')
+    parser.add_argument('--resume', action='store_true',
+                        help='With --format parquet, skip partitions that are already written')
     
     # Query type arguments
     parser.add_argument('--time-period', action='store_true', help='Run time period queries')
@@ -49,21 +61,38 @@ def parse_args():
     # Page options
     parser.add_argument('--page-url', type=str, help='Specific page URL to analyze')
     
-    return parser.parse_args()
-
-def run_time_period_queries(args):
-    """Run time period queries"""
-    logger.info("Running time period queries")
+    # Maintenance options
+    parser.add_argument('--update-host-table', action='store_true',
+                        help='Bring the URL host table up to date (a billed write); run on a schedule')
     
-    client = TimePeriodQueries(args.credentials)
+    # Execution options
+    parser.add_argument('--parallel', type=int, default=1, metavar='N',
+                        help='Run up to N queries concurrently')
     
-    if args.days == 7:
-        df = client.get_last_7_days_metrics(args.domain)
-    elif args.days == 90:
-        df = client.get_last_90_days_metrics(args.domain)
-    else:
-        df = client.get_last_30_days_metrics(args.domain)
-        
+    return parser.parse_args()
+
+def save_results(df, name, args):
+    """Save query results in the requested output format"""
+    if args.format == 'parquet':
+        return save_to_parquet(df, name, args.output_dir, resume=args.resume)
+    return save_to_csv(df, name, args.output_dir)
+
+@dataclass
+class QueryJob:
+    """A query to run, and how to report its result"""
+    name: str
+    fetch: Callable[[], object]
+    report: Callable[[object, argparse.Namespace], Optional[List['QueryJob']]]
+
+@dataclass
+class JobTiming:
+    """Timing of a finished query job"""
+    name: str
+    rows: int
+    seconds: float
+
+def report_time_period_metrics(df, args):
+    """Print and save time period metrics"""
     if df.empty:
         logger.warning("No data found for time period query")
         return
@@ -76,62 +105,78 @@ def run_time_period_queries(args):
     formatted_df = format_metrics(df)
     print(formatted_df)
     
-    # Save to CSV
-    save_to_csv(df, f"time_period_{args.days}_days", args.output_dir)
-    
-    # Get daily metrics
-    daily_df = client.get_daily_metrics_for_period(args.days, args.domain)
-    
+    # Save results
+    save_results(df, f"time_period_{args.days}_days", args)
+
+def report_daily_metrics(daily_df, args):
+    """Print and save daily metrics"""
     if not daily_df.empty:
         print("\n=== Daily Metrics ===")
         print(daily_df.head())
         
-        # Save to CSV
-        save_to_csv(daily_df, f"daily_metrics_{args.days}_days", args.output_dir)
+        # Save results
+        save_results(daily_df, f"daily_metrics_{args.days}_days", args)
 
-def run_domain_queries(args):
-    """Run domain queries"""
-    logger.info("Running domain queries")
+def time_period_jobs(args):
+    """Build the time period query jobs"""
+    client = TimePeriodQueries(args.credentials)
     
+    if args.days == 7:
+        get_metrics = client.get_last_7_days_metrics
+    elif args.days == 90:
+        get_metrics = client.get_last_90_days_metrics
+    else:
+        get_metrics = client.get_last_30_days_metrics
+        
+    return [
+        QueryJob(f"time_period_{args.days}_days", lambda: get_metrics(args.domain), report_time_period_metrics),
+        QueryJob(
+            f"daily_metrics_{args.days}_days",
+            lambda: client.get_daily_metrics_for_period(args.days, args.domain),
+            report_daily_metrics
+        )
+    ]
+
+def domain_jobs(args):
+    """Build the domain query jobs; the comparison follows once domains are known"""
     client = DomainQueries(args.credentials)
     
-    # Get available domains
-    domains = client.get_available_domains()
-    
-    if not domains:
-        logger.warning("No domains found")
-        return
-        
-    print("\n=== Available Domains ===")
-    for i, domain in enumerate(domains, 1):
-        print(f"{i}. {domain}")
-        
-    # If a specific domain is provided, get metrics for that domain
-    if args.domain:
-        # Get domain comparison with the specified domain and the first few other domains
-        comparison_domains = [args.domain]
-        for domain in domains:
-            if domain != args.domain and len(comparison_domains) < 3:
-                comparison_domains.append(domain)
-                
-        df = client.get_domain_comparison(comparison_domains, args.days)
-        
-        if not df.empty:
-            print("\n=== Domain Comparison ===")
-            print(df.head())
+    def report_domains(domains, args):
+        if not domains:
+            logger.warning("No domains found")
+            return
             
-            # Save to CSV
-            save_to_csv(df, f"domain_comparison_{args.days}_days", args.output_dir)
+        print("\n=== Available Domains ===")
+        for i, domain in enumerate(domains, 1):
+            print(f"{i}. {domain}")
+            
+        # If a specific domain is provided, get metrics for that domain
+        if args.domain:
+            # Get domain comparison with the specified domain and the first few other domains
+            comparison_domains = [args.domain]
+            for domain in domains:
+                if domain != args.domain and len(comparison_domains) < 3:
+                    comparison_domains.append(domain)
+                    
+            return [QueryJob(
+                f"domain_comparison_{args.days}_days",
+                lambda: client.get_domain_comparison(comparison_domains, args.days),
+                report_domain_comparison
+            )]
+            
+    return [QueryJob("available_domains", client.get_available_domains, report_domains)]
 
-def run_keyword_queries(args):
-    """Run keyword queries"""
-    logger.info("Running keyword queries")
-    
-    client = KeywordQueries(args.credentials)
-    
-    # Get top keywords
-    df = client.get_top_keywords(args.days, args.limit, args.domain)
-    
+def report_domain_comparison(df, args):
+    """Print and save the domain comparison"""
+    if not df.empty:
+        print("\n=== Domain Comparison ===")
+        print(df.head())
+        
+        # Save results
+        save_results(df, f"domain_comparison_{args.days}_days", args)
+
+def report_top_keywords(df, args):
+    """Print and save top keywords"""
     if df.empty:
         logger.warning("No data found for keyword query")
         return
@@ -144,29 +189,40 @@ def run_keyword_queries(args):
     formatted_df = format_metrics(df)
     print(formatted_df.head(10))  # Show top 10
     
-    # Save to CSV
-    save_to_csv(df, f"top_keywords_{args.days}_days", args.output_dir)
+    # Save results
+    save_results(df, f"top_keywords_{args.days}_days", args)
+
+def report_keyword_trend(trend_df, args):
+    """Print and save the trend of the requested keyword"""
+    if not trend_df.empty:
+        print(f"\n=== Keyword Trend: {args.keyword} ===")
+        print(trend_df.head())
+        
+        # Save results
+        save_results(trend_df, f"keyword_trend_{args.keyword}_{args.days}_days", args)
+
+def keyword_jobs(args):
+    """Build the keyword query jobs"""
+    client = KeywordQueries(args.credentials)
+    
+    jobs = [QueryJob(
+        f"top_keywords_{args.days}_days",
+        lambda: client.get_top_keywords(args.days, args.limit, args.domain),
+        report_top_keywords
+    )]
     
     # If a specific keyword is provided, get trend for that keyword
     if args.keyword:
-        trend_df = client.get_keyword_trend(args.keyword, args.days, args.domain)
+        jobs.append(QueryJob(
+            f"keyword_trend_{args.keyword}_{args.days}_days",
+            lambda: client.get_keyword_trend(args.keyword, args.days, args.domain),
+            report_keyword_trend
+        ))
         
-        if not trend_df.empty:
-            print(f"\n=== Keyword Trend: {args.keyword} ===")
-            print(trend_df.head())
-            
-            # Save to CSV
-            save_to_csv(trend_df, f"keyword_trend_{args.keyword}_{args.days}_days", args.output_dir)
+    return jobs
 
-def run_page_queries(args):
-    """Run page queries"""
-    logger.info("Running page queries")
-    
-    client = PageQueries(args.credentials)
-    
-    # Get top pages
-    df = client.get_top_pages(args.days, args.limit, args.domain)
-    
+def report_top_pages(df, args):
+    """Print and save top pages"""
     if df.empty:
         logger.warning("No data found for page query")
         return
@@ -179,29 +235,142 @@ def run_page_queries(args):
     formatted_df = format_metrics(df)
     print(formatted_df.head(10))  # Show top 10
     
-    # Save to CSV
-    save_to_csv(df, f"top_pages_{args.days}_days", args.output_dir)
+    # Save results
+    save_results(df, f"top_pages_{args.days}_days", args)
+
+def report_page_trend(trend_df, args):
+    """Print and save the trend of the requested page"""
+    if not trend_df.empty:
+        print(f"\n=== Page Trend: {args.page_url} ===")
+        print(trend_df.head())
+        
+        # Save results
+        save_results(trend_df, f"page_trend_{args.days}_days", args)
+
+def report_page_keywords(keywords_df, args):
+    """Print and save the keywords of the requested page"""
+    if not keywords_df.empty:
+        print(f"\n=== Keywords for Page: {args.page_url} ===")
+        print(keywords_df.head(10))  # Show top 10
+        
+        # Save results
+        save_results(keywords_df, f"page_keywords_{args.days}_days", args)
+
+def page_jobs(args):
+    """Build the page query jobs"""
+    client = PageQueries(args.credentials)
+    
+    jobs = [QueryJob(
+        f"top_pages_{args.days}_days",
+        lambda: client.get_top_pages(args.days, args.limit, args.domain),
+        report_top_pages
+    )]
     
-    # If a specific page URL is provided, get trend for that page
+    # If a specific page URL is provided, get its trend and keywords
     if args.page_url:
-        trend_df = client.get_page_trend(args.page_url, args.days)
+        jobs.append(QueryJob(
+            f"page_trend_{args.days}_days",
+            lambda: client.get_page_trend(args.page_url, args.days),
+            report_page_trend
+        ))
+        jobs.append(QueryJob(
+            f"page_keywords_{args.days}_days",
+            lambda: client.get_page_keywords(args.page_url, args.days, args.limit),
+            report_page_keywords
+        ))
         
-        if not trend_df.empty:
-            print(f"\n=== Page Trend: {args.page_url} ===")
-            print(trend_df.head())
-            
-            # Save to CSV
-            save_to_csv(trend_df, f"page_trend_{args.days}_days", args.output_dir)
-            
-        # Get keywords for the page
-        keywords_df = client.get_page_keywords(args.page_url, args.days, args.limit)
+    return jobs
+
+def timed_fetch(job):
+    """Run a job's query and time it"""
+    start = time.perf_counter()
+    result = job.fetch()
+    return result, time.perf_counter() - start
+
+def finish_job(job, result, seconds, args, timings):
+    """Report a finished job and return its follow-up jobs"""
+    timings.append(JobTiming(job.name, len(result) if result is not None else 0, seconds))
+    return job.report(result, args) or []
+
+def run_jobs(jobs, args):
+    """
+    Run query jobs, printing and saving each result as it completes
+    
+    Args:
+        jobs (list): Query jobs to run
+        args (argparse.Namespace): Command line arguments
         
-        if not keywords_df.empty:
-            print(f"\n=== Keywords for Page: {args.page_url} ===")
-            print(keywords_df.head(10))  # Show top 10
-            
-            # Save to CSV
-            save_to_csv(keywords_df, f"page_keywords_{args.days}_days", args.output_dir)
+    Returns:
+        list: Timing of every job that ran
+    """
+    timings = []
+    
+    if args.parallel <= 1:
+        pending = list(jobs)
+        while pending:
+            job = pending.pop(0)
+            try:
+                result, seconds = timed_fetch(job)
+            except Exception as e:
+                logger.error(f"Query {job.name} failed: {e}")
+                continue
+            pending[:0] = finish_job(job, result, seconds, args, timings)
+        return timings
+        
+    # Queries run on the pool; results are reported and saved on this thread
+    with ThreadPoolExecutor(max_workers=args.parallel) as pool:
+        futures = {pool.submit(timed_fetch, job): job for job in jobs}
+        while futures:
+            future = next(as_completed(futures))
+            job = futures.pop(future)
+            try:
+                result, seconds = future.result()
+            except Exception as e:
+                logger.error(f"Query {job.name} failed: {e}")
+                continue
+            for follow_up in finish_job(job, result, seconds, args, timings):
+                futures[pool.submit(timed_fetch, follow_up)] = follow_up
+                
+    return timings
+
+def print_timings(timings, wall_seconds, args):
+    """Print per-query timings and the wall time against running sequentially"""
+    if not timings:
+        return
+        
+    sequential_seconds = sum(timing.seconds for timing in timings)
+    
+    print("\n=== Query Timings ===")
+    table = pd.DataFrame([
+        {'query': timing.name, 'rows': timing.rows, 'seconds': round(timing.seconds, 2)}
+        for timing in timings
+    ])
+    print(table.to_string(index=False))
+    print(f"\nWorkers: {max(args.parallel, 1)}")
+    print(f"Sum of query times (sequential): {sequential_seconds:.2f}s")
+    print(f"Wall time: {wall_seconds:.2f}s")
+    if wall_seconds > 0:
+        print(f"Speedup: {sequential_seconds / wall_seconds:.2f}x")
+
+def run_time_period_queries(args):
+    """Run time period queries"""
+    logger.info("Running time period queries")
+    return run_jobs(time_period_jobs(args), args)
+
+def run_domain_queries(args):
+    """Run domain queries"""
+    logger.info("Running domain queries")
+    return run_jobs(domain_jobs(args), args)
+
+def run_keyword_queries(args):
+    """Run keyword queries"""
+    logger.info("Running keyword queries")
+    return run_jobs(keyword_jobs(args), args)
+
+def run_page_queries(args):
+    """Run page queries"""
+    logger.info("Running page queries")
+    return run_jobs(page_jobs(args), args)
 
 def main():
     """Main function"""
@@ -210,25 +379,34 @@ def main():
     # Create output directory if it doesn't exist
     os.makedirs(args.output_dir, exist_ok=True)
     
-    # Run queries based on arguments
+    if args.update_host_table:
+        if not DomainQueries(args.credentials).update_host_table():
+            sys.exit(1)
+        return
+        
+    # Collect jobs based on arguments
+    builders = []
     if args.time_period:
-        run_time_period_queries(args)
+        builders.append(time_period_jobs)
         
     if args.domains:
-        run_domain_queries(args)
+        builders.append(domain_jobs)
         
     if args.keywords:
-        run_keyword_queries(args)
+        builders.append(keyword_jobs)
         
     if args.pages:
-        run_page_queries(args)
+        builders.append(page_jobs)
         
     # If no specific query type is specified, run all
-    if not (args.time_period or args.domains or args.keywords or args.pages):
-        run_time_period_queries(args)
-        run_domain_queries(args)
-        run_keyword_queries(args)
-        run_page_queries(args)
+    if not builders:
+        builders = [time_period_jobs, domain_jobs, keyword_jobs, page_jobs]
+        
+    jobs = [job for build in builders for job in build(args)]
+    
+    start = time.perf_counter()
+    timings = run_jobs(jobs, args)
+    print_timings(timings, time.perf_counter() - start, args)
 
 if __name__ == '__main__':
     main()
@@ -3,12 +3,16 @@ Time period specific queries for Search Console data.
 """
 
 from .base_queries import SearchConsoleQueries
+from datetime import datetime, timedelta
 import pandas as pd
 import logging
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Look-back windows covered by the all-periods methods
+TIME_PERIODS = [7, 30, 90]
+
 class TimePeriodQueries:
     """Queries for specific time periods (7, 30, 90 days)"""
     
@@ -67,11 +71,10 @@ class TimePeriodQueries:
         """
         logger.info("Getting metrics for all time periods")
         
-        return {
-            "last_7_days": self.get_last_7_days_metrics(domain),
-            "last_30_days": self.get_last_30_days_metrics(domain),
-            "last_90_days": self.get_last_90_days_metrics(domain)
-        }
+        # One scan of the 90-day range covers the shorter windows too
+        metrics = self.base_client.get_multi_window_metrics(TIME_PERIODS, domain)
+        
+        return {f"last_{days_back}_days": metrics[days_back] for days_back in TIME_PERIODS}
         
     def get_daily_metrics_for_period(self, days_back, domain=None):
         """
@@ -99,8 +102,17 @@ class TimePeriodQueries:
         """
         logger.info("Getting daily metrics for all time periods")
         
-        return {
-            "last_7_days": self.get_daily_metrics_for_period(7, domain),
-            "last_30_days": self.get_daily_metrics_for_period(30, domain),
-            "last_90_days": self.get_daily_metrics_for_period(90, domain)
-        }
+        # The 90-day daily rows contain the shorter periods; derive them locally
+        daily_df = self.get_daily_metrics_for_period(max(TIME_PERIODS), domain)
+        end_date = datetime.now().date()
+        
+        periods = {}
+        for days_back in TIME_PERIODS:
+            if daily_df.empty:
+                periods[f"last_{days_back}_days"] = daily_df
+                continue
+            start_date = end_date - timedelta(days=days_back)
+            in_period = pd.to_datetime(daily_df['date']).dt.date >= start_date
+            periods[f"last_{days_back}_days"] = daily_df[in_period].reset_index(drop=True)
+            
+        return periods
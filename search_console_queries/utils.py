@@ -2,12 +2,22 @@
 Utility functions for Search Console queries.
 """
 
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
+import json
+import time
 import logging
-from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from datetime import datetime, date
+from urllib.parse import quote
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -67,19 +77,188 @@ def save_to_csv(df, filename, output_dir='./output'):
     
     return path
 
-def plot_daily_metrics(df, metric_cols=None, title=None, figsize=(12, 6), output_file=None):
+# Parquet dataset layout: <output_dir>/parquet/query_type=<name>/date=<YYYY-MM-DD>/part-*.parquet
+PARQUET_DIR = 'parquet'
+INDEX_FILE = '_index.json'
+# Partition value of rows without a date; Hive partitioning reads it back as null
+NULL_PARTITION = '__HIVE_DEFAULT_PARTITION__'
+
+PARTITIONING = ds.partitioning(
+    pa.schema([('query_type', pa.string()), ('date', pa.date32())]),
+    flavor='hive'
+)
+
+def _parquet_root(output_dir):
+    """Get the root directory of the Parquet dataset"""
+    return os.path.join(output_dir, PARQUET_DIR)
+
+def load_parquet_index(output_dir='./output'):
     """
-    Plot daily metrics
+    Load the index of written Parquet partitions
+    
+    Args:
+        output_dir (str): Output directory
+        
+    Returns:
+        dict: Partitions keyed by "query_type=<name>/date=<YYYY-MM-DD>"
+    """
+    path = os.path.join(_parquet_root(output_dir), INDEX_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f).get('partitions', {})
+
+def _save_parquet_index(output_dir, partitions):
+    """Write the partition index, replacing the old one in a single step"""
+    path = os.path.join(_parquet_root(output_dir), INDEX_FILE)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump({'partitions': partitions}, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def _partition_key(query_type, partition_date):
+    """Get the relative directory of a partition"""
+    return f"query_type={quote(query_type, safe='')}/date={partition_date}"
+
+def partition_written(query_type, partition_date=None, output_dir='./output'):
+    """
+    Check whether a partition has already been written
+    
+    Args:
+        query_type (str): Query type
+        partition_date (date): Partition date, defaults to today
+        output_dir (str): Output directory
+        
+    Returns:
+        bool: True if the index lists the partition
+    """
+    partition_date = partition_date or date.today()
+    return _partition_key(query_type, partition_date.isoformat()) in load_parquet_index(output_dir)
+
+def save_to_parquet(df, query_type, output_dir='./output', resume=False):
+    """
+    Append a DataFrame to the Hive-partitioned Parquet dataset
+    
+    Rows are partitioned by query type and by their 'date' column, or by
+    today's date for results without one. Rows whose date is missing go to the
+    ``NULL_PARTITION`` partition rather than being dropped. Every call adds
+    new part files, so earlier runs are never overwritten.
+    
+    Args:
+        df (pd.DataFrame): DataFrame to save
+        query_type (str): Query type, e.g. "top_keywords_30_days"
+        output_dir (str): Output directory
+        resume (bool): Skip partitions that are already written
+        
+    Returns:
+        list: Paths of the written part files
+    """
+    if df.empty:
+        logger.warning(f"DataFrame is empty, not saving {query_type}")
+        return []
+        
+    root = _parquet_root(output_dir)
+    os.makedirs(root, exist_ok=True)
+    partitions = load_parquet_index(output_dir)
+    
+    # Results without a date column are snapshots taken today
+    if 'date' in df.columns:
+        dates = pd.to_datetime(df['date']).dt.date
+        data = df.drop(columns=['date'])
+    else:
+        dates = pd.Series(date.today(), index=df.index)
+        data = df
+        
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+    paths = []
+    
+    missing = int(dates.isna().sum())
+    if missing:
+        logger.warning(f"{missing} rows of {query_type} have no date; saving them to the {NULL_PARTITION} partition")
+        
+    for partition_date, rows in data.groupby(dates.values, sort=True, dropna=False):
+        partition_date = None if pd.isna(partition_date) else partition_date.isoformat()
+        key = _partition_key(query_type, partition_date or NULL_PARTITION)
+        if resume and key in partitions:
+            logger.info(f"Partition {key} already written, skipping")
+            continue
+            
+        directory = os.path.join(root, key)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"part-{timestamp}.parquet")
+        pq.write_table(
+            pa.Table.from_pandas(rows.reset_index(drop=True), preserve_index=False),
+            path,
+            compression='zstd'
+        )
+        
+        partition = partitions.setdefault(key, {
+            'query_type': query_type,
+            'date': partition_date,
+            'files': []
+        })
+        partition['files'].append({
+            'path': os.path.relpath(path, root),
+            'rows': len(rows),
+            'written_at': datetime.now().isoformat(timespec='seconds')
+        })
+        paths.append(path)
+        
+    if paths:
+        _save_parquet_index(output_dir, partitions)
+        logger.info(f"Saved {len(paths)} partition(s) of {query_type} to {root}")
+        
+    return paths
+
+def read_parquet_dataset(query_type, output_dir='./output', start_date=None, end_date=None,
+                         columns=None, filter=None):
+    """
+    Read one query type from the Parquet dataset
+    
+    The index selects the partition files to open, so only the requested
+    dates are read; ``columns`` and ``filter`` are pushed down to the
+    Parquet scan.
+    
+    Args:
+        query_type (str): Query type
+        output_dir (str): Output directory
+        start_date (date): First partition date to read
+        end_date (date): Last partition date to read
+        columns (list): Columns to read, defaults to all
+        filter (pyarrow.dataset.Expression): Row filter, e.g. ds.field('total_clicks') > 10
+        
+    Returns:
+        pd.DataFrame: Rows with 'query_type' and 'date' partition columns
+    """
+    root = _parquet_root(output_dir)
+    files = [
+        os.path.join(root, file['path'])
+        for partition in load_parquet_index(output_dir).values()
+        if partition['query_type'] == query_type
+        # Rows without a date are only read when no date range is given
+        and (start_date is None and end_date is None or partition['date'] is not None)
+        and (start_date is None or partition['date'] >= start_date.isoformat())
+        and (end_date is None or partition['date'] <= end_date.isoformat())
+        for file in partition['files']
+    ]
+    
+    if not files:
+        logger.warning(f"No Parquet partitions found for {query_type}")
+        return pd.DataFrame()
+        
+    dataset = ds.dataset(files, format='parquet', partitioning=PARTITIONING, partition_base_dir=root)
+    return dataset.to_table(columns=columns, filter=filter).to_pandas()
+
+def _valid_metric_cols(df, metric_cols=None):
+    """
+    Check a DataFrame can be plotted and pick its metric columns
     
     Args:
         df (pd.DataFrame): DataFrame with daily metrics
         metric_cols (list): List of metric columns to plot
-        title (str): Plot title
-        figsize (tuple): Figure size
-        output_file (str): Output file path
         
     Returns:
-        plt.Figure: Matplotlib figure
+        list: Metric columns to plot, or None if there is nothing to plot
     """
     if df.empty:
         logger.warning("DataFrame is empty, not creating plot")
@@ -100,34 +279,135 @@ def plot_daily_metrics(df, metric_cols=None, title=None, figsize=(12, 6), output
         logger.warning("No valid metric columns found, not creating plot")
         return None
         
-    # Create plot
-    plt.figure(figsize=figsize)
-    
-    # Set style
-    sns.set_style("whitegrid")
+    return metric_cols
+
+def _draw_daily_metrics(ax, df, metric_cols, title=None):
+    """Draw daily metric lines onto an Axes"""
+    # One point per date needs no aggregation; skip seaborn's estimator then
+    estimator = None if df['date'].is_unique else 'mean'
     
     # Plot each metric
     for col in metric_cols:
-        sns.lineplot(x='date', y=col, data=df, label=col)
+        sns.lineplot(x='date', y=col, data=df, label=col, ax=ax, estimator=estimator)
         
     # Set title and labels
-    plt.title(title or "Daily Metrics")
-    plt.xlabel("Date")
-    plt.ylabel("Value")
-    plt.xticks(rotation=45)
-    plt.tight_layout()
+    ax.set_title(title or "Daily Metrics")
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Value")
+    ax.tick_params(axis='x', labelrotation=45)
+
+def plot_daily_metrics(df, metric_cols=None, title=None, figsize=(12, 6), output_file=None):
+    """
+    Plot daily metrics
+    
+    The figure is created through pyplot for interactive use; use
+    ``plot_daily_metrics_batch`` to write many plots to files.
+    
+    Args:
+        df (pd.DataFrame): DataFrame with daily metrics
+        metric_cols (list): List of metric columns to plot
+        title (str): Plot title
+        figsize (tuple): Figure size
+        output_file (str): Output file path
+        
+    Returns:
+        plt.Figure: Matplotlib figure
+    """
+    metric_cols = _valid_metric_cols(df, metric_cols)
+    if metric_cols is None:
+        return None
+        
+    # Create plot
+    fig = plt.figure(figsize=figsize)
+    
+    # Set style
+    sns.set_style("whitegrid")
+    
+    _draw_daily_metrics(fig.gca(), df, metric_cols, title)
+    fig.tight_layout()
     
     # Save if output file is specified
     if output_file:
-        plt.savefig(output_file)
+        fig.savefig(output_file)
         logger.info(f"Saved plot to {output_file}")
         
-    return plt.gcf()
+    return fig
+
+def _render_daily_metrics_file(job):
+    """
+    Render one plot to a file with the object-oriented Agg API
+    
+    The figure is never registered with pyplot and is cleared as soon as it
+    is written, so rendering many plots does not accumulate open figures.
+    
+    Args:
+        job (tuple): DataFrame, plot spec and output path
+        
+    Returns:
+        str: Path to the written file, or None if there was nothing to plot
+    """
+    df, spec, path = job
+    metric_cols = _valid_metric_cols(df, spec.get('metric_cols'))
+    if metric_cols is None:
+        return None
+        
+    fig = Figure(figsize=spec.get('figsize', (12, 6)))
+    FigureCanvasAgg(fig)
+    try:
+        with sns.axes_style("whitegrid"):
+            ax = fig.add_subplot()
+        _draw_daily_metrics(ax, df, metric_cols, spec.get('title'))
+        fig.tight_layout()
+        fig.savefig(path)
+        return path
+    finally:
+        fig.clear()
+
+def plot_daily_metrics_batch(plots, output_dir='./output/plots', fmt='png', workers=None):
+    """
+    Render many daily metric plots to files across a process pool
+    
+    Args:
+        plots (iterable): (DataFrame, spec) pairs; a spec is a dict with 'name'
+            (the file name without extension) and optional 'metric_cols',
+            'title' and 'figsize'
+        output_dir (str): Output directory
+        fmt (str): File format, 'png' or 'svg'
+        workers (int): Number of processes; 1 renders in this process,
+            None uses one per CPU
+            
+    Returns:
+        list: Path of each written file, None where there was nothing to plot
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = [
+        (df, spec, os.path.join(output_dir, f"{spec['name']}.{fmt}"))
+        for df, spec in plots
+    ]
+    if not jobs:
+        return []
+        
+    start = time.perf_counter()
+    
+    if workers == 1:
+        paths = [_render_daily_metrics_file(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunksize = max(1, len(jobs) // (4 * (workers or os.cpu_count() or 1)))
+            paths = list(pool.map(_render_daily_metrics_file, jobs, chunksize=chunksize))
+            
+    seconds = time.perf_counter() - start
+    logger.info(f"Rendered {len(jobs)} plots in {seconds:.2f}s ({len(jobs) / seconds:.1f} plots/s)")
+    
+    return paths
 
 def calculate_period_over_period_change(current_df, previous_df, metric_cols=None):
     """
     Calculate period-over-period change
     
+    Rows of the two frames are compared position by position, so single-row
+    totals and per-key frames (sorted the same way) both work.
+    
     Args:
         current_df (pd.DataFrame): Current period DataFrame
         previous_df (pd.DataFrame): Previous period DataFrame
@@ -151,22 +431,25 @@ def calculate_period_over_period_change(current_df, previous_df, metric_cols=Non
         logger.warning("No valid metric columns found, not calculating changes")
         return pd.DataFrame()
         
-    # Create DataFrame for changes
-    changes = pd.DataFrame()
+    # One array operation per metric over all rows
+    rows = min(len(current_df), len(previous_df))
+    current = current_df[metric_cols].iloc[:rows].to_numpy(dtype=np.float64)
+    previous = previous_df[metric_cols].iloc[:rows].to_numpy(dtype=np.float64)
+    change = current - previous
     
-    # Calculate changes for each metric
-    for col in metric_cols:
-        current_val = current_df[col].iloc[0] if len(current_df) > 0 else 0
-        previous_val = previous_df[col].iloc[0] if len(previous_df) > 0 else 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pct_change = np.where(
+            previous == 0,
+            np.where(current > 0, np.inf, 0.0),
+            change / previous
+        )
         
-        if previous_val == 0:
-            pct_change = float('inf') if current_val > 0 else 0
-        else:
-            pct_change = (current_val - previous_val) / previous_val
-            
-        changes[col] = [current_val]
-        changes[f"{col}_prev"] = [previous_val]
-        changes[f"{col}_change"] = [current_val - previous_val]
-        changes[f"{col}_pct_change"] = [pct_change]
+    # Create DataFrame for changes
+    changes = {}
+    for i, col in enumerate(metric_cols):
+        changes[col] = current[:, i]
+        changes[f"{col}_prev"] = previous[:, i]
+        changes[f"{col}_change"] = change[:, i]
+        changes[f"{col}_pct_change"] = pct_change[:, i]
         
-    return changes
+    return pd.DataFrame(changes)
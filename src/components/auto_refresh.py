@@ -0,0 +1,48 @@
+"""
+Auto-refresh panel driven by the change-detecting refresh scheduler.
+"""
+
+import streamlit as st
+
+from ..data.refresh import RefreshScheduler
+
+# Session state key holding the dataset versions this session has rendered
+SEEN_VERSIONS_KEY = 'refresh_seen_versions'
+
+
+def auto_refresh_panel(scheduler: RefreshScheduler, interval: int) -> None:
+    """
+    Poll for changed datasets on an interval and update the page in place
+
+    The poll itself runs as a fragment, so an unchanged poll does not rerun
+    the page. When any dataset was reloaded the page reruns once, and only
+    the reloaded datasets miss their caches.
+
+    Args:
+        scheduler (RefreshScheduler): Process-wide scheduler shared by sessions
+        interval (int): Seconds between polls
+    """
+    @st.fragment(run_every=interval)
+    def refresh_watcher():
+        scheduler.poll(interval=interval)
+
+        versions = scheduler.versions()
+        seen = st.session_state.get(SEEN_VERSIONS_KEY)
+        st.session_state[SEEN_VERSIONS_KEY] = versions
+
+        report = scheduler.last_report
+        if report:
+            message = f"🔄 Checked {report.checked_at:%H:%M:%S}"
+            if report.reloaded:
+                message += f" · reloaded: {', '.join(report.reloaded)}"
+            if report.unchanged:
+                message += f" · unchanged: {', '.join(report.unchanged)}"
+            if report.errors:
+                message += f" · failed: {', '.join(report.errors)}"
+            st.caption(message)
+
+        # Something changed since this session last rendered: update the page
+        if seen is not None and seen != versions:
+            st.rerun()
+
+    refresh_watcher()
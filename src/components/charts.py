@@ -9,6 +9,25 @@ import pandas as pd
 from typing import Dict, List, Any, Optional, Union
 import numpy as np
 
+from .figure_cache import cached_figure
+from .downsampling import (
+    DEFAULT_CHART_WIDTH,
+    MARKER_THRESHOLD,
+    annotate_point_counts,
+    downsample_frame,
+    max_points_for_width
+)
+
+# Switch scatter-type traces to WebGL above this many points
+WEBGL_THRESHOLD = 5000
+
+# Label individual points up to this count, dense regions beyond it
+POINT_LABEL_LIMIT = 50
+
+# Grid used to find dense regions when labels are aggregated
+DENSE_LABEL_GRID = 6
+
+@cached_figure
 def create_conversion_funnel(data: Dict[str, int], title: str = "Marketing Conversion Funnel") -> go.Figure:
     """Create a conversion funnel chart"""
     
@@ -45,6 +64,7 @@ def create_conversion_funnel(data: Dict[str, int], title: str = "Marketing Conve
     
     return fig
 
+@cached_figure
 def create_geographic_heatmap(data: pd.DataFrame, 
                             location_col: str,
                             value_col: str,
@@ -73,6 +93,7 @@ def create_geographic_heatmap(data: pd.DataFrame,
     
     return fig
 
+@cached_figure
 def create_competitor_comparison(data: pd.DataFrame,
                                competitors: List[str],
                                metrics: List[str],
@@ -84,9 +105,13 @@ def create_competitor_comparison(data: pd.DataFrame,
     # Define colors for each competitor
     colors = ['#667eea', '#764ba2', '#a855f7', '#ec4899', '#f59e0b']
     
+    # Large comparisons are drawn with WebGL instead of SVG
+    present = [c for c in competitors if c in data.columns]
+    polar_trace = go.Scatterpolargl if len(data) * len(present) > WEBGL_THRESHOLD else go.Scatterpolar
+    
     for i, competitor in enumerate(competitors):
         if competitor in data.columns:
-            fig.add_trace(go.Scatterpolar(
+            fig.add_trace(polar_trace(
                 r=data[competitor].values,
                 theta=metrics,
                 fill='toself',
@@ -114,29 +139,36 @@ def create_competitor_comparison(data: pd.DataFrame,
     
     return fig
 
+@cached_figure
 def create_time_series_comparison(data: pd.DataFrame,
                                 date_col: str,
                                 value_cols: List[str],
-                                title: str = "Time Series Comparison") -> go.Figure:
+                                title: str = "Time Series Comparison",
+                                chart_width: int = DEFAULT_CHART_WIDTH) -> go.Figure:
     """Create a time series comparison chart with multiple lines"""
     
     fig = go.Figure()
     
     colors = ['#667eea', '#764ba2', '#a855f7', '#ec4899', '#f59e0b']
+    max_points = max_points_for_width(chart_width)
+    samplings = []
     
     for i, col in enumerate(value_cols):
         if col in data.columns:
+            # Downsample each line on its own so it keeps its own extremes
+            trace_data, sampling = downsample_frame(data, date_col, [col], max_points)
+            samplings.append(sampling)
             fig.add_trace(go.Scatter(
-                x=data[date_col],
-                y=data[col],
-                mode='lines+markers',
+                x=trace_data[date_col],
+                y=trace_data[col],
+                mode='lines+markers' if sampling.rendered_points <= MARKER_THRESHOLD else 'lines',
                 name=col,
                 line=dict(color=colors[i % len(colors)], width=2),
                 marker=dict(size=6)
             ))
     
     # Add range selector buttons
-    fig.update_xaxis(
+    fig.update_xaxes(
         rangeselector=dict(
             buttons=list([
                 dict(count=7, label="1w", step="day", stepmode="backward"),
@@ -164,8 +196,9 @@ def create_time_series_comparison(data: pd.DataFrame,
         height=500
     )
     
-    return fig
+    return annotate_point_counts(fig, samplings)
 
+@cached_figure
 def create_performance_gauge(value: float, 
                            title: str,
                            min_value: float = 0,
@@ -210,6 +243,7 @@ def create_performance_gauge(value: float,
     
     return fig
 
+@cached_figure
 def create_traffic_sources_chart(data: pd.DataFrame,
                                source_col: str,
                                value_col: str,
@@ -233,6 +267,7 @@ def create_traffic_sources_chart(data: pd.DataFrame,
     
     return fig
 
+@cached_figure
 def create_keyword_cloud(keywords: pd.DataFrame,
                         keyword_col: str,
                         weight_col: str,
@@ -258,6 +293,7 @@ def create_keyword_cloud(keywords: pd.DataFrame,
     
     return fig
 
+@cached_figure
 def create_cohort_analysis(data: pd.DataFrame,
                          cohort_col: str,
                          period_col: str,
@@ -295,25 +331,82 @@ def create_cohort_analysis(data: pd.DataFrame,
     
     return fig
 
+def _dense_region_labels(data: pd.DataFrame,
+                         x_col: str,
+                         y_col: str,
+                         label_col: str,
+                         weight_col: Optional[str] = None,
+                         grid: int = DENSE_LABEL_GRID) -> List[Dict[str, Any]]:
+    """Summarize points into one label per occupied grid cell"""
+    
+    weights = data[weight_col] if weight_col else pd.Series(1, index=data.index)
+    cells = pd.DataFrame({
+        'x': data[x_col],
+        'y': data[y_col],
+        'label': data[label_col].astype(str),
+        'weight': weights,
+        'x_bin': pd.cut(data[x_col], grid, labels=False),
+        'y_bin': pd.cut(data[y_col], grid, labels=False)
+    }).dropna(subset=['x_bin', 'y_bin'])
+    
+    # Each cell is labelled with its heaviest point and how many it stands for
+    top = cells.sort_values('weight', ascending=False).groupby(['x_bin', 'y_bin']).agg(
+        x=('x', 'mean'),
+        y=('y', 'mean'),
+        label=('label', 'first'),
+        count=('label', 'size')
+    )
+    
+    return [
+        {
+            'x': row.x,
+            'y': row.y,
+            'text': row.label if row.count == 1 else f"{row.label} +{row.count - 1:,}"
+        }
+        for row in top.itertuples()
+    ]
+
+@cached_figure
 def create_performance_matrix(data: pd.DataFrame,
                             x_col: str,
                             y_col: str,
                             size_col: Optional[str] = None,
                             color_col: Optional[str] = None,
-                            title: str = "Performance Matrix") -> go.Figure:
+                            title: str = "Performance Matrix",
+                            label_col: Optional[str] = None,
+                            hover_cols: Optional[List[str]] = None) -> go.Figure:
     """Create a scatter plot matrix for performance analysis"""
     
+    # Large matrices use WebGL and keep hover data to the plotted fields
+    use_webgl = len(data) > WEBGL_THRESHOLD
+    # Label points directly when few, otherwise one label per dense region
+    label_points = bool(label_col) and len(data) <= POINT_LABEL_LIMIT
+    
     fig = px.scatter(
         data,
         x=x_col,
         y=y_col,
         size=size_col if size_col else None,
         color=color_col if color_col else None,
+        hover_name=label_col,
+        hover_data=None if use_webgl else hover_cols,
+        text=label_col if label_points else None,
         title=title,
         color_continuous_scale='Viridis',
-        size_max=50
+        size_max=50,
+        render_mode='webgl' if use_webgl else 'svg'
     )
     
+    if use_webgl:
+        fig.update_traces(marker_line_width=0)
+    
+    if label_points:
+        fig.update_traces(textposition='top center')
+    elif label_col:
+        for label in _dense_region_labels(data, x_col, y_col, label_col, size_col):
+            fig.add_annotation(x=label['x'], y=label['y'], text=label['text'],
+                               showarrow=False, font=dict(size=10, color='#4b5563'))
+    
     # Add quadrant lines
     x_mid = data[x_col].median()
     y_mid = data[y_col].median()
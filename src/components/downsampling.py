@@ -0,0 +1,215 @@
+"""
+Server-side downsampling for long time-series charts.
+
+Traces are reduced with Largest-Triangle-Three-Buckets (LTTB) before they are
+handed to Plotly, so the browser never receives more points than the chart
+can show. Series LTTB cannot handle (non-numeric x, gaps in y) fall back to a
+min/max bucket reduction that keeps every local extreme.
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+# Assumed plot width when the real container width is unknown
+DEFAULT_CHART_WIDTH = 1200
+
+# Rendered points per horizontal pixel
+POINTS_PER_PIXEL = 1.0
+
+# Draw markers only when a trace is sparse enough for them to be readable
+MARKER_THRESHOLD = 120
+
+
+@dataclass
+class DownsampleResult:
+    """Point counts before and after downsampling a trace"""
+    original_points: int
+    rendered_points: int
+    method: str
+
+    @property
+    def downsampled(self) -> bool:
+        return self.rendered_points < self.original_points
+
+
+def max_points_for_width(chart_width: int = DEFAULT_CHART_WIDTH,
+                         points_per_pixel: float = POINTS_PER_PIXEL) -> int:
+    """Cap on points per trace for a chart of the given pixel width"""
+    return max(int(chart_width * points_per_pixel), 3)
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Select point indices with Largest-Triangle-Three-Buckets
+
+    Args:
+        x (np.ndarray): Numeric, ascending x values
+        y (np.ndarray): Numeric y values without NaNs
+        n_out (int): Number of points to keep (at least 3)
+
+    Returns:
+        np.ndarray: Sorted indices of the points to keep
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = x.astype(np.float64)
+    y = y.astype(np.float64)
+
+    # The first and last points are always kept; the rest is split into buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    selected = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+
+        # Average of the next bucket (or the last point) is the third vertex
+        next_start = end
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        # Pick the point forming the largest triangle with the previous pick
+        ax, ay = x[selected], y[selected]
+        areas = np.abs(
+            (ax - avg_x) * (y[start:end] - ay) - (ax - x[start:end]) * (avg_y - ay)
+        )
+        selected = start + int(np.argmax(areas))
+        indices[i + 1] = selected
+
+    return indices
+
+
+def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Select point indices keeping the min and max of each bucket
+
+    Args:
+        y (np.ndarray): Numeric y values, NaNs allowed
+        n_out (int): Approximate number of points to keep
+
+    Returns:
+        np.ndarray: Sorted indices of the points to keep
+    """
+    n = len(y)
+    if n_out >= n or n_out < 4:
+        return np.arange(n)
+
+    values = np.where(np.isnan(y), np.nanmean(y) if np.isfinite(y).any() else 0.0, y)
+    edges = np.linspace(0, n, (n_out - 2) // 2 + 1).astype(np.int64)
+    keep = [0, n - 1]
+    for start, end in zip(edges[:-1], edges[1:]):
+        if end > start:
+            bucket = values[start:end]
+            keep.append(start + int(np.argmin(bucket)))
+            keep.append(start + int(np.argmax(bucket)))
+
+    return np.unique(np.asarray(keep, dtype=np.int64))
+
+
+def _numeric_x(x: pd.Series) -> Optional[np.ndarray]:
+    """Convert x to float64 for LTTB, or None if it is not numeric"""
+    if pd.api.types.is_datetime64_any_dtype(x):
+        return x.astype('int64').to_numpy(dtype=np.float64)
+    if pd.api.types.is_numeric_dtype(x):
+        return x.to_numpy(dtype=np.float64)
+    try:
+        return pd.to_datetime(x).astype('int64').to_numpy(dtype=np.float64)
+    except (ValueError, TypeError):
+        return None
+
+
+def downsample_indices(x: pd.Series, y: pd.Series,
+                       max_points: int) -> Tuple[np.ndarray, DownsampleResult]:
+    """
+    Choose which points of one trace to render
+
+    Args:
+        x (pd.Series): x values, ascending
+        y (pd.Series): y values
+        max_points (int): Cap on rendered points
+
+    Returns:
+        tuple: Indices to keep and the before/after point counts
+    """
+    n = len(y)
+    if n <= max_points:
+        return np.arange(n), DownsampleResult(n, n, 'none')
+
+    y_values = pd.to_numeric(y, errors='coerce').to_numpy(dtype=np.float64)
+    x_values = _numeric_x(x)
+
+    if x_values is not None and not np.isnan(y_values).any() and not np.isnan(x_values).any():
+        indices, method = lttb_indices(x_values, y_values, max_points), 'lttb'
+    else:
+        indices, method = minmax_indices(y_values, max_points), 'minmax'
+
+    return indices, DownsampleResult(n, len(indices), method)
+
+
+def downsample_frame(data: pd.DataFrame, x_col: str, y_cols: List[str],
+                     max_points: Optional[int] = None) -> Tuple[pd.DataFrame, DownsampleResult]:
+    """
+    Downsample a frame for charts that draw several y columns from it
+
+    The kept rows are the union of the rows each column would keep, so every
+    trace keeps its own extremes.
+
+    Args:
+        data (pd.DataFrame): Chart data
+        x_col (str): x column
+        y_cols (list): y columns drawn as separate traces
+        max_points (int, optional): Cap per trace, defaults to the chart width
+
+    Returns:
+        tuple: Downsampled frame sorted by x and the before/after row counts
+    """
+    if max_points is None:
+        max_points = max_points_for_width()
+
+    ordered = data.sort_values(x_col).reset_index(drop=True)
+    if len(ordered) <= max_points:
+        return ordered, DownsampleResult(len(ordered), len(ordered), 'none')
+
+    keep = []
+    methods = set()
+    for col in y_cols:
+        if col in ordered.columns:
+            indices, result = downsample_indices(ordered[x_col], ordered[col], max_points)
+            keep.append(indices)
+            methods.add(result.method)
+
+    if not keep:
+        return ordered, DownsampleResult(len(ordered), len(ordered), 'none')
+
+    rows = np.unique(np.concatenate(keep))
+    method = 'lttb' if methods == {'lttb'} else 'minmax'
+    return ordered.iloc[rows].reset_index(drop=True), DownsampleResult(len(ordered), len(rows), method)
+
+
+def annotate_point_counts(fig: go.Figure, results: List[DownsampleResult]) -> go.Figure:
+    """Record original vs. rendered point counts on the figure"""
+    original = sum(r.original_points for r in results)
+    rendered = sum(r.rendered_points for r in results)
+
+    meta = dict(fig.layout.meta) if isinstance(fig.layout.meta, dict) else {}
+    meta.update({'original_points': original, 'rendered_points': rendered})
+    fig.update_layout(meta=meta)
+
+    if rendered < original:
+        fig.add_annotation(
+            text=f"Showing {rendered:,} of {original:,} points",
+            xref='paper', yref='paper', x=1, y=1.02,
+            xanchor='right', yanchor='bottom',
+            showarrow=False,
+            font=dict(size=11, color='gray')
+        )
+
+    return fig
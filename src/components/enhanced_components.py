@@ -9,6 +9,15 @@ from plotly.subplots import make_subplots
 from typing import Dict, List, Any, Optional, Union
 import pandas as pd
 
+from .figure_cache import cached_figure
+from .downsampling import (
+    DEFAULT_CHART_WIDTH,
+    MARKER_THRESHOLD,
+    annotate_point_counts,
+    downsample_frame,
+    max_points_for_width
+)
+
 def load_enhanced_css():
     """Load custom CSS for enhanced styling"""
     st.markdown("""
@@ -165,19 +174,26 @@ def create_enhanced_metric_card(title: str, value: Union[str, int, float],
     
     st.markdown(html, unsafe_allow_html=True)
 
+@cached_figure
 def create_enhanced_trend_chart(data: pd.DataFrame, title: str, 
                               x_col: str, y_col: str,
                               color: str = '#667eea',
-                              show_average: bool = False) -> go.Figure:
+                              show_average: bool = False,
+                              chart_width: int = DEFAULT_CHART_WIDTH) -> go.Figure:
     """Create an enhanced trend chart with customization options"""
     
     fig = go.Figure()
     
+    # Downsample long series; the average below still uses every point
+    plot_data, sampling = downsample_frame(
+        data, x_col, [y_col], max_points_for_width(chart_width)
+    )
+    
     # Main line
     fig.add_trace(go.Scatter(
-        x=data[x_col],
-        y=data[y_col],
-        mode='lines+markers',
+        x=plot_data[x_col],
+        y=plot_data[y_col],
+        mode='lines+markers' if sampling.rendered_points <= MARKER_THRESHOLD else 'lines',
         name=title,
         line=dict(color=color, width=3),
         marker=dict(size=8, color=color),
@@ -210,8 +226,8 @@ def create_enhanced_trend_chart(data: pd.DataFrame, title: str,
     
     # Add gradient fill under the line
     fig.add_trace(go.Scatter(
-        x=data[x_col],
-        y=data[y_col],
+        x=plot_data[x_col],
+        y=plot_data[y_col],
         fill='tozeroy',
         fillcolor=f'rgba(102, 126, 234, 0.2)',
         line=dict(color='rgba(255,255,255,0)'),
@@ -219,8 +235,9 @@ def create_enhanced_trend_chart(data: pd.DataFrame, title: str,
         hoverinfo='skip'
     ))
     
-    return fig
+    return annotate_point_counts(fig, [sampling])
 
+@cached_figure
 def create_comparison_chart(data: pd.DataFrame, title: str,
                           categories: List[str], values: List[str],
                           chart_type: str = 'bar') -> go.Figure:
@@ -270,6 +287,7 @@ def create_comparison_chart(data: pd.DataFrame, title: str,
     
     return fig
 
+@cached_figure
 def create_donut_chart(labels: List[str], values: List[Union[int, float]], 
                       title: str, hole_size: float = 0.4) -> go.Figure:
     """Create a donut chart"""
@@ -294,6 +312,7 @@ def create_donut_chart(labels: List[str], values: List[Union[int, float]],
     
     return fig
 
+@cached_figure
 def create_heatmap(data: pd.DataFrame, title: str,
                   x_labels: Optional[List[str]] = None,
                   y_labels: Optional[List[str]] = None) -> go.Figure:
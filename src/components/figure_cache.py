@@ -0,0 +1,269 @@
+"""
+Content-addressed cache for Plotly figures.
+
+Chart builders decorated with ``cached_figure`` are keyed by a fast hash of
+their input DataFrames plus every other argument, and by a code version (a
+hash of the builder's module source, the Plotly version and an optional
+explicit ``version``) so figures cached by older code are never served. The serialized figure JSON
+is kept in a process-wide LRU (shared by every Streamlit session) and, when a
+cache directory is configured, on disk so it survives restarts. Both layers
+are evicted by total size.
+"""
+
+import functools
+import hashlib
+import inspect
+import logging
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+import numpy as np
+import pandas as pd
+import plotly
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from ..config.settings import settings
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+def _update_hash(hasher: 'hashlib._Hash', value: Any) -> None:
+    """Feed a chart argument into the hash"""
+    if isinstance(value, pd.DataFrame):
+        hasher.update(b'df')
+        hasher.update(repr((list(value.columns), [str(t) for t in value.dtypes])).encode())
+        try:
+            hasher.update(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+        except TypeError:
+            # Unhashable cells (lists, dicts) fall back to their JSON form
+            hasher.update(value.to_json(date_format='iso').encode())
+    elif isinstance(value, pd.Series):
+        hasher.update(b'series')
+        hasher.update(str(value.name).encode())
+        hasher.update(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+    elif isinstance(value, np.ndarray):
+        hasher.update(b'array')
+        hasher.update(str(value.dtype).encode())
+        hasher.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, dict):
+        hasher.update(b'dict')
+        for key in sorted(value, key=repr):
+            _update_hash(hasher, key)
+            _update_hash(hasher, value[key])
+    elif isinstance(value, (list, tuple)):
+        hasher.update(type(value).__name__.encode())
+        for item in value:
+            _update_hash(hasher, item)
+    else:
+        hasher.update(repr(value).encode())
+    hasher.update(b'|')
+
+
+def figure_key(name: str, *args, **kwargs) -> str:
+    """Build the cache key for a chart builder call"""
+    hasher = hashlib.blake2b(digest_size=20)
+    hasher.update(name.encode())
+    _update_hash(hasher, args)
+    _update_hash(hasher, kwargs)
+    return hasher.hexdigest()
+
+
+class FigureCache:
+    """Size-bounded LRU of serialized figures with an optional disk layer"""
+
+    def __init__(self, max_bytes: int, cache_dir: Optional[str] = None,
+                 max_disk_bytes: Optional[int] = None):
+        """Initialize the cache"""
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes or max_bytes * 4
+        self._entries: 'OrderedDict[str, str]' = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0}
+
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a serialized figure, promoting disk hits into memory"""
+        with self._lock:
+            figure_json = self._entries.get(key)
+            if figure_json is not None:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return figure_json
+
+        figure_json = self._read_disk(key)
+        with self._lock:
+            if figure_json is None:
+                self.stats['misses'] += 1
+                return None
+            self.stats['disk_hits'] += 1
+            self._store(key, figure_json)
+        return figure_json
+
+    def put(self, key: str, figure_json: str) -> None:
+        """Store a serialized figure"""
+        with self._lock:
+            self._store(key, figure_json)
+        self._write_disk(key, figure_json)
+
+    def clear(self) -> None:
+        """Drop every in-memory entry"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size
+
+    def _store(self, key: str, figure_json: str) -> None:
+        """Insert into the LRU and evict down to the size bound (lock held)"""
+        if key in self._entries:
+            self._size -= len(self._entries.pop(key))
+        if len(figure_json) > self.max_bytes:
+            return
+        self._entries[key] = figure_json
+        self._size += len(figure_json)
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+            self.stats['evictions'] += 1
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _read_disk(self, key: str) -> Optional[str]:
+        """Read a figure from the disk layer, if there is one"""
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                figure_json = f.read()
+            os.utime(self._path(key))  # Mark as recently used for eviction
+            return figure_json
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"Error reading cached figure {key}: {e}")
+            return None
+
+    def _write_disk(self, key: str, figure_json: str) -> None:
+        """Write a figure to the disk layer and evict the oldest files"""
+        if not self.cache_dir:
+            return
+        try:
+            tmp_path = f"{self._path(key)}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(figure_json)
+            os.replace(tmp_path, self._path(key))
+            self._evict_disk()
+        except OSError as e:
+            logger.warning(f"Error writing cached figure {key}: {e}")
+
+    def _evict_disk(self) -> None:
+        """Remove least recently used files until the directory fits"""
+        files = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith('.json'):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+
+# Process-wide cache shared by every chart builder
+figure_cache = FigureCache(
+    max_bytes=settings.figure_cache_max_bytes,
+    cache_dir=settings.figure_cache_dir
+)
+
+
+def code_version(func: Callable, version: Optional[str] = None) -> str:
+    """
+    Version of a chart builder's code, for its cache keys
+
+    Hashes the source of the module defining the builder, so edits to the
+    builder or to module-level helpers and constants it uses change the key.
+    Code in other modules is not covered; bump ``version`` for such changes.
+
+    Args:
+        func (callable): Chart builder
+        version (str, optional): Explicit version to mix in
+
+    Returns:
+        str: Hex digest of the code version
+    """
+    hasher = hashlib.blake2b(digest_size=8)
+    hasher.update(f"{plotly.__version__}|{version}|".encode())
+    try:
+        module = sys.modules.get(func.__module__)
+        source = inspect.getsource(module) if module is not None else inspect.getsource(func)
+    except (OSError, TypeError):
+        source = None
+    if source is None:
+        logger.warning(f"No source for {func.__qualname__}; its cached figures are keyed "
+                       f"by the explicit version only")
+    else:
+        hasher.update(source.encode())
+    return hasher.hexdigest()
+
+
+def cached_figure(func: Optional[Callable[..., go.Figure]] = None, *,
+                  version: Optional[str] = None):
+    """
+    Cache a chart builder's figures by its code version and the content of its arguments
+
+    Use as ``@cached_figure`` or ``@cached_figure(version='2')``.
+    """
+    if func is None:
+        return functools.partial(cached_figure, version=version)
+
+    name = f"{func.__module__}.{func.__qualname__}@{code_version(func, version)}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs) -> go.Figure:
+        try:
+            key = figure_key(name, *args, **kwargs)
+        except Exception as e:
+            logger.warning(f"Could not hash arguments for {name}: {e}")
+            return func(*args, **kwargs)
+
+        figure_json = figure_cache.get(key)
+        if figure_json is not None:
+            try:
+                return pio.from_json(figure_json)
+            except Exception as e:
+                # A corrupt or incompatible entry is rebuilt and overwritten
+                reason = str(e).strip().splitlines()[0] if str(e).strip() else type(e).__name__
+                logger.warning(f"Discarding unreadable cached figure for {name}: {reason}")
+
+        fig = func(*args, **kwargs)
+        figure_cache.put(key, fig.to_json())
+        return fig
+
+    wrapper.uncached = func
+    return wrapper
+
+
+def get_figure_cache_stats() -> Dict[str, int]:
+    """Hit/miss counters and current size of the figure cache"""
+    with figure_cache._lock:
+        stats = dict(figure_cache.stats)
+        stats['entries'] = len(figure_cache._entries)
+        stats['size_bytes'] = figure_cache.size_bytes
+    return stats
@@ -0,0 +1,125 @@
+"""
+Fragment-scoped dashboard panels.
+
+Each panel is a ``st.fragment`` with declared inputs: the widgets it owns.
+Changing one of those widgets reruns only that panel instead of the whole
+script. Every run of a panel is recorded in a per-session rerun log, so it is
+visible which panels a full run or a fragment rerun actually executed.
+"""
+
+import functools
+import logging
+import time
+from typing import Any, Callable, Dict, List, Sequence
+import streamlit as st
+
+from ..data.bigquery_client import get_query_count
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Session state keys
+RUN_LOG_KEY = 'rerun_log'
+SHOW_LOG_KEY = 'show_rerun_log'
+
+# Number of reruns kept in the log
+MAX_LOGGED_RUNS = 20
+
+
+def _run_log() -> List[Dict[str, Any]]:
+    """Get the rerun log of this session"""
+    if RUN_LOG_KEY not in st.session_state:
+        st.session_state[RUN_LOG_KEY] = []
+    return st.session_state[RUN_LOG_KEY]
+
+
+def _new_entry(kind: str) -> Dict[str, Any]:
+    """Append a rerun to the log, dropping the oldest ones"""
+    log = _run_log()
+    entry = {
+        'run': log[-1]['run'] + 1 if log else 1,
+        'kind': kind,
+        'open': kind == 'full',
+        'started': time.time(),
+        'panels': []
+    }
+    log.append(entry)
+    del log[:-MAX_LOGGED_RUNS]
+    return entry
+
+
+def begin_script_run() -> None:
+    """Mark the start of a full script run (call at the top of the app)"""
+    _new_entry('full')
+
+
+def end_script_run() -> None:
+    """Mark the end of a full script run (call at the bottom of the app)"""
+    log = _run_log()
+    if log:
+        log[-1]['open'] = False
+
+
+def panel(name: str, inputs: Sequence[str] = ()) -> Callable:
+    """
+    Turn a render function into an independently rerunning panel
+
+    Args:
+        name (str): Panel name for the rerun log; ``str.format`` placeholders
+            are filled from the call arguments, e.g. ``"section:{0}"``
+        inputs (list): Widget keys the panel owns and reruns on, formatted
+            like ``name``
+
+    Returns:
+        callable: Decorator producing a ``st.fragment``
+    """
+    def decorator(func: Callable) -> Callable:
+        @st.fragment
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            label = name.format(*args, **kwargs)
+            panel_inputs = [key.format(*args, **kwargs) for key in inputs]
+
+            # Outside a full run this is a fragment rerun of its own
+            log = _run_log()
+            entry = log[-1] if log and log[-1]['open'] else _new_entry('fragment')
+
+            queries_before = get_query_count()
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            seconds = time.perf_counter() - start
+            queries = get_query_count() - queries_before
+
+            entry['panels'].append({
+                'name': label,
+                'inputs': panel_inputs,
+                'seconds': seconds,
+                'queries': queries
+            })
+            logger.info(
+                f"Panel {label} ran in {entry['kind']} run #{entry['run']} "
+                f"({seconds:.2f}s, {queries} queries)"
+            )
+
+            if st.session_state.get(SHOW_LOG_KEY):
+                st.caption(
+                    f"⚡ {label} · {entry['kind']} run #{entry['run']} · "
+                    f"{seconds:.2f}s · {queries} queries"
+                    + (f" · inputs: {', '.join(panel_inputs)}" if panel_inputs else "")
+                )
+            return result
+
+        return wrapper
+    return decorator
+
+
+def show_rerun_log() -> None:
+    """Show which panels ran in each recent rerun (sidebar)"""
+    if not st.session_state.get(SHOW_LOG_KEY):
+        return
+
+    with st.sidebar.expander("⚡ Rerun log", expanded=True):
+        for entry in reversed(_run_log()):
+            panels = ', '.join(p['name'] for p in entry['panels']) or 'no panels'
+            queries = sum(p['queries'] for p in entry['panels'])
+            st.caption(f"#{entry['run']} {entry['kind']}: {panels} ({queries} queries)")
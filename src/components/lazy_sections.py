@@ -0,0 +1,69 @@
+"""
+Lazy, on-demand dashboard sections.
+
+A lazy section renders a collapsed placeholder until the viewer opens it, so
+the queries behind it only run for people who look at it. Opened sections are
+remembered in the Streamlit session and render eagerly on later reruns.
+"""
+
+from typing import Callable, Set
+import streamlit as st
+
+from .enhanced_components import create_section_header
+
+# Session state key holding the opened section keys
+OPENED_SECTIONS_KEY = 'opened_sections'
+
+
+def get_opened_sections() -> Set[str]:
+    """Get the sections opened in this session"""
+    if OPENED_SECTIONS_KEY not in st.session_state:
+        st.session_state[OPENED_SECTIONS_KEY] = set()
+    return st.session_state[OPENED_SECTIONS_KEY]
+
+
+def lazy_section(key: str, title: str, render: Callable[[], None],
+                 default_open: bool = False) -> bool:
+    """
+    Render a section only once the viewer has opened it
+
+    Args:
+        key (str): Stable identifier of the section
+        title (str): Section header text
+        render (callable): Draws the section, including its data fetches
+        default_open (bool): Render on first load without waiting to be opened
+
+    Returns:
+        bool: Whether the section was rendered in this run
+    """
+    opened = get_opened_sections()
+    if default_open:
+        opened.add(key)
+
+    create_section_header(title)
+
+    if key not in opened:
+        placeholder = st.empty()
+        with placeholder.container():
+            clicked = st.button(f"Load {title}", key=f"load_section_{key}")
+            st.caption("Not loaded yet. Its data is fetched when you open it.")
+        if not clicked:
+            return False
+        opened.add(key)
+        placeholder.empty()
+
+    render()
+    return True
+
+
+def show_query_budget(query_count: int, budget: int) -> None:
+    """Show how many queries this run triggered against the page-load budget"""
+    opened = len(get_opened_sections())
+    message = f"🧮 Queries this run: **{query_count}** / budget {budget}"
+    if opened:
+        message += f" · {opened} section{'s' if opened != 1 else ''} opened"
+
+    if query_count > budget:
+        st.sidebar.warning(message)
+    else:
+        st.sidebar.caption(message)
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, Optional
 import os
 
 class Settings(BaseSettings):
@@ -14,12 +14,61 @@ class Settings(BaseSettings):
     
     # API Settings
     api_base_url: str = "https://fgtwelve.ltd/api/v1"
+    api_pool_size: int = 16  # Pooled connections to the API host
+    api_max_retries: int = 3  # Retries of idempotent requests
+    api_backoff_factor: float = 0.5  # Base of the exponential retry backoff in seconds
+    api_connect_timeout: float = 5  # Seconds to establish a connection
+    api_read_timeout: float = 30  # Seconds to wait for a response
+    api_max_workers: int = 6  # Concurrent requests in fetch_many
+    api_per_host_limit: int = 8  # Concurrent requests per host from the async client
+    api_gather_timeout: float = 60  # Seconds a gathered batch of async calls may take
+    api_cache_enabled: bool = True  # Cache GET responses and revalidate them conditionally
+    api_cache_ttl: int = 60  # Seconds a cached response is served without revalidating
+    api_cache_max_entries: int = 256  # Responses kept in memory
+    api_cache_dir: Optional[str] = None  # Set to also keep responses on disk
+    api_cache_max_disk_bytes: int = 256 * 1024 * 1024  # 256 MB of responses on disk
+    api_rate_limit_enabled: bool = True  # Queue requests behind per-group token buckets
+    api_rate_limit: float = 10  # Requests per second per endpoint group
+    api_rate_limits: Dict[str, float] = {}  # Per-group overrides, e.g. {"system": 5}
+    api_rate_burst: int = 20  # Requests a group may send at once after a quiet spell
+    api_rate_max_wait: float = 10  # Seconds a request may queue before it is turned away
+    api_rate_max_queue: int = 200  # Requests that may queue per group
+    booking_store_dir: Optional[str] = None  # Set to keep booking daily metrics as Parquet parts
+    booking_store_backfill_days: int = 365  # Days fetched the first time the booking store updates
     
     # Application Settings
     debug: bool = False
     log_level: str = "INFO"
     cache_ttl: int = 300  # 5 minutes default
     
+    # Figure Cache Settings
+    figure_cache_max_bytes: int = 64 * 1024 * 1024  # 64 MB of figure JSON in memory
+    figure_cache_dir: Optional[str] = None  # Set to also keep figures on disk
+    
+    # Page Load Settings
+    page_query_budget: int = 6  # BigQuery queries allowed for the initial view
+    auto_refresh_interval: int = 30  # Seconds between freshness checks
+
+    # Stale-While-Revalidate Settings
+    swr_max_stale: int = 300  # Seconds an expired result is still served while it refreshes
+    swr_refresh_lead: int = 30  # Refresh hot results this many seconds before they expire
+    swr_hot_hits: int = 2  # Accesses within a TTL that make a result hot
+    swr_check_interval: int = 10  # Seconds between refresher passes
+    swr_refresh_workers: int = 2  # Background refresh threads
+
+    # Export Settings
+    export_chunk_rows: int = 50000  # Rows fetched and written per chunk
+    export_dir: Optional[str] = None  # Directory for export files; temp dir if unset
+    export_max_download_mb: int = 100  # Largest export offered as a browser download
+    export_retention_hours: int = 24  # Hours before old export files are removed
+
+    # Supabase Bulk Settings
+    supabase_batch_size: int = 500  # Rows per insert/upsert request
+    supabase_write_workers: int = 4  # Concurrent write requests
+    supabase_page_size: int = 1000  # Rows per page when streaming a table
+    supabase_realtime_url: Optional[str] = None  # Defaults to <supabase_url>/realtime/v1
+    realtime_subscribe_timeout: int = 10  # Seconds to wait for a change feed subscription
+    
     class Config:
         env_file = ".env"
         env_file_encoding = 'utf-8'
@@ -2,17 +2,23 @@
 Data access layer for marketing dashboard.
 """
 
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Iterator, List
 import pandas as pd
 import logging
 from datetime import datetime, timedelta
 
-from .bigquery_client import MarketingBigQueryClient
+from .bigquery_client import MarketingBigQueryClient, get_query_count, reset_query_count
 from .supabase_client import MarketingSupabaseClient
 from .queries import MarketingQueries
 from .metadata_queries import MetadataQueries
 from .view_queries import ViewQueries
 from .simple_queries import SimpleQueries
+from .local_store import LocalSearchConsoleStore
+from .booking_store import BookingTimeSeriesStore
+from .api_client import MarketingAPIClient
+from .rate_limit import background_requests
+from .export_queries import ExportQueries
+from .comparison import DateWindow, compare_periods
 from ..config.settings import settings
 
 # Set up logging
@@ -21,6 +27,7 @@ logger = logging.getLogger(__name__)
 # Initialize clients
 _bigquery_client = None
 _supabase_client = None
+_booking_store = None
 
 def get_bigquery_client() -> MarketingBigQueryClient:
     """Get or create BigQuery client singleton"""
@@ -390,6 +397,27 @@ def get_position_distribution() -> pd.DataFrame:
         logger.error(f"Error fetching position distribution: {e}")
         return pd.DataFrame()
 
+# Freshness signals
+def get_table_last_modified(table_name: str, dataset: Optional[str] = None) -> Optional[Any]:
+    """Get a table's last modification time from its metadata"""
+    try:
+        client = get_bigquery_client()
+        return client.get_table_modified(table_name, dataset)
+    except Exception as e:
+        logger.error(f"Error fetching modification time of {table_name}: {e}")
+        return None
+
+def get_dataset_last_modified(dataset: str) -> Optional[Any]:
+    """Get the latest table modification time across a dataset"""
+    try:
+        client = get_bigquery_client()
+        query = MetadataQueries.get_dataset_last_modified(dataset)
+        df = client.query_to_dataframe(query)
+        return df.iloc[0]['last_modified_time'] if not df.empty else None
+    except Exception as e:
+        logger.error(f"Error fetching modification time of dataset {dataset}: {e}")
+        return None
+
 # Simple data functions
 def get_recent_data_check() -> pd.DataFrame:
     """Check what data we have recently"""
@@ -401,6 +429,80 @@ def get_recent_data_check() -> pd.DataFrame:
         logger.error(f"Error checking recent data: {e}")
         return pd.DataFrame()
 
+# Local store functions
+def get_local_search_console_store(days_back: int = 30) -> LocalSearchConsoleStore:
+    """Load row-level search console data into a bitmap-indexed local store"""
+    try:
+        client = get_bigquery_client()
+        query = SimpleQueries.get_search_console_rows(days_back)
+        return LocalSearchConsoleStore(client.query_to_dataframe(query))
+    except Exception as e:
+        logger.error(f"Error loading local search console store: {e}")
+        return LocalSearchConsoleStore(pd.DataFrame())
+
+def get_period_comparison(windows: List[DateWindow], by: Optional[List[str]] = None,
+                          store: Optional[LocalSearchConsoleStore] = None) -> pd.DataFrame:
+    """Compare date windows, per dimension if given, from one query or a local store"""
+    try:
+        if store is not None:
+            columns = ['date'] + list(by or []) + ['clicks', 'impressions', 'position']
+            data = store.frame[columns]
+            data = data.assign(weighted_position=data['position'] * data['impressions'])
+        else:
+            client = get_bigquery_client()
+            query = SimpleQueries.get_daily_metrics_for_windows(
+                [(w.start.isoformat(), w.end.isoformat()) for w in windows], by
+            )
+            data = client.query_to_dataframe(query)
+        if data.empty:
+            return pd.DataFrame()
+        return compare_periods(data, windows, by=by)
+    except Exception as e:
+        logger.error(f"Error comparing periods: {e}")
+        return pd.DataFrame()
+
+# Booking store functions
+def get_booking_store() -> BookingTimeSeriesStore:
+    """Get or create the booking time-series store singleton"""
+    global _booking_store
+    if _booking_store is None:
+        _booking_store = BookingTimeSeriesStore(settings.booking_store_dir,
+                                                settings.booking_store_backfill_days)
+    return _booking_store
+
+def update_booking_store(client: Optional[MarketingAPIClient] = None) -> Dict[str, int]:
+    """Fetch the booking days after the store's watermarks, behind interactive requests"""
+    try:
+        with background_requests():
+            return get_booking_store().update(client or MarketingAPIClient())
+    except Exception as e:
+        logger.error(f"Error updating booking store: {e}")
+        return {}
+
+def get_daily_with_booking_metrics(daily: pd.DataFrame, date_col: str = 'date') -> pd.DataFrame:
+    """Add stored booking metrics to daily Search Console aggregates by date"""
+    try:
+        return get_booking_store().join_daily(daily, date_col)
+    except Exception as e:
+        logger.error(f"Error joining booking metrics: {e}")
+        return daily
+
+# Export datasets: label and query builder taking a start and end date
+EXPORT_DATASETS = {
+    'keywords': ("All keywords", ExportQueries.get_all_keywords),
+    'pages': ("All pages", ExportQueries.get_all_pages),
+    'daily_performance': ("Daily performance", ExportQueries.get_daily_performance),
+    'search_console_rows': ("Raw search console rows", ExportQueries.get_search_console_rows)
+}
+
+def stream_export_dataset(name: str, start_date: str, end_date: str,
+                          chunk_rows: Optional[int] = None) -> Iterator[pd.DataFrame]:
+    """Stream a full export dataset in DataFrame chunks, without a row limit"""
+    _, build_query = EXPORT_DATASETS[name]
+    client = get_bigquery_client()
+    query = build_query(start_date, end_date)
+    return client.query_to_batches(query, chunk_rows or settings.export_chunk_rows)
+
 # Helper functions
 def test_bigquery_connection() -> bool:
     """Test BigQuery connection"""
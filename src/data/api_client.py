@@ -2,17 +2,136 @@
 API client for accessing centralized booking system data.
 """
 
+import contextvars
+import random
+import time
 import requests
 import logging
-from typing import Dict, Any, Optional, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, Optional, List
 from datetime import datetime, timedelta
 import pandas as pd
+from requests.adapters import HTTPAdapter
 
+from .api_records import VehicleStats, decode_json, records_to_frame, slotted_to_frame
+from .http_cache import ResponseCache, response_cache
+from .rate_limit import RateLimiter, rate_limiter
 from ..config.settings import settings
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Responses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Methods that are safe to retry
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS'])
+
+# Longest wait between retries, as in urllib3
+BACKOFF_MAX = 120
+
+# Seconds that responses of rarely changing endpoints stay fresh; others use api_cache_ttl
+ENDPOINT_CACHE_TTLS = {
+    'vehicles': 3600,
+    'system/customer-stats': 900,
+    'system/route-performance': 900,
+    'system/health': 0
+}
+
+API_HEADERS = {
+    'Content-Type': 'application/json',
+    'Accept': 'application/json',
+    'User-Agent': 'Marketing-Dashboard/1.0'
+}
+
+def _retry_delay(attempt: int, backoff_factor: float, retry_after: Optional[str] = None) -> float:
+    """Seconds to wait before a retry: Retry-After if given, else exponential backoff with full jitter"""
+    if retry_after and retry_after.isdigit():
+        return min(float(retry_after), BACKOFF_MAX)
+    return random.uniform(0, min(backoff_factor * (2 ** attempt), BACKOFF_MAX))
+
+def _date_range_params(days_back: int, start_date: Optional[str] = None,
+                       end_date: Optional[str] = None) -> Dict[str, str]:
+    """Query parameters for an explicit date range, or else the last ``days_back`` days"""
+    if start_date and end_date:
+        return {'start_date': start_date, 'end_date': end_date}
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=days_back)
+    return {
+        'start_date': start_date.strftime('%Y-%m-%d'),
+        'end_date': end_date.strftime('%Y-%m-%d')
+    }
+
+def _parse_booking_stats(result: Any) -> Optional[Dict[str, Any]]:
+    """Shape a booking-stats response"""
+    if not result:
+        return None
+    return {
+        'total_bookings': result.get('total_bookings', 0),
+        'confirmed_bookings': result.get('confirmed_bookings', 0),
+        'pending_bookings': result.get('pending_bookings', 0),
+        'cancelled_bookings': result.get('cancelled_bookings', 0),
+        'conversion_rate': result.get('conversion_rate', 0),
+        'average_booking_value': result.get('average_booking_value', 0)
+    }
+
+def _parse_revenue_data(result: Any) -> Optional[Dict[str, Any]]:
+    """Shape a revenue-stats response"""
+    if not result:
+        return None
+    return {
+        'total_revenue': result.get('total_revenue', 0),
+        'revenue_by_day': result.get('revenue_by_day', []),
+        'revenue_by_vehicle': result.get('revenue_by_vehicle', {}),
+        'avg_booking_value': result.get('avg_booking_value', 0),
+        'top_routes': result.get('top_routes', [])
+    }
+
+def _parse_vehicle_stats(result: Any) -> Optional[List[VehicleStats]]:
+    """Shape a vehicles response"""
+    if not result or not isinstance(result, list):
+        return None
+    return [VehicleStats.from_payload(vehicle) for vehicle in result]
+
+def _parse_quote_stats(result: Any) -> Optional[Dict[str, Any]]:
+    """Shape a quote-stats response"""
+    if not result:
+        return None
+    return {
+        'total_quotes': result.get('total_quotes', 0),
+        'quotes_converted': result.get('quotes_converted', 0),
+        'conversion_rate': result.get('conversion_rate', 0),
+        'average_quote_value': result.get('average_quote_value', 0),
+        'quotes_by_day': result.get('quotes_by_day', [])
+    }
+
+def _parse_customer_stats(result: Any) -> Optional[Dict[str, Any]]:
+    """Shape a customer-stats response"""
+    if not result:
+        return None
+    return {
+        'total_customers': result.get('total_customers', 0),
+        'new_customers': result.get('new_customers', 0),
+        'repeat_customers': result.get('repeat_customers', 0),
+        'customer_retention_rate': result.get('retention_rate', 0),
+        'average_customer_value': result.get('average_customer_value', 0)
+    }
+
+def _parse_route_performance(result: Any) -> Optional[List[Dict[str, Any]]]:
+    """Shape a route-performance response"""
+    return list(result) if result and isinstance(result, list) else None
+
+def _parse_payment_stats(result: Any) -> Optional[Dict[str, Any]]:
+    """Shape a payment-stats response"""
+    if not result:
+        return None
+    return {
+        'payment_methods': result.get('payment_methods', {}),
+        'success_rate': result.get('success_rate', 0),
+        'failed_payments': result.get('failed_payments', 0),
+        'average_transaction': result.get('average_transaction', 0)
+    }
+
 class MarketingAPIClient:
     """Client for accessing the centralized API server"""
     
@@ -20,47 +139,119 @@ class MarketingAPIClient:
         """Initialize the API client"""
         self.base_url = settings.api_base_url
         self.session = requests.Session()
-        self.timeout = 30  # 30 seconds timeout
+        self.timeout = (settings.api_connect_timeout, settings.api_read_timeout)
+        self.max_retries = settings.api_max_retries
+        self.backoff_factor = settings.api_backoff_factor
+        
+        # Pool connections; retries are made in _make_request so that every
+        # attempt goes through the rate limiter
+        adapter = HTTPAdapter(
+            pool_connections=settings.api_pool_size,
+            pool_maxsize=settings.api_pool_size,
+            max_retries=0
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
         
         # Set up session headers
-        self.session.headers.update({
-            'Content-Type': 'application/json',
-            'Accept': 'application/json',
-            'User-Agent': 'Marketing-Dashboard/1.0'
-        })
+        self.session.headers.update(API_HEADERS)
+        
+        # Parsed GET responses, revalidated with conditional requests
+        self.cache: Optional[ResponseCache] = response_cache if settings.api_cache_enabled else None
+        
+        # Per-group token buckets shared with the async client
+        self.limiter: Optional[RateLimiter] = rate_limiter if settings.api_rate_limit_enabled else None
+    
+    def _admit(self, endpoint: str) -> bool:
+        """Wait for the rate limiter to let a request to an endpoint through"""
+        if self.limiter is None or self.limiter.acquire(endpoint):
+            return True
+        logger.warning(f"API request rejected by rate limiter: {endpoint}")
+        return False
+    
+    def _record(self, endpoint: str, response: Optional[requests.Response]) -> None:
+        """Report a response, or a transport error, to the rate limiter"""
+        if self.limiter is not None:
+            self.limiter.record(endpoint, response.status_code if response is not None else None,
+                                response.headers.get('Retry-After') if response is not None else None)
     
     def _make_request(self, method: str, endpoint: str, 
                      params: Optional[Dict[str, Any]] = None,
                      data: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
-        """Make an API request with error handling"""
-        try:
-            url = f"{self.base_url}/{endpoint}"
-            
-            response = self.session.request(
-                method=method,
-                url=url,
-                params=params,
-                json=data,
-                timeout=self.timeout
-            )
-            
-            response.raise_for_status()
-            
-            # Return JSON response
-            return response.json()
+        """
+        Make an API request with error handling
+        
+        GET responses are cached: fresh entries are served without a request,
+        stale ones are revalidated with If-None-Match/If-Modified-Since and
+        reused when the server answers 304. Cached payloads are shared, so
+        callers must not modify them.
+        
+        Every attempt waits for the endpoint group's rate limiter, at the
+        priority set with ``background_requests``. Idempotent requests are
+        retried on connection errors and on 429/5xx with jittered backoff;
+        POST, PUT and DELETE fail straight away rather than risk being
+        applied twice.
+        """
+        url = f"{self.base_url}/{endpoint}"
+        retries = self.max_retries if method.upper() in IDEMPOTENT_METHODS else 0
+        
+        cache_key, entry, headers = None, None, None
+        if self.cache is not None and method.upper() == 'GET':
+            cache_key = self.cache.key(url, params)
+            entry = self.cache.get(cache_key)
+            if entry is not None:
+                if entry.fresh:
+                    return self.cache.hit(entry)
+                headers = entry.validators()
+        
+        for attempt in range(retries + 1):
+            if not self._admit(endpoint):
+                return None
             
-        except requests.exceptions.Timeout:
-            logger.error(f"API request timed out: {endpoint}")
-            return None
-        except requests.exceptions.ConnectionError:
-            logger.error(f"API connection error: {endpoint}")
-            return None
-        except requests.exceptions.HTTPError as e:
-            logger.error(f"API HTTP error: {e}")
-            return None
-        except Exception as e:
-            logger.error(f"API request failed: {e}")
-            return None
+            try:
+                response = self.session.request(
+                    method=method,
+                    url=url,
+                    params=params,
+                    json=data,
+                    headers=headers,
+                    timeout=self.timeout
+                )
+                self._record(endpoint, response)
+                
+                if response.status_code == 304 and entry is not None:
+                    return self.cache.not_modified(cache_key, entry, response.headers)
+                
+                if response.status_code in RETRY_STATUSES and attempt < retries:
+                    time.sleep(_retry_delay(attempt, self.backoff_factor, response.headers.get('Retry-After')))
+                    continue
+                
+                response.raise_for_status()
+                
+                # Return JSON response
+                result = decode_json(response.content)
+                if cache_key is not None:
+                    self.cache.store(cache_key, result, response.headers, len(response.content),
+                                     ttl=ENDPOINT_CACHE_TTLS.get(endpoint))
+                return result
+                
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                self._record(endpoint, None)
+                if attempt < retries:
+                    time.sleep(_retry_delay(attempt, self.backoff_factor))
+                    continue
+                if isinstance(e, requests.exceptions.Timeout):
+                    logger.error(f"API request timed out: {endpoint}")
+                else:
+                    logger.error(f"API connection error: {endpoint}")
+                return None
+            except requests.exceptions.HTTPError as e:
+                logger.error(f"API HTTP error: {e}")
+                return None
+            except Exception as e:
+                logger.error(f"API request failed: {e}")
+                return None
+        return None
     
     def get_booking_stats(self, start_date: str, end_date: str) -> Optional[Dict[str, Any]]:
         """Get booking statistics for a date range"""
@@ -71,18 +262,7 @@ class MarketingAPIClient:
             }
             
             result = self._make_request('GET', 'system/booking-stats', params=params)
-            
-            if result:
-                # Process and return booking stats
-                return {
-                    'total_bookings': result.get('total_bookings', 0),
-                    'confirmed_bookings': result.get('confirmed_bookings', 0),
-                    'pending_bookings': result.get('pending_bookings', 0),
-                    'cancelled_bookings': result.get('cancelled_bookings', 0),
-                    'conversion_rate': result.get('conversion_rate', 0),
-                    'average_booking_value': result.get('average_booking_value', 0)
-                }
-            return None
+            return _parse_booking_stats(result)
             
         except Exception as e:
             logger.error(f"Error getting booking stats: {e}")
@@ -94,66 +274,29 @@ class MarketingAPIClient:
             params = {'period': period}
             
             result = self._make_request('GET', 'system/revenue-stats', params=params)
-            
-            if result:
-                return {
-                    'total_revenue': result.get('total_revenue', 0),
-                    'revenue_by_day': result.get('revenue_by_day', []),
-                    'revenue_by_vehicle': result.get('revenue_by_vehicle', {}),
-                    'avg_booking_value': result.get('avg_booking_value', 0),
-                    'top_routes': result.get('top_routes', [])
-                }
-            return None
+            return _parse_revenue_data(result)
             
         except Exception as e:
             logger.error(f"Error getting revenue data: {e}")
             return None
     
-    def get_vehicle_stats(self) -> Optional[List[Dict[str, Any]]]:
+    def get_vehicle_stats(self) -> Optional[List[VehicleStats]]:
         """Get vehicle performance statistics"""
         try:
             result = self._make_request('GET', 'vehicles')
-            
-            if result and isinstance(result, list):
-                # Process vehicle data
-                vehicle_stats = []
-                for vehicle in result:
-                    vehicle_stats.append({
-                        'vehicle_type': vehicle.get('name', 'Unknown'),
-                        'capacity': vehicle.get('capacity', 0),
-                        'price_per_km': vehicle.get('price_per_km', 0),
-                        'bookings_count': vehicle.get('bookings_count', 0),
-                        'revenue': vehicle.get('total_revenue', 0)
-                    })
-                return vehicle_stats
-            return None
+            return _parse_vehicle_stats(result)
             
         except Exception as e:
             logger.error(f"Error getting vehicle stats: {e}")
             return None
     
-    def get_quote_stats(self, days_back: int = 30) -> Optional[Dict[str, Any]]:
-        """Get quote generation statistics"""
+    def get_quote_stats(self, days_back: int = 30, start_date: Optional[str] = None,
+                        end_date: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Get quote generation statistics for the last ``days_back`` days or a date range"""
         try:
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=days_back)
-            
-            params = {
-                'start_date': start_date.strftime('%Y-%m-%d'),
-                'end_date': end_date.strftime('%Y-%m-%d')
-            }
-            
+            params = _date_range_params(days_back, start_date, end_date)
             result = self._make_request('GET', 'quotes/stats', params=params)
-            
-            if result:
-                return {
-                    'total_quotes': result.get('total_quotes', 0),
-                    'quotes_converted': result.get('quotes_converted', 0),
-                    'conversion_rate': result.get('conversion_rate', 0),
-                    'average_quote_value': result.get('average_quote_value', 0),
-                    'quotes_by_day': result.get('quotes_by_day', [])
-                }
-            return None
+            return _parse_quote_stats(result)
             
         except Exception as e:
             logger.error(f"Error getting quote stats: {e}")
@@ -163,16 +306,7 @@ class MarketingAPIClient:
         """Get customer statistics"""
         try:
             result = self._make_request('GET', 'system/customer-stats')
-            
-            if result:
-                return {
-                    'total_customers': result.get('total_customers', 0),
-                    'new_customers': result.get('new_customers', 0),
-                    'repeat_customers': result.get('repeat_customers', 0),
-                    'customer_retention_rate': result.get('retention_rate', 0),
-                    'average_customer_value': result.get('average_customer_value', 0)
-                }
-            return None
+            return _parse_customer_stats(result)
             
         except Exception as e:
             logger.error(f"Error getting customer stats: {e}")
@@ -184,10 +318,7 @@ class MarketingAPIClient:
             params = {'limit': limit}
             
             result = self._make_request('GET', 'system/route-performance', params=params)
-            
-            if result and isinstance(result, list):
-                return result
-            return None
+            return _parse_route_performance(result)
             
         except Exception as e:
             logger.error(f"Error getting route performance: {e}")
@@ -196,29 +327,60 @@ class MarketingAPIClient:
     def get_payment_stats(self, days_back: int = 30) -> Optional[Dict[str, Any]]:
         """Get payment method statistics"""
         try:
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=days_back)
-            
-            params = {
-                'start_date': start_date.strftime('%Y-%m-%d'),
-                'end_date': end_date.strftime('%Y-%m-%d')
-            }
-            
+            params = _date_range_params(days_back)
             result = self._make_request('GET', 'payments/stats', params=params)
-            
-            if result:
-                return {
-                    'payment_methods': result.get('payment_methods', {}),
-                    'success_rate': result.get('success_rate', 0),
-                    'failed_payments': result.get('failed_payments', 0),
-                    'average_transaction': result.get('average_transaction', 0)
-                }
-            return None
+            return _parse_payment_stats(result)
             
         except Exception as e:
             logger.error(f"Error getting payment stats: {e}")
             return None
     
+    def fetch_many(self, calls: Dict[str, Callable[[], Any]],
+                   max_workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Run independent endpoint calls concurrently
+        
+        Args:
+            calls (dict): Name -> zero-argument callable, e.g.
+                ``{'bookings': lambda: client.get_booking_stats(start, end)}``
+            max_workers (int, optional): Concurrent requests (default ``settings.api_max_workers``)
+        
+        Returns:
+            dict: Name -> result, None for calls that failed
+        """
+        if not calls:
+            return {}
+        
+        def run(name: str, call: Callable[[], Any]) -> Any:
+            try:
+                return call()
+            except Exception as e:
+                logger.error(f"API call {name} failed: {e}")
+                return None
+        
+        start = time.perf_counter()
+        workers = min(max_workers or settings.api_max_workers, len(calls))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # Copy the caller's context so workers keep its request priority
+            futures = {name: executor.submit(contextvars.copy_context().run, run, name, call)
+                       for name, call in calls.items()}
+            results = {name: future.result() for name, future in futures.items()}
+        
+        logger.info(f"Fetched {len(calls)} API endpoints in {time.perf_counter() - start:.2f}s")
+        return results
+    
+    def get_booking_overview(self, start_date: str, end_date: str, days_back: int = 30,
+                             period: str = "30d", route_limit: int = 10) -> Dict[str, Any]:
+        """Get everything the booking overview shows, with the endpoints called concurrently"""
+        return self.fetch_many({
+            'booking_stats': lambda: self.get_booking_stats(start_date, end_date),
+            'revenue': lambda: self.get_revenue_data(period),
+            'quote_stats': lambda: self.get_quote_stats(days_back),
+            'customer_stats': lambda: self.get_customer_stats(),
+            'payment_stats': lambda: self.get_payment_stats(days_back),
+            'route_performance': lambda: self.get_route_performance(route_limit)
+        })
+    
     def test_connection(self) -> bool:
         """Test API connection"""
         try:
@@ -253,15 +415,16 @@ def revenue_timeline_to_dataframe(revenue_data: Dict[str, Any]) -> pd.DataFrame:
     if not revenue_data or 'revenue_by_day' not in revenue_data:
         return pd.DataFrame()
     
-    timeline_data = revenue_data['revenue_by_day']
-    if not timeline_data:
+    # Built column by column, with the date column parsed to datetimes
+    return records_to_frame(revenue_data['revenue_by_day'], date_columns=('date',))
+
+def quote_timeline_to_dataframe(quote_stats: Dict[str, Any]) -> pd.DataFrame:
+    """Convert quote timeline data to DataFrame"""
+    if not quote_stats or 'quotes_by_day' not in quote_stats:
         return pd.DataFrame()
     
-    # Convert to DataFrame
-    df = pd.DataFrame(timeline_data)
-    
-    # Ensure date column is datetime
-    if 'date' in df.columns:
-        df['date'] = pd.to_datetime(df['date'])
-    
-    return df
\ No newline at end of file
+    return records_to_frame(quote_stats['quotes_by_day'], date_columns=('date',))
+
+def vehicle_stats_to_dataframe(vehicle_stats: Optional[List[VehicleStats]]) -> pd.DataFrame:
+    """Convert vehicle statistics to DataFrame"""
+    return slotted_to_frame(vehicle_stats)
\ No newline at end of file
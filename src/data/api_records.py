@@ -0,0 +1,115 @@
+"""
+Decoding and typed records for booking API payloads.
+
+Responses are decoded with orjson when it is installed (the standard library
+parser otherwise). Small entity lists such as vehicles become slotted
+dataclasses; long timelines such as ``revenue_by_day`` go straight into typed
+column arrays, so building a DataFrame never constructs a dict per row.
+"""
+
+import json
+import logging
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+def decode_json(content: bytes) -> Any:
+    """Decode a JSON response body"""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+@dataclass
+class VehicleStats:
+    """Performance of one vehicle type"""
+    __slots__ = ('vehicle_type', 'capacity', 'price_per_km', 'bookings_count', 'revenue')
+    vehicle_type: str
+    capacity: int
+    price_per_km: float
+    bookings_count: int
+    revenue: float
+
+    @classmethod
+    def from_payload(cls, vehicle: Dict[str, Any]) -> 'VehicleStats':
+        """Build from a vehicles API item"""
+        return cls(
+            vehicle.get('name', 'Unknown'),
+            vehicle.get('capacity', 0),
+            vehicle.get('price_per_km', 0),
+            vehicle.get('bookings_count', 0),
+            vehicle.get('total_revenue', 0)
+        )
+
+
+def _column(values: List[Any]) -> Any:
+    """Convert one column of values to an array when they are numeric"""
+    sample = next((value for value in values if value is not None), None)
+    if isinstance(sample, bool) or not isinstance(sample, (int, float)):
+        return values
+    array = np.array(values)
+    if array.dtype == object:
+        # Missing numbers become NaN
+        try:
+            array = np.array(values, dtype=np.float64)
+        except (TypeError, ValueError):
+            return values
+    return array
+
+
+def _date_column(values: List[Any]) -> Any:
+    """Convert one column of ISO dates to datetimes"""
+    try:
+        return np.array(values, dtype='datetime64[D]')
+    except (TypeError, ValueError):
+        # Timestamps with a time of day or an offset
+        return pd.to_datetime(pd.Series(values), errors='coerce').values
+
+
+def records_to_columns(records: Sequence[Dict[str, Any]],
+                       date_columns: Iterable[str] = ('date',)) -> Dict[str, Any]:
+    """
+    Transpose JSON records into typed columns
+
+    Args:
+        records (list): Records as decoded from JSON
+        date_columns (list): Columns holding ISO dates
+
+    Returns:
+        dict: Column name -> array (numbers, dates) or list (anything else)
+    """
+    names = list(dict.fromkeys(key for record in records for key in record))
+    date_columns = set(date_columns)
+    columns = {}
+    for name in names:
+        values = [record.get(name) for record in records]
+        columns[name] = _date_column(values) if name in date_columns else _column(values)
+    return columns
+
+
+def records_to_frame(records: Optional[Sequence[Dict[str, Any]]],
+                     date_columns: Iterable[str] = ('date',)) -> pd.DataFrame:
+    """Build a DataFrame from JSON records column by column"""
+    if not records:
+        return pd.DataFrame()
+    return pd.DataFrame(records_to_columns(records, date_columns))
+
+
+def slotted_to_frame(items: Optional[Sequence[Any]]) -> pd.DataFrame:
+    """Build a DataFrame from slotted dataclass records column by column"""
+    if not items:
+        return pd.DataFrame()
+    return pd.DataFrame({
+        field.name: _column([getattr(item, field.name) for item in items])
+        for field in fields(items[0])
+    })
@@ -0,0 +1,302 @@
+"""
+Asyncio client for the centralized booking system API.
+
+``AsyncMarketingAPIClient`` mirrors ``MarketingAPIClient`` on top of a single
+``httpx.AsyncClient``, so many endpoint calls can be awaited together without
+a thread per request. Connections are shared up to ``api_pool_size``, each
+host is capped at ``api_per_host_limit`` requests in flight, and idempotent
+requests are retried with the same jittered backoff as the sync client.
+Every attempt also waits for the rate limiter shared with the sync client.
+
+Streamlit scripts are synchronous, so ``run_api_calls`` bridges into one
+long-lived event loop that owns a shared client.
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+from urllib.parse import urlparse
+import httpx
+
+from .api_client import (
+    API_HEADERS, ENDPOINT_CACHE_TTLS, IDEMPOTENT_METHODS, RETRY_STATUSES, _date_range_params,
+    _retry_delay,
+    _parse_booking_stats, _parse_customer_stats, _parse_payment_stats,
+    _parse_quote_stats, _parse_revenue_data, _parse_route_performance,
+    _parse_vehicle_stats
+)
+from .api_records import VehicleStats, decode_json
+from .http_cache import ResponseCache, response_cache
+from .rate_limit import RateLimiter, rate_limiter, request_priority
+from ..config.settings import settings
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+class AsyncMarketingAPIClient:
+    """Asyncio client for accessing the centralized API server"""
+
+    def __init__(self):
+        """Initialize the API client"""
+        self.base_url = settings.api_base_url
+        self.max_retries = settings.api_max_retries
+        self.backoff_factor = settings.api_backoff_factor
+        self.client = httpx.AsyncClient(
+            headers=API_HEADERS,
+            timeout=httpx.Timeout(settings.api_read_timeout, connect=settings.api_connect_timeout),
+            limits=httpx.Limits(max_connections=settings.api_pool_size,
+                                max_keepalive_connections=settings.api_pool_size)
+        )
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self.cache: Optional[ResponseCache] = response_cache if settings.api_cache_enabled else None
+        self.limiter: Optional[RateLimiter] = rate_limiter if settings.api_rate_limit_enabled else None
+
+    async def __aenter__(self) -> 'AsyncMarketingAPIClient':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the pooled connections"""
+        await self.client.aclose()
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        """Get the semaphore capping requests in flight to a URL's host"""
+        host = urlparse(url).netloc
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(settings.api_per_host_limit)
+        return self._host_limits[host]
+
+    def _backoff(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        """Seconds to wait before a retry: Retry-After if given, else jittered exponential backoff"""
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        return _retry_delay(attempt, self.backoff_factor, retry_after)
+
+    async def _admit(self, endpoint: str) -> bool:
+        """Wait for the rate limiter to let a request to an endpoint through"""
+        if self.limiter is None or await self.limiter.acquire_async(endpoint):
+            return True
+        logger.warning(f"API request rejected by rate limiter: {endpoint}")
+        return False
+
+    def _record(self, endpoint: str, response: Optional[httpx.Response]) -> None:
+        """Report a response, or a transport error, to the rate limiter"""
+        if self.limiter is not None:
+            self.limiter.record(endpoint, response.status_code if response is not None else None,
+                                response.headers.get('Retry-After') if response is not None else None)
+
+    async def _make_request(self, method: str, endpoint: str,
+                            params: Optional[Dict[str, Any]] = None,
+                            data: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Make an API request with error handling, caching GETs like the sync client"""
+        url = f"{self.base_url}/{endpoint}"
+        retries = self.max_retries if method.upper() in IDEMPOTENT_METHODS else 0
+
+        cache_key, entry, headers = None, None, None
+        if self.cache is not None and method.upper() == 'GET':
+            cache_key = self.cache.key(url, params)
+            entry = self.cache.get(cache_key)
+            if entry is not None:
+                if entry.fresh:
+                    return self.cache.hit(entry)
+                headers = entry.validators()
+
+        for attempt in range(retries + 1):
+            if not await self._admit(endpoint):
+                return None
+
+            response = None
+            try:
+                async with self._host_limit(url):
+                    response = await self.client.request(method, url, params=params, json=data,
+                                                         headers=headers)
+                self._record(endpoint, response)
+                if response.status_code == 304 and entry is not None:
+                    return self.cache.not_modified(cache_key, entry, response.headers)
+                if response.status_code in RETRY_STATUSES and attempt < retries:
+                    await asyncio.sleep(self._backoff(attempt, response))
+                    continue
+                response.raise_for_status()
+                result = decode_json(response.content)
+                if cache_key is not None:
+                    self.cache.store(cache_key, result, response.headers, len(response.content),
+                                     ttl=ENDPOINT_CACHE_TTLS.get(endpoint))
+                return result
+
+            except (httpx.TimeoutException, httpx.TransportError) as e:
+                self._record(endpoint, None)
+                if attempt < retries:
+                    await asyncio.sleep(self._backoff(attempt))
+                    continue
+                kind = 'timed out' if isinstance(e, httpx.TimeoutException) else 'connection error'
+                logger.error(f"API request {kind}: {endpoint}")
+                return None
+            except httpx.HTTPStatusError as e:
+                logger.error(f"API HTTP error: {e}")
+                return None
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"API request failed: {e}")
+                return None
+        return None
+
+    async def get_booking_stats(self, start_date: str, end_date: str) -> Optional[Dict[str, Any]]:
+        """Get booking statistics for a date range"""
+        params = {'start_date': start_date, 'end_date': end_date}
+        return _parse_booking_stats(await self._make_request('GET', 'system/booking-stats', params=params))
+
+    async def get_revenue_data(self, period: str = "30d") -> Optional[Dict[str, Any]]:
+        """Get revenue statistics for a period"""
+        params = {'period': period}
+        return _parse_revenue_data(await self._make_request('GET', 'system/revenue-stats', params=params))
+
+    async def get_vehicle_stats(self) -> Optional[List[VehicleStats]]:
+        """Get vehicle performance statistics"""
+        return _parse_vehicle_stats(await self._make_request('GET', 'vehicles'))
+
+    async def get_quote_stats(self, days_back: int = 30, start_date: Optional[str] = None,
+                              end_date: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Get quote generation statistics for the last ``days_back`` days or a date range"""
+        params = _date_range_params(days_back, start_date, end_date)
+        return _parse_quote_stats(await self._make_request('GET', 'quotes/stats', params=params))
+
+    async def get_customer_stats(self) -> Optional[Dict[str, Any]]:
+        """Get customer statistics"""
+        return _parse_customer_stats(await self._make_request('GET', 'system/customer-stats'))
+
+    async def get_route_performance(self, limit: int = 10) -> Optional[List[Dict[str, Any]]]:
+        """Get top performing routes"""
+        params = {'limit': limit}
+        return _parse_route_performance(
+            await self._make_request('GET', 'system/route-performance', params=params)
+        )
+
+    async def get_payment_stats(self, days_back: int = 30) -> Optional[Dict[str, Any]]:
+        """Get payment method statistics"""
+        params = _date_range_params(days_back)
+        return _parse_payment_stats(await self._make_request('GET', 'payments/stats', params=params))
+
+    async def fetch_many(self, calls: Dict[str, Awaitable[Any]],
+                         timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Await independent endpoint calls concurrently
+
+        Calls still running when the timeout expires are cancelled, which
+        closes their requests, and report None like failed calls.
+
+        Args:
+            calls (dict): Name -> awaitable, e.g. ``{'bookings': client.get_booking_stats(start, end)}``
+            timeout (float, optional): Seconds for the whole batch (default ``settings.api_gather_timeout``)
+
+        Returns:
+            dict: Name -> result, None for calls that failed or were cancelled
+        """
+        if not calls:
+            return {}
+
+        start = time.perf_counter()
+        tasks = {name: asyncio.ensure_future(call) for name, call in calls.items()}
+        done, pending = await asyncio.wait(tasks.values(), timeout=timeout or settings.api_gather_timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        results = {}
+        for name, task in tasks.items():
+            if task in pending:
+                logger.error(f"API call {name} cancelled after timeout")
+                results[name] = None
+            elif task.exception() is not None:
+                logger.error(f"API call {name} failed: {task.exception()}")
+                results[name] = None
+            else:
+                results[name] = task.result()
+
+        logger.info(f"Fetched {len(calls)} API endpoints in {time.perf_counter() - start:.2f}s")
+        return results
+
+    async def get_booking_overview(self, start_date: str, end_date: str, days_back: int = 30,
+                                   period: str = "30d", route_limit: int = 10) -> Dict[str, Any]:
+        """Get everything the booking overview shows, with the endpoints awaited together"""
+        return await self.fetch_many({
+            'booking_stats': self.get_booking_stats(start_date, end_date),
+            'revenue': self.get_revenue_data(period),
+            'quote_stats': self.get_quote_stats(days_back),
+            'customer_stats': self.get_customer_stats(),
+            'payment_stats': self.get_payment_stats(days_back),
+            'route_performance': self.get_route_performance(route_limit)
+        })
+
+    async def test_connection(self) -> bool:
+        """Test API connection"""
+        result = await self._make_request('GET', 'system/health')
+        return result is not None and result.get('status') == 'ok'
+
+
+# Event loop and client shared by synchronous callers
+_bridge_loop: Optional[asyncio.AbstractEventLoop] = None
+_bridge_client: Optional[AsyncMarketingAPIClient] = None
+_bridge_lock = threading.Lock()
+
+
+def _get_bridge():
+    """Start the shared event loop and client if needed"""
+    global _bridge_loop, _bridge_client
+    with _bridge_lock:
+        if _bridge_loop is None:
+            _bridge_loop = asyncio.new_event_loop()
+            threading.Thread(target=_bridge_loop.run_forever, name='api-client-loop', daemon=True).start()
+
+            async def create_client() -> AsyncMarketingAPIClient:
+                return AsyncMarketingAPIClient()
+
+            _bridge_client = asyncio.run_coroutine_threadsafe(create_client(), _bridge_loop).result()
+        return _bridge_loop, _bridge_client
+
+
+def run_api_calls(make_calls: Callable[[AsyncMarketingAPIClient], Awaitable[T]],
+                  timeout: Optional[float] = None) -> T:
+    """
+    Run API calls on the shared event loop from synchronous code
+
+    Args:
+        make_calls (callable): Takes the shared client and returns the awaitable to run,
+            e.g. ``lambda client: client.get_booking_overview(start, end)``
+        timeout (float, optional): Seconds to wait; the calls are cancelled if it
+            expires. Defaults to a little longer than a gathered batch may take,
+            so ``fetch_many`` returns its partial results first
+
+    Returns:
+        The awaitable's result
+    """
+    loop, client = _get_bridge()
+    # The loop's tasks don't inherit this thread's context
+    priority = request_priority.get()
+
+    async def run() -> T:
+        request_priority.set(priority)
+        return await make_calls(client)
+
+    future = asyncio.run_coroutine_threadsafe(run(), loop)
+    try:
+        return future.result(timeout or settings.api_gather_timeout + settings.api_connect_timeout)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise
+
+
+def get_booking_overview_sync(start_date: str, end_date: str, days_back: int = 30,
+                              period: str = "30d", route_limit: int = 10) -> Dict[str, Any]:
+    """Get the booking overview from synchronous code, all endpoints in one event-loop turn"""
+    return run_api_calls(lambda client: client.get_booking_overview(
+        start_date, end_date, days_back=days_back, period=period, route_limit=route_limit
+    ))
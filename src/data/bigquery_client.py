@@ -5,8 +5,9 @@ BigQuery client for accessing marketing analytics data.
 import os
 import json
 import logging
+import threading
 import pandas as pd
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, Iterator, List, Any, Optional, Union
 from google.cloud import bigquery
 from google.oauth2 import service_account
 from google.api_core.exceptions import GoogleAPIError
@@ -16,6 +17,17 @@ from ..config.settings import settings
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Queries issued by the current thread (one Streamlit script run per thread)
+_query_counter = threading.local()
+
+def reset_query_count() -> None:
+    """Reset the number of queries issued by the current thread"""
+    _query_counter.count = 0
+
+def get_query_count() -> int:
+    """Get the number of queries issued by the current thread since the last reset"""
+    return getattr(_query_counter, 'count', 0)
+
 class MarketingBigQueryClient:
     """BigQuery client for marketing analytics"""
 
@@ -124,12 +136,28 @@ class MarketingBigQueryClient:
                 return pd.DataFrame()
                 
             logger.info(f"Executing query: {query[:100]}...")
+            _query_counter.count = get_query_count() + 1
             query_job = self.client.query(query)
             return query_job.to_dataframe()
         except Exception as e:
             logger.error(f"Error executing query: {e}")
             return pd.DataFrame()
 
+    def query_to_batches(self, query: str, chunk_rows: int = 50000) -> Iterator[pd.DataFrame]:
+        """
+        Execute a query and yield the results as DataFrame chunks
+
+        Only one page of results is held at a time. Errors are raised rather
+        than swallowed, so a failed export is not mistaken for a short one.
+        """
+        if not self.client:
+            raise RuntimeError("BigQuery client not initialized. Cannot execute query.")
+
+        logger.info(f"Streaming query: {query[:100]}...")
+        _query_counter.count = get_query_count() + 1
+        rows = self.client.query(query).result(page_size=chunk_rows)
+        yield from rows.to_dataframe_iterable()
+
     def check_dataset_exists(self) -> bool:
         """Check if the dataset exists and is accessible"""
         try:
@@ -196,6 +224,19 @@ class MarketingBigQueryClient:
             logger.error(f"Error checking table existence: {e}")
             return False
 
+    def get_table_modified(self, table_name: str, dataset_id: Optional[str] = None) -> Optional[Any]:
+        """Get a table's last modification time from its metadata (no query)"""
+        try:
+            if not self.client:
+                logger.error("BigQuery client not initialized")
+                return None
+                
+            table_id = f"{self.project_id}.{dataset_id or self.dataset_id}.{table_name}"
+            return self.client.get_table(table_id).modified
+        except Exception as e:
+            logger.error(f"Error getting modification time of {table_name}: {e}")
+            return None
+
     def get_table_schema(self, table_name: str) -> List[Dict[str, str]]:
         """Get the schema of a table"""
         try:
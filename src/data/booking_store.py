@@ -0,0 +1,252 @@
+"""
+Append-only local store for booking-side daily metrics.
+
+Each series (revenue, quotes) is a DataFrame with one row per completed day,
+held on a sorted ``DatetimeIndex``. An update asks the booking API only for
+the days after the series' watermark and appends them; today is left out
+until it is complete, so stored days never change. Date-range reads and
+joins with Search Console daily aggregates are lookups on that index rather
+than re-fetches and merges of the full history. When a store directory is
+configured, every append is also written as a Parquet part file and the
+parts are read back on start.
+"""
+
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import pandas as pd
+
+from .api_records import records_to_frame
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Part files per series before they are merged into one
+MAX_PARTS = 32
+
+
+@dataclass
+class BookingSeries:
+    """A daily series and how to fetch a date range of it"""
+    name: str
+    fetch: Callable[[Any, date, date], Optional[List[Dict[str, Any]]]]
+
+
+def _fetch_revenue(client, start: date, end: date) -> Optional[List[Dict[str, Any]]]:
+    """Daily revenue (and bookings) from the revenue-stats endpoint"""
+    # The endpoint takes a period counted back from today
+    days = (date.today() - start).days + 1
+    revenue = client.get_revenue_data(period=f"{days}d")
+    return revenue['revenue_by_day'] if revenue else None
+
+
+def _fetch_quotes(client, start: date, end: date) -> Optional[List[Dict[str, Any]]]:
+    """Daily quotes from the quote-stats endpoint"""
+    quotes = client.get_quote_stats(start_date=start.isoformat(), end_date=end.isoformat())
+    return quotes['quotes_by_day'] if quotes else None
+
+
+BOOKING_SERIES = {
+    'revenue': BookingSeries('revenue', _fetch_revenue),
+    'quotes': BookingSeries('quotes', _fetch_quotes)
+}
+
+
+class BookingTimeSeriesStore:
+    """Date-indexed booking metrics, extended by fetching only new days"""
+
+    def __init__(self, store_dir: Optional[str] = None, backfill_days: int = 365):
+        """
+        Initialize the store, loading any series saved in ``store_dir``
+
+        Args:
+            store_dir (str, optional): Directory for Parquet part files; memory only if unset
+            backfill_days (int): Days fetched the first time a series is updated
+        """
+        self.store_dir = store_dir
+        self.backfill_days = backfill_days
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._lock = threading.Lock()
+
+        if self.store_dir:
+            os.makedirs(self.store_dir, exist_ok=True)
+            for name in BOOKING_SERIES:
+                frame = self._read_parts(name)
+                if frame is not None:
+                    self._frames[name] = frame
+
+    def watermark(self, name: str) -> Optional[date]:
+        """Last stored day of a series"""
+        frame = self._frames.get(name)
+        if frame is None or frame.empty:
+            return None
+        return frame.index[-1].date()
+
+    def append(self, name: str, records: Optional[List[Dict[str, Any]]]) -> int:
+        """
+        Append the completed days after the watermark
+
+        Records for days already stored, or for today, are ignored.
+
+        Args:
+            name (str): Series name
+            records (list): Daily records with a ``date`` field
+
+        Returns:
+            int: Number of days appended
+        """
+        new = records_to_frame(records, date_columns=('date',))
+        if new.empty or 'date' not in new.columns:
+            return 0
+
+        new = new.set_index(pd.DatetimeIndex(new.pop('date')).normalize().rename('date'))
+        new = new[~new.index.duplicated(keep='last')].sort_index()
+
+        with self._lock:
+            watermark = self.watermark(name)
+            keep = new.index < pd.Timestamp(date.today())
+            if watermark is not None:
+                keep &= new.index > pd.Timestamp(watermark)
+            new = new[keep]
+            if new.empty:
+                return 0
+
+            current = self._frames.get(name)
+            self._frames[name] = new if current is None else pd.concat([current, new])
+        self._write_part(name, new)
+        logger.info(f"Appended {len(new)} days to booking series {name} "
+                    f"({new.index[0].date()} to {new.index[-1].date()})")
+        return len(new)
+
+    def update(self, client, names: Optional[Sequence[str]] = None) -> Dict[str, int]:
+        """
+        Fetch and append the days after each series' watermark
+
+        Args:
+            client: ``MarketingAPIClient`` (or anything with the same methods)
+            names (list, optional): Series to update; all by default
+
+        Returns:
+            dict: Series name -> days appended
+        """
+        end = date.today() - timedelta(days=1)
+        appended = {}
+        for name in names or BOOKING_SERIES:
+            watermark = self.watermark(name)
+            start = watermark + timedelta(days=1) if watermark else end - timedelta(days=self.backfill_days - 1)
+            if start > end:
+                appended[name] = 0
+                continue
+            try:
+                appended[name] = self.append(name, BOOKING_SERIES[name].fetch(client, start, end))
+            except Exception as e:
+                logger.error(f"Error updating booking series {name}: {e}")
+                appended[name] = 0
+        return appended
+
+    def frame(self, name: str, start_date: Optional[str] = None,
+              end_date: Optional[str] = None) -> pd.DataFrame:
+        """Get the stored days of a series in a date range"""
+        frame = self._frames.get(name)
+        if frame is None:
+            return pd.DataFrame()
+        return frame.loc[start_date:end_date]
+
+    def combined(self, names: Optional[Sequence[str]] = None, start_date: Optional[str] = None,
+                 end_date: Optional[str] = None) -> pd.DataFrame:
+        """
+        Get several series side by side on one date index
+
+        Columns that appear in more than one series are prefixed with the
+        series name.
+        """
+        frames = {name: self.frame(name, start_date, end_date)
+                  for name in names or BOOKING_SERIES if name in self._frames}
+        if not frames:
+            return pd.DataFrame()
+
+        seen: Dict[str, int] = {}
+        for frame in frames.values():
+            for column in frame.columns:
+                seen[column] = seen.get(column, 0) + 1
+        renamed = [frame.rename(columns={c: f"{name}_{c}" for c in frame.columns if seen[c] > 1})
+                   for name, frame in frames.items()]
+        return pd.concat(renamed, axis=1).sort_index()
+
+    def join_daily(self, daily: pd.DataFrame, date_col: str = 'date',
+                   names: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        Add booking metrics to a daily frame, matching rows by date
+
+        Args:
+            daily (pd.DataFrame): Daily aggregates, e.g. Search Console clicks per day
+            date_col (str): Date column of ``daily``
+            names (list, optional): Series to add; all by default
+
+        Returns:
+            pd.DataFrame: ``daily`` with the booking columns, NaN on days not stored
+        """
+        if daily.empty:
+            return daily
+        days = pd.to_datetime(daily[date_col]).dt.tz_localize(None).dt.normalize()
+        start, end = days.min(), days.max()
+        booking = self.combined(names, start, end)
+        if booking.empty:
+            return daily
+        booking = booking.rename(columns={c: f"{c}_booking" for c in booking.columns if c in daily.columns})
+        values = booking.reindex(days.values)
+        values.index = daily.index
+        return pd.concat([daily, values], axis=1)
+
+    def _series_dir(self, name: str) -> str:
+        return os.path.join(self.store_dir, name)
+
+    def _read_parts(self, name: str) -> Optional[pd.DataFrame]:
+        """Read a series' part files, merging them if there are many"""
+        directory = self._series_dir(name)
+        if not os.path.isdir(directory):
+            return None
+        parts = sorted(f for f in os.listdir(directory) if f.endswith('.parquet'))
+        if not parts:
+            return None
+        try:
+            frame = pd.concat([pd.read_parquet(os.path.join(directory, part)) for part in parts])
+            frame = frame[~frame.index.duplicated(keep='first')].sort_index()
+            if len(parts) > MAX_PARTS:
+                merged = self._write_part(name, frame)
+                # Only drop the parts once the merged file is in place
+                if merged is not None:
+                    for part in parts:
+                        if part != os.path.basename(merged):
+                            os.remove(os.path.join(directory, part))
+            logger.info(f"Loaded {len(frame)} days of booking series {name}")
+            return frame
+        except Exception as e:
+            logger.warning(f"Error reading booking series {name}: {e}")
+            return None
+
+    def _write_part(self, name: str, frame: pd.DataFrame) -> Optional[str]:
+        """
+        Write days as a part file named by their date range
+
+        Returns:
+            str: Path of the part file, or None if there is no store directory or the write failed
+        """
+        if not self.store_dir:
+            return None
+        directory = self._series_dir(name)
+        path = os.path.join(directory, f"{frame.index[0]:%Y%m%d}-{frame.index[-1]:%Y%m%d}.parquet")
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(directory, exist_ok=True)
+            frame.to_parquet(tmp_path)
+            os.replace(tmp_path, path)
+            return path
+        except Exception as e:
+            logger.warning(f"Error writing booking series {name}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return None
@@ -0,0 +1,294 @@
+"""
+Streaming data exports.
+
+Exports consume an iterable of DataFrame chunks (see ``query_to_batches``) and
+write each chunk straight to a binary target, so memory stays bounded by the
+chunk size whatever the row count. Supported formats are CSV, Parquet (zstd),
+Excel (xlsxwriter in constant-memory mode) and newline-delimited JSON.
+"""
+
+import logging
+import os
+import re
+import time
+import uuid
+from dataclasses import dataclass
+from typing import BinaryIO, Callable, Dict, Iterable, List, Optional
+import pandas as pd
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Rows per Excel worksheet, including the header row
+EXCEL_MAX_ROWS = 1048576
+
+# Parquet chunks held back while a column has no type yet
+PARQUET_SCHEMA_CHUNKS = 8
+
+
+@dataclass
+class ExportResult:
+    """Summary of a finished export"""
+    rows: int
+    bytes: int
+    seconds: float
+
+
+def _write_csv(chunks: Iterable[pd.DataFrame], target: BinaryIO) -> int:
+    """Write chunks as CSV with a single header row"""
+    rows = 0
+    for chunk in chunks:
+        target.write(chunk.to_csv(index=False, header=rows == 0).encode('utf-8'))
+        rows += len(chunk)
+    return rows
+
+
+def _write_ndjson(chunks: Iterable[pd.DataFrame], target: BinaryIO) -> int:
+    """Write chunks as newline-delimited JSON records"""
+    rows = 0
+    for chunk in chunks:
+        if chunk.empty:
+            continue
+        text = chunk.to_json(orient='records', lines=True, date_format='iso')
+        if not text.endswith('\n'):
+            text += '\n'
+        target.write(text.encode('utf-8'))
+        rows += len(chunk)
+    return rows
+
+
+def _null_fields(schema) -> List[str]:
+    """Names of the columns with no type yet (null in every row so far)"""
+    import pyarrow as pa
+    return [field.name for field in schema if pa.types.is_null(field.type)]
+
+
+def _nulls_as_strings(schema):
+    """Give the columns with no type a string type"""
+    import pyarrow as pa
+    for name in _null_fields(schema):
+        schema = schema.set(schema.get_field_index(name), pa.field(name, pa.large_string()))
+    return schema
+
+
+def _write_parquet(chunks: Iterable[pd.DataFrame], target: BinaryIO) -> int:
+    """
+    Write chunks as zstd-compressed Parquet, one row group per chunk
+
+    The file schema is fixed when the writer opens, so chunks are held back
+    while a column has been null in every row, up to PARQUET_SCHEMA_CHUNKS;
+    their schemas are unified with numeric types promoted, and columns still
+    null after that are written as strings. A result with no rows is written
+    as an empty table, so the file is always valid Parquet.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    rows = 0
+    writer = None
+    schema = None
+    pending = []
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            rows += len(chunk)
+            if writer is not None:
+                writer.write_table(table.cast(schema))
+                continue
+
+            schema = table.schema if schema is None else pa.unify_schemas(
+                [schema, table.schema], promote_options='permissive'
+            )
+            pending.append(table)
+            if _null_fields(schema) and len(pending) < PARQUET_SCHEMA_CHUNKS:
+                continue
+
+            schema = _nulls_as_strings(schema)
+            writer = pq.ParquetWriter(target, schema, compression='zstd')
+            for held in pending:
+                writer.write_table(held.cast(schema))
+            pending = []
+
+        if writer is None:
+            # Fewer chunks than the hold-back limit, or none at all
+            if schema is None:
+                table = pa.table({})
+            else:
+                schema = _nulls_as_strings(schema)
+                table = pa.concat_tables([held.cast(schema) for held in pending])
+            pq.write_table(table, target, compression='zstd')
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def _excel_cells(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Convert a chunk to values xlsxwriter can write"""
+    chunk = chunk.copy()
+    for column in chunk.columns:
+        if isinstance(chunk[column].dtype, pd.DatetimeTZDtype):
+            chunk[column] = chunk[column].dt.tz_localize(None)
+    chunk = chunk.astype(object)
+    return chunk.where(chunk.notna(), None)
+
+
+def _write_excel(chunks: Iterable[pd.DataFrame], target: BinaryIO) -> int:
+    """Write chunks as an Excel workbook, starting a new sheet when one is full"""
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(target, {
+        'constant_memory': True,
+        'default_date_format': 'yyyy-mm-dd',
+        'strings_to_urls': False
+    })
+    rows = 0
+    sheet = None
+    sheet_row = 0
+    header = None
+    try:
+        for chunk in chunks:
+            if header is None:
+                header = [str(column) for column in chunk.columns]
+            for values in _excel_cells(chunk).itertuples(index=False, name=None):
+                if sheet is None or sheet_row >= EXCEL_MAX_ROWS:
+                    sheet = workbook.add_worksheet(f"Data {len(workbook.worksheets()) + 1}")
+                    sheet.write_row(0, 0, header)
+                    sheet_row = 1
+                sheet.write_row(sheet_row, 0, values)
+                sheet_row += 1
+                rows += 1
+        if sheet is None:
+            sheet = workbook.add_worksheet("Data 1")
+            if header:
+                sheet.write_row(0, 0, header)
+    finally:
+        workbook.close()
+    return rows
+
+
+@dataclass
+class ExportFormat:
+    """An export file format"""
+    extension: str
+    mime: str
+    writer: Callable[[Iterable[pd.DataFrame], BinaryIO], int]
+
+
+EXPORT_FORMATS: Dict[str, ExportFormat] = {
+    'CSV': ExportFormat('csv', 'text/csv', _write_csv),
+    'Parquet': ExportFormat('parquet', 'application/vnd.apache.parquet', _write_parquet),
+    'Excel': ExportFormat(
+        'xlsx',
+        'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        _write_excel
+    ),
+    'JSON': ExportFormat('ndjson', 'application/x-ndjson', _write_ndjson)
+}
+
+# Names of finished export files written by new_export_path
+_EXPORT_FILE = re.compile(
+    r'^.+\.[0-9a-f]{32}\.(%s)$' % '|'.join(re.escape(fmt.extension) for fmt in EXPORT_FORMATS.values())
+)
+
+
+def write_export(chunks: Iterable[pd.DataFrame], export_format: str,
+                 target: BinaryIO) -> ExportResult:
+    """
+    Stream DataFrame chunks into a binary target
+
+    Args:
+        chunks (iterable): DataFrame chunks sharing one set of columns
+        export_format (str): Key of ``EXPORT_FORMATS``
+        target (file): Writable binary file object (seekable for Excel)
+
+    Returns:
+        ExportResult: Rows and bytes written
+    """
+    fmt = EXPORT_FORMATS[export_format]
+    start = time.perf_counter()
+    offset = target.tell() if target.seekable() else 0
+
+    rows = fmt.writer(chunks, target)
+
+    target.flush()
+    size = target.tell() - offset if target.seekable() else 0
+    seconds = time.perf_counter() - start
+    logger.info(f"Exported {rows:,} rows as {export_format} ({size:,} bytes, {seconds:.2f}s)")
+    return ExportResult(rows=rows, bytes=size, seconds=seconds)
+
+
+def export_to_file(chunks: Iterable[pd.DataFrame], export_format: str,
+                   path: str) -> ExportResult:
+    """
+    Stream DataFrame chunks into a file on disk
+
+    The file is written under a temporary name and moved into place once
+    complete, so a failed export never leaves a truncated file behind.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    # Unique per call, so concurrent exports to one path never share it
+    partial = f"{path}.{uuid.uuid4().hex}.partial"
+    try:
+        with open(partial, 'wb') as target:
+            result = write_export(chunks, export_format, target)
+        os.replace(partial, path)
+        return result
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+
+
+def cleanup_exports(directory: str, max_age_seconds: float) -> int:
+    """
+    Remove export files older than ``max_age_seconds``
+
+    Only finished files named by ``new_export_path`` are removed; other files
+    in the directory and exports still being written are left alone.
+
+    Args:
+        directory (str): Export directory
+        max_age_seconds (float): Age after which a file is removed
+
+    Returns:
+        int: Number of files removed
+    """
+    if not os.path.isdir(directory):
+        return 0
+    cutoff = time.time() - max_age_seconds
+    removed = 0
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        if not _EXPORT_FILE.match(name):
+            continue
+        try:
+            if os.path.isfile(path) and os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+        except OSError as e:
+            logger.warning(f"Error removing old export {path}: {e}")
+    if removed:
+        logger.info(f"Removed {removed} old export files from {directory}")
+    return removed
+
+
+def export_file_name(name: str, export_format: str, suffix: Optional[str] = None) -> str:
+    """Build the file name of an export"""
+    stem = f"{name}_{suffix}" if suffix else name
+    return f"{stem}.{EXPORT_FORMATS[export_format].extension}"
+
+
+def new_export_path(directory: str, name: str, export_format: str,
+                    suffix: Optional[str] = None) -> str:
+    """
+    Build a path for a new export file, unique to this export
+
+    The file name is ``export_file_name`` with a random run id before the
+    extension, so exports of the same range by different sessions never
+    replace each other.
+    """
+    stem, extension = os.path.splitext(export_file_name(name, export_format, suffix))
+    return os.path.join(directory, f"{stem}.{uuid.uuid4().hex}{extension}")
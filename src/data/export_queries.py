@@ -0,0 +1,79 @@
+"""
+BigQuery queries for full data exports, without row limits.
+"""
+
+from ..config.settings import settings
+
+class ExportQueries:
+    """Unbounded queries streamed out by the export pipeline"""
+
+    @staticmethod
+    def get_all_keywords(start_date: str, end_date: str) -> str:
+        """Get every keyword with its performance in the date range"""
+        return f"""
+        SELECT
+            query as keyword,
+            SUM(clicks) as total_clicks,
+            SUM(impressions) as total_impressions,
+            AVG(ctr) * 100 as avg_ctr_percentage,
+            AVG(position) as avg_position,
+            COUNT(DISTINCT DATE(date)) as days_visible
+        FROM `{settings.bigquery_project_id}.{settings.bigquery_dataset}.search_console_data`
+        WHERE DATE(date) BETWEEN '{start_date}' AND '{end_date}'
+            AND query IS NOT NULL
+            AND query != ''
+        GROUP BY query
+        ORDER BY total_clicks DESC
+        """
+
+    @staticmethod
+    def get_all_pages(start_date: str, end_date: str) -> str:
+        """Get every page with its performance in the date range"""
+        return f"""
+        SELECT
+            url,
+            SUM(clicks) as total_clicks,
+            SUM(impressions) as total_impressions,
+            AVG(ctr) * 100 as avg_ctr_percentage,
+            AVG(position) as avg_position
+        FROM `{settings.bigquery_project_id}.{settings.bigquery_dataset}.search_console_data`
+        WHERE DATE(date) BETWEEN '{start_date}' AND '{end_date}'
+            AND url IS NOT NULL
+        GROUP BY url
+        ORDER BY total_clicks DESC
+        """
+
+    @staticmethod
+    def get_search_console_rows(start_date: str, end_date: str) -> str:
+        """Get raw search console rows in the date range"""
+        return f"""
+        SELECT
+            DATE(date) as date,
+            query,
+            url,
+            device,
+            country,
+            clicks,
+            impressions,
+            ctr,
+            position
+        FROM `{settings.bigquery_project_id}.{settings.bigquery_dataset}.search_console_data`
+        WHERE DATE(date) BETWEEN '{start_date}' AND '{end_date}'
+        ORDER BY date
+        """
+
+    @staticmethod
+    def get_daily_performance(start_date: str, end_date: str) -> str:
+        """Get daily totals in the date range"""
+        return f"""
+        SELECT
+            DATE(date) as date,
+            SUM(clicks) as total_clicks,
+            SUM(impressions) as total_impressions,
+            SAFE_DIVIDE(SUM(clicks), SUM(impressions)) * 100 as ctr_percentage,
+            AVG(position) as avg_position
+        FROM `{settings.bigquery_project_id}.{settings.bigquery_dataset}.search_console_data`
+        WHERE DATE(date) BETWEEN '{start_date}' AND '{end_date}'
+        GROUP BY DATE(date)
+        ORDER BY date
+        """
@@ -0,0 +1,228 @@
+"""
+HTTP response cache for the booking API clients.
+
+Parsed JSON payloads of GET requests are kept in a process-wide LRU together
+with the ``ETag`` and ``Last-Modified`` validators the server sent. Within
+its TTL an entry is served without a request; after that it is revalidated
+with a conditional GET, and a 304 answer reuses the cached payload instead
+of downloading and parsing it again. When a cache directory is configured,
+entries are also written to disk so they survive restarts; the disk layer is
+bounded by size and entry count and evicts the least recently used files.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, replace
+from typing import Any, Dict, Mapping, Optional
+
+from ..config.settings import settings
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+MAX_AGE_PATTERN = re.compile(r'max-age=(\d+)')
+
+
+@dataclass
+class CachedResponse:
+    """A cached payload and the validators to revalidate it"""
+    payload: Any
+    etag: Optional[str]
+    last_modified: Optional[str]
+    size: int
+    expires_at: float
+
+    @property
+    def fresh(self) -> bool:
+        """Whether the entry can be served without asking the server"""
+        return time.time() < self.expires_at
+
+    def validators(self) -> Dict[str, str]:
+        """Headers for a conditional GET"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """Entry-bounded LRU of parsed responses with an optional disk layer"""
+
+    def __init__(self, max_entries: int, ttl: int, cache_dir: Optional[str] = None,
+                 max_disk_bytes: Optional[int] = None, max_disk_entries: Optional[int] = None):
+        """Initialize the cache"""
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes or settings.api_cache_max_disk_bytes
+        self.max_disk_entries = max_disk_entries or max_entries * 4
+        self._entries: 'OrderedDict[str, CachedResponse]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'fresh_hits': 0, 'disk_hits': 0, 'not_modified': 0, 'misses': 0,
+                      'bytes_downloaded': 0, 'bytes_saved': 0, 'evictions': 0,
+                      'disk_evictions': 0}
+
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(url: str, params: Optional[Mapping[str, Any]] = None) -> str:
+        """Build the cache key of a GET request"""
+        query = json.dumps(sorted((params or {}).items()), default=str)
+        return hashlib.blake2b(f"{url}?{query}".encode(), digest_size=20).hexdigest()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Get an entry, fresh or not, promoting disk hits into memory"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+
+        entry = self._read_disk(key)
+        if entry is not None:
+            with self._lock:
+                self.stats['disk_hits'] += 1
+                self._store(key, entry)
+        return entry
+
+    def hit(self, entry: CachedResponse) -> Any:
+        """Serve a fresh entry without a request"""
+        with self._lock:
+            self.stats['fresh_hits'] += 1
+            self.stats['bytes_saved'] += entry.size
+        return entry.payload
+
+    def not_modified(self, key: str, entry: CachedResponse, headers: Mapping[str, str]) -> Any:
+        """Serve an entry the server confirmed with a 304, renewing its TTL"""
+        with self._lock:
+            # The entry is shared with other threads, so it changes under the lock
+            entry.expires_at = time.time() + self._ttl(headers, self.ttl)
+            entry.etag = headers.get('ETag') or entry.etag
+            entry.last_modified = headers.get('Last-Modified') or entry.last_modified
+            self.stats['not_modified'] += 1
+            self.stats['bytes_saved'] += entry.size
+            self._store(key, entry)
+            snapshot = replace(entry)
+        self._write_disk(key, snapshot)
+        return entry.payload
+
+    def store(self, key: str, payload: Any, headers: Mapping[str, str], size: int,
+              ttl: Optional[int] = None) -> None:
+        """Store a downloaded payload unless the server forbids it"""
+        with self._lock:
+            self.stats['misses'] += 1
+            self.stats['bytes_downloaded'] += size
+        if 'no-store' in headers.get('Cache-Control', ''):
+            return
+
+        entry = CachedResponse(
+            payload=payload,
+            etag=headers.get('ETag'),
+            last_modified=headers.get('Last-Modified'),
+            size=size,
+            expires_at=time.time() + self._ttl(headers, self.ttl if ttl is None else ttl)
+        )
+        with self._lock:
+            self._store(key, entry)
+        self._write_disk(key, entry)
+
+    def clear(self) -> None:
+        """Drop every in-memory entry"""
+        with self._lock:
+            self._entries.clear()
+
+    @staticmethod
+    def _ttl(headers: Mapping[str, str], default: int) -> int:
+        """Seconds an entry stays fresh: the server's max-age if given"""
+        cache_control = headers.get('Cache-Control', '')
+        if 'no-cache' in cache_control:
+            return 0
+        match = MAX_AGE_PATTERN.search(cache_control)
+        return int(match.group(1)) if match else default
+
+    def _store(self, key: str, entry: CachedResponse) -> None:
+        """Insert into the LRU and evict down to the entry bound (lock held)"""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _read_disk(self, key: str) -> Optional[CachedResponse]:
+        """Read an entry from the disk layer, if there is one"""
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                entry = CachedResponse(**json.load(f))
+            os.utime(self._path(key))  # Mark as recently used for eviction
+            return entry
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Error reading cached response {key}: {e}")
+            return None
+
+    def _write_disk(self, key: str, entry: CachedResponse) -> None:
+        """Write an entry to the disk layer and evict the oldest files"""
+        if not self.cache_dir:
+            return
+        try:
+            tmp_path = f"{self._path(key)}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(asdict(entry), f)
+            os.replace(tmp_path, self._path(key))
+            self._evict_disk()
+        except (OSError, TypeError) as e:
+            logger.warning(f"Error writing cached response {key}: {e}")
+
+    def _evict_disk(self) -> None:
+        """Remove least recently used files until the directory fits both bounds"""
+        files = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith('.json'):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in files)
+        count = len(files)
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes and count <= self.max_disk_entries:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                count -= 1
+                with self._lock:
+                    self.stats['disk_evictions'] += 1
+            except OSError:
+                pass
+
+
+# Process-wide cache shared by the sync and async API clients
+response_cache = ResponseCache(
+    max_entries=settings.api_cache_max_entries,
+    ttl=settings.api_cache_ttl,
+    cache_dir=settings.api_cache_dir
+)
+
+
+def get_response_cache_stats() -> Dict[str, Any]:
+    """Hit counters, 304 rate and bytes saved by the response cache"""
+    stats = dict(response_cache.stats)
+    revalidations = stats['not_modified'] + stats['misses']
+    stats['not_modified_rate'] = stats['not_modified'] / revalidations if revalidations else 0.0
+    stats['entries'] = len(response_cache._entries)
+    return stats
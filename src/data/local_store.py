@@ -0,0 +1,188 @@
+"""
+Local in-memory store for row-level Search Console data.
+
+Low-cardinality dimensions (device, country, position category, query type)
+are indexed with NumPy-packed bitmaps so that multi-select filters are
+evaluated with a handful of bitwise operations over ``n / 8`` bytes instead
+of a full scan of every row.
+"""
+
+import logging
+from typing import Dict, Iterable, List, Optional, Union
+import numpy as np
+import pandas as pd
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Dimensions that get a bitmap index when present in the frame
+INDEXED_DIMENSIONS = ['device', 'country', 'position_category', 'query_type']
+
+# Position buckets, matching ViewQueries.get_position_distribution
+POSITION_BINS = [0, 3, 10, 20, 50, np.inf]
+POSITION_LABELS = ['Top 3', 'Top 10', 'Top 20', 'Top 50', 'Beyond 50']
+
+# Branded query rule, matching get_query_category_performance
+BRANDED_PATTERN = r'twelve|12.*transfers'
+
+# Set-bit count for every possible byte value
+_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+FilterValues = Union[str, Iterable[str]]
+
+
+class BitmapIndex:
+    """Packed bitmap index over a single low-cardinality column"""
+
+    def __init__(self, values: pd.Series):
+        """Build one packed bitmap per distinct value of the column"""
+        codes, uniques = pd.factorize(values, sort=True)
+        self.num_rows = len(codes)
+        self.num_bytes = (self.num_rows + 7) // 8
+        self.values: List[str] = [str(v) for v in uniques]
+        self._positions = {value: i for i, value in enumerate(self.values)}
+
+        # Rows of this 2D array are the bitmaps, one per distinct value
+        self.bitmaps = np.zeros((len(self.values), self.num_bytes), dtype=np.uint8)
+        if self.num_rows == 0:
+            return
+
+        # Group row numbers by code once, then pack each group into its bitmap
+        order = np.argsort(codes, kind='stable')
+        counts = np.bincount(codes[codes >= 0], minlength=len(self.values))
+        start = int((codes < 0).sum())  # NULLs sort first and are not indexed
+        mask = np.zeros(self.num_rows, dtype=bool)
+        for i, count in enumerate(counts):
+            rows = order[start:start + count]
+            mask[rows] = True
+            self.bitmaps[i] = np.packbits(mask)
+            mask[rows] = False
+            start += count
+
+    def bitmap(self, value: str) -> Optional[np.ndarray]:
+        """Get the packed bitmap for a single value, or None if unseen"""
+        position = self._positions.get(str(value))
+        return self.bitmaps[position] if position is not None else None
+
+    def union(self, values: Iterable[str], out: Optional[np.ndarray] = None) -> np.ndarray:
+        """OR the bitmaps of several values together (multi-select)"""
+        if out is None:
+            out = np.empty(self.num_bytes, dtype=np.uint8)
+        out.fill(0)
+        for value in values:
+            bitmap = self.bitmap(value)
+            if bitmap is not None:
+                np.bitwise_or(out, bitmap, out=out)
+        return out
+
+
+class LocalSearchConsoleStore:
+    """Row-level Search Console data with bitmap-indexed dimensions"""
+
+    def __init__(self, data: pd.DataFrame):
+        """Prepare the frame and build bitmap indexes for its dimensions"""
+        self.frame = self._prepare(data)
+        self.num_rows = len(self.frame)
+        self.num_bytes = (self.num_rows + 7) // 8
+        self.indexes: Dict[str, BitmapIndex] = {
+            dim: BitmapIndex(self.frame[dim])
+            for dim in INDEXED_DIMENSIONS
+            if dim in self.frame.columns
+        }
+        logger.info(
+            f"Built local store with {self.num_rows:,} rows and "
+            f"{len(self.indexes)} bitmap indexes"
+        )
+
+    @staticmethod
+    def _prepare(data: pd.DataFrame) -> pd.DataFrame:
+        """Derive the position_category and query_type dimensions"""
+        frame = data.reset_index(drop=True)
+
+        if 'position_category' not in frame.columns and 'position' in frame.columns:
+            frame['position_category'] = pd.cut(
+                frame['position'], bins=POSITION_BINS, labels=POSITION_LABELS
+            ).astype(object)
+
+        if 'query_type' not in frame.columns and 'query' in frame.columns:
+            branded = frame['query'].str.lower().str.contains(BRANDED_PATTERN, na=False)
+            frame['query_type'] = np.where(branded, 'Branded', 'Non-Branded')
+
+        return frame
+
+    def dimension_values(self, dimension: str) -> List[str]:
+        """List the distinct indexed values of a dimension"""
+        index = self.indexes.get(dimension)
+        return list(index.values) if index else []
+
+    def filter_bitmap(self, filters: Dict[str, FilterValues],
+                      out: Optional[np.ndarray] = None,
+                      scratch: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Evaluate filters to a packed bitmap of matching rows
+
+        Values within a dimension are OR-ed, dimensions are AND-ed. Passing
+        preallocated ``out`` and ``scratch`` buffers of ``num_bytes`` makes
+        repeated filtering allocation-free.
+
+        Args:
+            filters (dict): Dimension name to a value or list of values
+            out (np.ndarray, optional): Buffer receiving the result
+            scratch (np.ndarray, optional): Buffer for per-dimension unions
+
+        Returns:
+            np.ndarray: Packed uint8 bitmap with one bit per row
+        """
+        if out is None:
+            out = np.empty(self.num_bytes, dtype=np.uint8)
+        out.fill(0xFF)
+
+        active = {dim: values for dim, values in filters.items() if values}
+        if active and scratch is None:
+            scratch = np.empty(self.num_bytes, dtype=np.uint8)
+
+        for dim, values in active.items():
+            index = self.indexes.get(dim)
+            if index is None:
+                raise KeyError(f"No bitmap index for dimension: {dim}")
+            if isinstance(values, str):
+                values = [values]
+            np.bitwise_and(out, index.union(values, out=scratch), out=out)
+
+        # Clear the padding bits past the last row
+        padding = self.num_bytes * 8 - self.num_rows
+        if padding and self.num_bytes:
+            out[-1] &= (0xFF << padding) & 0xFF
+
+        return out
+
+    def count(self, filters: Dict[str, FilterValues]) -> int:
+        """Count rows matching the filters without materializing them"""
+        bitmap = self.filter_bitmap(filters)
+        return int(_POPCOUNT[bitmap].sum(dtype=np.int64))
+
+    def row_positions(self, filters: Dict[str, FilterValues]) -> np.ndarray:
+        """Get the integer positions of rows matching the filters"""
+        bitmap = self.filter_bitmap(filters)
+        return np.flatnonzero(np.unpackbits(bitmap, count=self.num_rows))
+
+    def select(self, filters: Dict[str, FilterValues],
+               columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Get the rows matching the filters as a DataFrame"""
+        frame = self.frame if columns is None else self.frame[columns]
+        return frame.iloc[self.row_positions(filters)]
+
+    def aggregate(self, filters: Dict[str, FilterValues], by: str) -> pd.DataFrame:
+        """Aggregate clicks, impressions, CTR and position by a column"""
+        rows = self.select(filters)
+        if rows.empty:
+            return pd.DataFrame()
+
+        grouped = rows.groupby(by, observed=True).agg(
+            total_clicks=('clicks', 'sum'),
+            total_impressions=('impressions', 'sum'),
+            avg_position=('position', 'mean')
+        ).reset_index()
+        impressions = grouped['total_impressions'].replace(0, np.nan)
+        grouped['avg_ctr_percentage'] = (grouped['total_clicks'] / impressions * 100).fillna(0.0)
+        return grouped.sort_values('total_clicks', ascending=False).reset_index(drop=True)
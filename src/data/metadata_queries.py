@@ -119,6 +119,15 @@ class MetadataQueries:
         FROM quality_metrics
         """
     
+    @staticmethod
+    def get_dataset_last_modified(dataset: str) -> str:
+        """Get the latest table modification time in a dataset (metadata only)"""
+        return f"""
+        SELECT 
+            MAX(last_modified_time) as last_modified_time
+        FROM `{settings.bigquery_project_id}.{dataset}.__TABLES__`
+        """
+    
     @staticmethod
     def get_table_schema(table_name: str) -> str:
         """Get schema information for a specific table"""
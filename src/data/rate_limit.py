@@ -0,0 +1,311 @@
+"""
+Client-side rate limiting for the booking API.
+
+Requests are grouped by the first segment of their endpoint (``system``,
+``quotes``, ``payments``...) and every group has a token bucket shared by the
+sync and async clients. Callers queue for tokens in priority order, so
+interactive page loads go ahead of background refreshes, and are turned away
+when their expected wait exceeds ``api_rate_max_wait``. A bucket halves its
+rate when the server answers 429 or 503, pauses for any Retry-After, and
+climbs back to the configured rate as requests succeed.
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+
+from ..config.settings import settings
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Request priorities; lower values are served first
+INTERACTIVE = 0
+BACKGROUND = 1
+
+# Responses that ask the client to slow down
+THROTTLE_STATUSES = (429, 503)
+
+# Seconds between two rate cuts, so a burst of 429s counts as one signal
+CUT_INTERVAL = 1.0
+
+# Lowest share of the configured rate a bucket backs off to
+MIN_RATE_SHARE = 0.05
+
+# Share of the configured rate regained per second of successful requests
+RECOVERY_STEP = 0.05
+
+# Wait-time samples kept per group for percentiles
+WAIT_SAMPLES = 1000
+
+# Priority of the requests made in the current thread or task
+request_priority: contextvars.ContextVar[int] = contextvars.ContextVar('request_priority', default=INTERACTIVE)
+
+Ticket = Tuple[int, int]
+
+
+@contextlib.contextmanager
+def background_requests() -> Iterator[None]:
+    """Send the API requests made inside the block at background priority"""
+    token = request_priority.set(BACKGROUND)
+    try:
+        yield
+    finally:
+        request_priority.reset(token)
+
+
+class TokenBucket:
+    """Adaptive token bucket with a priority queue for one endpoint group"""
+
+    def __init__(self, name: str, rate: float, burst: int, max_wait: float, max_queue: int):
+        """
+        Initialize the bucket, full
+
+        Args:
+            name (str): Endpoint group
+            rate (float): Requests per second when the server isn't pushing back
+            burst (int): Requests that may go out at once after a quiet spell
+            max_wait (float): Seconds a caller may queue before it is turned away
+            max_queue (int): Callers that may queue at once
+        """
+        self.name = name
+        self.target_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.max_wait = max_wait
+        self.max_queue = max_queue
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.last_cut = 0.0
+        self._queue: List[Ticket] = []
+        self._queued: Dict[int, int] = {}
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._waits = deque(maxlen=WAIT_SAMPLES)
+        self.stats = {'admitted': 0, 'rejected': 0, 'succeeded': 0, 'throttled': 0, 'failed': 0}
+
+    def acquire(self, priority: int = INTERACTIVE) -> bool:
+        """
+        Wait for a token, blocking the calling thread
+
+        Args:
+            priority (int): ``INTERACTIVE`` or ``BACKGROUND``
+
+        Returns:
+            bool: True once the request may be sent, False if it was turned away
+        """
+        with self._cond:
+            ticket = self._enqueue(priority)
+            if ticket is None:
+                return False
+            start = time.monotonic()
+            while True:
+                wait = self._poll(ticket, start)
+                if wait is None:
+                    return True
+                if wait < 0:
+                    return False
+                self._cond.wait(wait)
+
+    async def acquire_async(self, priority: int = INTERACTIVE) -> bool:
+        """Wait for a token without blocking the event loop; see ``acquire``"""
+        with self._cond:
+            ticket = self._enqueue(priority)
+        if ticket is None:
+            return False
+        start = time.monotonic()
+        try:
+            while True:
+                with self._cond:
+                    wait = self._poll(ticket, start)
+                if wait is None:
+                    return True
+                if wait < 0:
+                    return False
+                await asyncio.sleep(wait)
+        except asyncio.CancelledError:
+            with self._cond:
+                self._leave(ticket)
+            raise
+
+    def record(self, status: Optional[int], retry_after: Optional[str] = None) -> None:
+        """
+        Adapt the rate to the outcome of a request
+
+        Args:
+            status (int, optional): Response status, None for a transport error
+            retry_after (str, optional): The response's Retry-After header
+        """
+        with self._cond:
+            now = time.monotonic()
+            self._refill(now)
+            if status in THROTTLE_STATUSES:
+                self.stats['throttled'] += 1
+                # Stop the rest of the burst as well
+                self.tokens = min(self.tokens, 0.0)
+                if now - self.last_cut >= CUT_INTERVAL:
+                    self.rate = max(self.target_rate * MIN_RATE_SHARE, self.rate / 2)
+                    self.last_cut = now
+                    logger.warning(f"API group {self.name} throttled ({status}), "
+                                   f"rate lowered to {self.rate:.2f}/s")
+                if retry_after and retry_after.isdigit():
+                    self.paused_until = max(self.paused_until, now + min(float(retry_after), self.max_wait))
+            elif status is not None and status < 400:
+                self.stats['succeeded'] += 1
+                # About ``rate`` successes arrive per second
+                self.rate = min(self.target_rate, self.rate + self.target_rate * RECOVERY_STEP / self.rate)
+            else:
+                self.stats['failed'] += 1
+            self._cond.notify_all()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current counters, rate and queueing delay as a dict"""
+        with self._cond:
+            waits = np.array(self._waits) * 1000 if self._waits else None
+            return {
+                **self.stats,
+                'rate': self.rate,
+                'target_rate': self.target_rate,
+                'queued': len(self._queue),
+                'wait_ms_p50': float(np.percentile(waits, 50)) if waits is not None else None,
+                'wait_ms_p95': float(np.percentile(waits, 95)) if waits is not None else None
+            }
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens accrued since the last update (lock held)"""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def _enqueue(self, priority: int) -> Optional[Ticket]:
+        """Queue a caller, or turn it away if the queue is full or too slow (lock held)"""
+        now = time.monotonic()
+        self._refill(now)
+        ahead = sum(count for queued_priority, count in self._queued.items() if queued_priority <= priority)
+        expected = max(0.0, self.paused_until - now) + max(0.0, (ahead + 1 - self.tokens) / self.rate)
+        if len(self._queue) >= self.max_queue or expected > self.max_wait:
+            self.stats['rejected'] += 1
+            return None
+        ticket = (priority, next(self._seq))
+        heapq.heappush(self._queue, ticket)
+        self._queued[priority] = self._queued.get(priority, 0) + 1
+        return ticket
+
+    def _poll(self, ticket: Ticket, start: float) -> Optional[float]:
+        """
+        Give the ticket a token if it is first in line and one is available (lock held)
+
+        Returns:
+            None once admitted, -1 if the caller waited too long, else seconds to wait
+        """
+        now = time.monotonic()
+        self._refill(now)
+        first = self._queue[0] == ticket
+        if first and now >= self.paused_until and self.tokens >= 1:
+            self.tokens -= 1
+            self._leave(ticket)
+            self.stats['admitted'] += 1
+            self._waits.append(now - start)
+            return None
+
+        if first:
+            wait = max(self.paused_until - now, (1 - self.tokens) / self.rate)
+        else:
+            # Woken when the line moves; the timeout only bounds the wait
+            wait = 1 / self.rate
+        if now + wait - start > self.max_wait:
+            self._leave(ticket)
+            self.stats['rejected'] += 1
+            return -1
+        return max(wait, 0.001)
+
+    def _leave(self, ticket: Ticket) -> None:
+        """Take a ticket out of the queue and wake the others (lock held)"""
+        if self._queue and self._queue[0] == ticket:
+            heapq.heappop(self._queue)
+        else:
+            self._queue.remove(ticket)
+            heapq.heapify(self._queue)
+        self._queued[ticket[0]] -= 1
+        self._cond.notify_all()
+
+
+class RateLimiter:
+    """Token buckets per endpoint group"""
+
+    def __init__(self, rate: float, burst: int, max_wait: float, max_queue: int,
+                 group_rates: Optional[Dict[str, float]] = None):
+        """
+        Initialize the limiter
+
+        Args:
+            rate (float): Requests per second per group
+            burst (int): Bucket size per group
+            max_wait (float): Seconds a request may queue
+            max_queue (int): Requests that may queue per group
+            group_rates (dict, optional): Group -> requests per second, overriding ``rate``
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_wait = max_wait
+        self.max_queue = max_queue
+        self.group_rates = dict(group_rates or {})
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def group(endpoint: str) -> str:
+        """Endpoint group of an endpoint path, e.g. ``system`` for ``system/booking-stats``"""
+        return endpoint.split('/', 1)[0]
+
+    def bucket(self, endpoint: str) -> TokenBucket:
+        """Get the bucket of an endpoint's group, creating it on first use"""
+        group = self.group(endpoint)
+        with self._lock:
+            if group not in self._buckets:
+                self._buckets[group] = TokenBucket(group, self.group_rates.get(group, self.rate),
+                                                   self.burst, self.max_wait, self.max_queue)
+            return self._buckets[group]
+
+    def acquire(self, endpoint: str, priority: Optional[int] = None) -> bool:
+        """Wait for a token to call an endpoint, at the context's priority by default"""
+        return self.bucket(endpoint).acquire(request_priority.get() if priority is None else priority)
+
+    async def acquire_async(self, endpoint: str, priority: Optional[int] = None) -> bool:
+        """Wait for a token to call an endpoint from a coroutine"""
+        return await self.bucket(endpoint).acquire_async(
+            request_priority.get() if priority is None else priority
+        )
+
+    def record(self, endpoint: str, status: Optional[int], retry_after: Optional[str] = None) -> None:
+        """Report the outcome of a request to its group's bucket"""
+        self.bucket(endpoint).record(status, retry_after)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Metrics of every group"""
+        with self._lock:
+            buckets = list(self._buckets.values())
+        return {bucket.name: bucket.snapshot() for bucket in buckets}
+
+
+# Process-wide limiter shared by the sync and async API clients
+rate_limiter = RateLimiter(
+    rate=settings.api_rate_limit,
+    burst=settings.api_rate_burst,
+    max_wait=settings.api_rate_max_wait,
+    max_queue=settings.api_rate_max_queue,
+    group_rates=settings.api_rate_limits
+)
+
+
+def get_rate_limit_stats() -> Dict[str, Dict[str, Any]]:
+    """Admitted, rejected and throttled requests, current rate and queueing delay per endpoint group"""
+    return rate_limiter.stats()
@@ -0,0 +1,324 @@
+"""
+Supabase real-time change feed into cached DataFrames.
+
+Each subscribed table is held as a ``LiveTable``: a DataFrame loaded once
+from a snapshot and then kept current by applying INSERT, UPDATE and DELETE
+events from Supabase Realtime, so readers never re-query the table. The
+realtime client is asyncio-only, so the feed runs it on an event loop in a
+background thread. Events that arrive in the same loop iteration are applied
+together as one batch, capped at ``MAX_BATCH`` so a burst cannot hold them
+back for long.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Latency samples kept per table for percentiles
+LATENCY_SAMPLES = 1000
+
+# Seconds of history used for the events-per-second rate
+RATE_WINDOW = 10.0
+
+# Queued changes that are applied straight away rather than when the loop is idle
+MAX_BATCH = 1000
+
+
+class FeedMetrics:
+    """Event counts, throughput and apply latency of one table"""
+
+    def __init__(self):
+        self.events = 0
+        self.counts = {'INSERT': 0, 'UPDATE': 0, 'DELETE': 0}
+        self.batches = 0
+        self.last_event_at: Optional[datetime] = None
+        self._apply_latency = deque(maxlen=LATENCY_SAMPLES)
+        self._commit_lag = deque(maxlen=LATENCY_SAMPLES)
+        self._recent = deque()
+
+    def record(self, changes: List[Tuple[Dict[str, Any], float]], applied: float) -> None:
+        """Record a batch of changes applied at ``applied`` (perf_counter time)"""
+        now = time.time()
+        self.events += len(changes)
+        self.batches += 1
+        self.last_event_at = datetime.now()
+        self._recent.append((applied, len(changes)))
+        for data, received in changes:
+            kind = data.get('type')
+            if kind in self.counts:
+                self.counts[kind] += 1
+            self._apply_latency.append((applied - received) * 1000)
+            committed = _parse_timestamp(data.get('commit_timestamp'))
+            if committed is not None:
+                self._commit_lag.append((now - committed) * 1000)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current metrics as a dict"""
+        now = time.perf_counter()
+        while self._recent and now - self._recent[0][0] > RATE_WINDOW:
+            self._recent.popleft()
+        recent = sum(count for _, count in self._recent)
+        apply_latency = np.array(self._apply_latency) if self._apply_latency else None
+        commit_lag = np.array(self._commit_lag) if self._commit_lag else None
+        return {
+            'events': self.events,
+            'inserts': self.counts['INSERT'],
+            'updates': self.counts['UPDATE'],
+            'deletes': self.counts['DELETE'],
+            'batches': self.batches,
+            'events_per_sec': recent / RATE_WINDOW,
+            'apply_latency_ms_p50': float(np.percentile(apply_latency, 50)) if apply_latency is not None else None,
+            'apply_latency_ms_p95': float(np.percentile(apply_latency, 95)) if apply_latency is not None else None,
+            'commit_lag_ms_p50': float(np.percentile(commit_lag, 50)) if commit_lag is not None else None,
+            'last_event_at': self.last_event_at
+        }
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[float]:
+    """Parse a commit timestamp to epoch seconds"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return None
+
+
+class LiveTable:
+    """A table cached as a DataFrame and kept current by change events"""
+
+    def __init__(self, name: str, key: str = 'id', columns: Optional[Sequence[str]] = None,
+                 callback: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """
+        Initialize an empty live table
+
+        Args:
+            name (str): Table name
+            key (str): Primary key column used to match changes to rows
+            columns (list, optional): Columns to keep; all columns by default
+            callback (callable, optional): Called with each change once applied
+        """
+        self.name = name
+        self.key = key
+        self.columns = list(dict.fromkeys([key] + list(columns))) if columns else None
+        self.callback = callback
+        self.metrics = FeedMetrics()
+        self.version = 0
+        self._frame = pd.DataFrame(columns=self.columns)
+        self._loaded = False
+        self._pending: List[Tuple[Dict[str, Any], float]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the snapshot has been loaded"""
+        return self._loaded
+
+    def frame(self) -> pd.DataFrame:
+        """Get a copy of the current rows, indexed by key"""
+        return self._frame.copy()
+
+    def load(self, pages: Iterable[List[Dict[str, Any]]]) -> None:
+        """
+        Load the snapshot the change events apply to
+
+        Events received while the snapshot loads are held back and applied
+        right after it, so none are lost between the read and the feed.
+        """
+        rows = [row for page in pages for row in page]
+        frame = pd.DataFrame(rows, columns=self.columns) if rows else pd.DataFrame(columns=self.columns)
+        if self.key in frame.columns:
+            frame.index = pd.Index(frame[self.key])
+            frame.index.name = None
+        with self._lock:
+            self._frame = frame
+            self._loaded = True
+            self.version += 1
+        logger.info(f"Loaded {len(frame):,} rows of {self.name} for the change feed")
+        self.apply_pending()
+
+    @property
+    def pending(self) -> int:
+        """Number of changes received but not applied yet"""
+        return len(self._pending)
+
+    def enqueue(self, data: Dict[str, Any], received: float) -> int:
+        """Queue a change received at ``received`` (perf_counter time), returning the queue length"""
+        with self._lock:
+            self._pending.append((data, received))
+            return len(self._pending)
+
+    def apply_pending(self) -> int:
+        """Apply queued changes as one batch, returning how many were applied"""
+        with self._lock:
+            if not self._loaded or not self._pending:
+                return 0
+            changes, self._pending = self._pending, []
+
+            # Only the last change per key matters within a batch
+            upserts: Dict[Any, Dict[str, Any]] = {}
+            deleted = set()
+            for data, _ in changes:
+                if data.get('type') == 'DELETE':
+                    key = (data.get('old_record') or {}).get(self.key)
+                    upserts.pop(key, None)
+                    deleted.add(key)
+                else:
+                    record = data.get('record') or {}
+                    key = record.get(self.key)
+                    deleted.discard(key)
+                    upserts[key] = record
+
+            frame = self._frame
+            touched = frame.index.intersection(list(deleted) + list(upserts))
+            if len(touched):
+                frame = frame.drop(index=touched)
+            if upserts:
+                new_rows = pd.DataFrame(list(upserts.values()), columns=self.columns)
+                new_rows.index = pd.Index(list(upserts))
+                frame = pd.concat([frame, new_rows]) if len(frame) else new_rows
+
+            self._frame = frame
+            self.version += 1
+            self.metrics.record(changes, time.perf_counter())
+
+        if self.callback:
+            for data, _ in changes:
+                try:
+                    self.callback(data)
+                except Exception as e:
+                    logger.error(f"Error in change callback for {self.name}: {e}")
+        return len(changes)
+
+
+class ChangeFeed:
+    """Consumes Supabase Realtime postgres changes into live tables"""
+
+    def __init__(self, url: str, key: str, schema: str = 'public', timeout: float = 10):
+        """
+        Initialize the feed; the connection opens on the first subscription
+
+        Args:
+            url (str): Realtime endpoint, e.g. ``<supabase url>/realtime/v1``
+            key (str): API key used to authenticate the socket
+            schema (str): Database schema of the subscribed tables
+            timeout (float): Seconds to wait for a subscription to be confirmed
+        """
+        self.url = url
+        self.key = key
+        self.schema = schema
+        self.timeout = timeout
+        self.tables: Dict[str, LiveTable] = {}
+        self._client = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._flush_scheduled = set()
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the background event loop if needed"""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever,
+                                                name='supabase-change-feed', daemon=True)
+                self._thread.start()
+            return self._loop
+
+    def _run(self, coroutine, timeout: Optional[float] = None):
+        """Run a coroutine on the feed's loop and wait for its result"""
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(coroutine, loop).result(timeout)
+
+    def subscribe(self, table: LiveTable,
+                  snapshot: Optional[Callable[[], Iterable[List[Dict[str, Any]]]]] = None) -> LiveTable:
+        """
+        Subscribe a live table to its change events and load its snapshot
+
+        Args:
+            table (LiveTable): Table to keep current
+            snapshot (callable, optional): Returns the table's rows as pages,
+                e.g. ``MarketingSupabaseClient.iter_table``; starts empty if omitted
+
+        Returns:
+            LiveTable: The subscribed table
+        """
+        if table.name in self.tables:
+            return self.tables[table.name]
+
+        self._run(self._subscribe(table), timeout=self.timeout + 5)
+        self.tables[table.name] = table
+        table.load(snapshot() if snapshot else [])
+        return table
+
+    async def _subscribe(self, table: LiveTable) -> None:
+        """Join the table's channel and wait for the server to confirm it"""
+        from realtime import AsyncRealtimeClient, RealtimeSubscribeStates
+
+        if self._client is None:
+            self._client = AsyncRealtimeClient(self.url, self.key, auto_reconnect=True)
+            await self._client.connect()
+
+        loop = asyncio.get_running_loop()
+        joined = loop.create_future()
+
+        def on_status(status, error):
+            if joined.done():
+                return
+            if status == RealtimeSubscribeStates.SUBSCRIBED:
+                joined.set_result(True)
+            else:
+                joined.set_exception(error or RuntimeError(f"Subscription to {table.name} {status}"))
+
+        channel = self._client.channel(f"{self.schema}:{table.name}")
+        channel.on_postgres_changes('*', callback=lambda payload: self._on_change(table, payload),
+                                    table=table.name, schema=self.schema,
+                                    select=table.columns)
+        await channel.subscribe(on_status)
+        await asyncio.wait_for(joined, self.timeout)
+        logger.info(f"Subscribed to changes on {self.schema}.{table.name}")
+
+    def _on_change(self, table: LiveTable, payload: Dict[str, Any]) -> None:
+        """Queue a change and apply the batch once the loop is idle or the batch is full"""
+        if table.enqueue(payload['data'], time.perf_counter()) >= MAX_BATCH:
+            self._flush(table)
+        elif table.name not in self._flush_scheduled:
+            self._flush_scheduled.add(table.name)
+            self._loop.call_soon(self._flush, table)
+
+    def _flush(self, table: LiveTable) -> None:
+        """Apply a table's queued changes"""
+        self._flush_scheduled.discard(table.name)
+        try:
+            table.apply_pending()
+        except Exception as e:
+            logger.error(f"Error applying changes to {table.name}: {e}")
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Metrics of every subscribed table"""
+        return {name: {**table.metrics.snapshot(), 'pending': table.pending}
+                for name, table in self.tables.items()}
+
+    def close(self) -> None:
+        """Close the socket and stop the background loop"""
+        if self._loop is None:
+            return
+        if self._client is not None:
+            try:
+                self._run(self._client.remove_all_channels(), timeout=self.timeout)
+            except Exception as e:
+                logger.error(f"Error closing change feed: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=self.timeout)
+        self._client = None
+        self._loop = None
+        self.tables = {}
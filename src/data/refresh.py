@@ -0,0 +1,123 @@
+"""
+Change-detecting refresh scheduler.
+
+Datasets are registered with a cheap freshness probe (a table's ``modified``
+time or a max-date watermark) and the callbacks that drop their cached
+results. Each poll compares the probes with the previous poll and reloads
+only the datasets whose sources changed.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RefreshReport:
+    """Outcome of one refresh poll"""
+    checked_at: datetime
+    reloaded: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    errors: Dict[str, str] = field(default_factory=dict)
+    seconds: float = 0.0
+
+
+@dataclass
+class _Dataset:
+    """A registered dataset and its last seen freshness signal"""
+    probe: Callable[[], Any]
+    reloaders: List[Callable[[], None]]
+    signal: Any = None
+    version: int = 0
+
+
+class RefreshScheduler:
+    """Polls freshness signals and reloads only changed datasets"""
+
+    def __init__(self, interval: int = 30):
+        """Initialize with the minimum number of seconds between polls"""
+        self.interval = interval
+        self.last_report: Optional[RefreshReport] = None
+        self._datasets: Dict[str, _Dataset] = {}
+        self._last_poll = 0.0
+        self._lock = threading.Lock()
+
+    def register(self, name: str, probe: Callable[[], Any],
+                 reloaders: List[Callable[[], None]]) -> None:
+        """
+        Register a dataset
+
+        Args:
+            name (str): Dataset name shown in refresh reports
+            probe (callable): Returns the freshness signal, e.g. a modified time
+            reloaders (list): Called to drop cached results when the signal changes
+        """
+        self._datasets[name] = _Dataset(probe=probe, reloaders=reloaders)
+
+    def versions(self) -> Dict[str, int]:
+        """Current version of every dataset; bumped whenever it is reloaded"""
+        return {name: dataset.version for name, dataset in self._datasets.items()}
+
+    def due(self, interval: Optional[float] = None) -> bool:
+        """Whether the interval has passed since the last poll"""
+        interval = self.interval if interval is None else interval
+        return time.monotonic() - self._last_poll >= interval
+
+    def poll(self, force: bool = False,
+             interval: Optional[float] = None) -> Optional[RefreshReport]:
+        """
+        Probe every dataset and reload the ones whose signal changed
+
+        The first signal seen for a dataset is its baseline and does not
+        trigger a reload. Polls closer together than the interval are
+        skipped unless forced, so concurrent sessions share one probe.
+
+        Args:
+            force (bool): Poll even if the interval has not passed
+            interval (float, optional): Override the scheduler's interval
+
+        Returns:
+            RefreshReport: What was reloaded, or None if the poll was skipped
+        """
+        if not self._lock.acquire(blocking=False):
+            return None
+        try:
+            if not force and not self.due(interval):
+                return None
+            self._last_poll = time.monotonic()
+
+            start = time.perf_counter()
+            report = RefreshReport(checked_at=datetime.now())
+
+            for name, dataset in self._datasets.items():
+                try:
+                    signal = dataset.probe()
+                except Exception as e:
+                    logger.error(f"Error probing freshness of {name}: {e}")
+                    report.errors[name] = str(e)
+                    continue
+
+                if signal is None or signal == dataset.signal or dataset.signal is None:
+                    dataset.signal = signal if signal is not None else dataset.signal
+                    report.unchanged.append(name)
+                    continue
+
+                dataset.signal = signal
+                for reload in dataset.reloaders:
+                    reload()
+                dataset.version += 1
+                report.reloaded.append(name)
+
+            report.seconds = time.perf_counter() - start
+            self.last_report = report
+            if report.reloaded:
+                logger.info(f"Refresh reloaded: {', '.join(report.reloaded)}")
+            return report
+        finally:
+            self._lock.release()
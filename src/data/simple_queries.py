@@ -2,8 +2,12 @@
 Simplified BigQuery queries without complex filtering.
 """
 
+from typing import List, Optional, Tuple
 from ..config.settings import settings
 
+# Dimensions a windowed comparison can be broken down by
+COMPARISON_DIMENSIONS = ['query', 'url', 'device', 'country']
+
 class SimpleQueries:
     """Simplified queries for testing real data"""
     
@@ -64,6 +68,47 @@ class SimpleQueries:
         LIMIT 50
         """
     
+    @staticmethod
+    def get_search_console_rows(days_back: int = 30) -> str:
+        """Get row-level search console data for the local store"""
+        return f"""
+        SELECT
+            DATE(date) as date,
+            query,
+            url,
+            device,
+            country,
+            clicks,
+            impressions,
+            position
+        FROM `{settings.bigquery_project_id}.{settings.bigquery_dataset}.search_console_data`
+        WHERE DATE(date) >= DATE_SUB(CURRENT_DATE(), INTERVAL {days_back} DAY)
+        """
+
+    @staticmethod
+    def get_daily_metrics_for_windows(windows: List[Tuple[str, str]],
+                                      dimensions: Optional[List[str]] = None) -> str:
+        """Get daily metrics for several date windows in one scan"""
+        dimensions = dimensions or []
+        unknown = set(dimensions) - set(COMPARISON_DIMENSIONS)
+        if unknown:
+            raise ValueError(f"Unsupported comparison dimensions: {', '.join(sorted(unknown))}")
+        
+        dimension_list = ''.join(f"{dim},\n            " for dim in dimensions)
+        window_filter = "\n            OR ".join(
+            f"DATE(date) BETWEEN '{start}' AND '{end}'" for start, end in windows
+        )
+        return f"""
+        SELECT 
+            DATE(date) as date,
+            {dimension_list}SUM(clicks) as clicks,
+            SUM(impressions) as impressions,
+            SUM(position * impressions) as weighted_position
+        FROM `{settings.bigquery_project_id}.{settings.bigquery_dataset}.search_console_data`
+        WHERE ({window_filter})
+        GROUP BY {', '.join(['date'] + dimensions)}
+        """
+
     @staticmethod
     def get_recent_data_check() -> str:
         """Check what data we have recently"""
@@ -4,9 +4,13 @@ Supabase client for real-time data operations.
 
 import os
 import logging
-from typing import Dict, List, Any, Optional, Union
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Any, Optional, Sequence, Union
+from postgrest.types import ReturnMethod
 from supabase import create_client, Client
 
+from .realtime_feed import ChangeFeed, LiveTable
 from ..config.settings import settings
 
 # Set up logging
@@ -20,6 +24,7 @@ class MarketingSupabaseClient:
         self.url = settings.supabase_url
         self.key = settings.supabase_key
         self.client: Optional[Client] = None
+        self.feed: Optional[ChangeFeed] = None
         
         # Initialize client
         self._initialize_client()
@@ -66,15 +71,21 @@ class MarketingSupabaseClient:
             # If we get here, the client is at least initialized
             return self.client is not None
     
+    @staticmethod
+    def _select_list(columns: Optional[Sequence[str]]) -> str:
+        """Build the select list of a query, all columns by default"""
+        return ','.join(columns) if columns else '*'
+    
     def query_table(self, table_name: str, filters: Optional[Dict[str, Any]] = None, 
-                   limit: Optional[int] = None) -> List[Dict[str, Any]]:
-        """Query a table with optional filters"""
+                   limit: Optional[int] = None,
+                   columns: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """Query a table with optional filters and column projection"""
         try:
             if not self.client:
                 logger.error("Supabase client not initialized")
                 return []
             
-            query = self.client.table(table_name).select('*')
+            query = self.client.table(table_name).select(self._select_list(columns))
             
             # Apply filters if provided
             if filters:
@@ -92,21 +103,126 @@ class MarketingSupabaseClient:
             logger.error(f"Error querying table {table_name}: {e}")
             return []
     
-    def insert_data(self, table_name: str, data: Union[Dict[str, Any], List[Dict[str, Any]]]) -> bool:
-        """Insert data into a table"""
+    def iter_table(self, table_name: str, columns: Optional[Sequence[str]] = None,
+                   filters: Optional[Dict[str, Any]] = None, page_size: Optional[int] = None,
+                   order: str = 'id') -> Iterator[List[Dict[str, Any]]]:
+        """
+        Stream a table page by page
+        
+        Pages are keyed by ``order``, a unique, sortable column such as the
+        primary key: each page starts after the last key of the previous one.
+        Unlike offset pages without an ORDER BY, this never skips or repeats
+        rows, and deep pages are as cheap as the first. Errors are raised
+        rather than swallowed, so a failed read is not mistaken for the end of
+        the table.
+        
+        Args:
+            table_name (str): Table to read
+            columns (list, optional): Columns to fetch; all columns by default
+            filters (dict, optional): Equality filters
+            page_size (int, optional): Rows per page (default ``settings.supabase_page_size``)
+            order (str): Unique column to page by (default ``id``)
+        
+        Yields:
+            list: One page of rows
+        """
+        if not self.client:
+            raise RuntimeError("Supabase client not initialized")
+        
+        page_size = page_size or settings.supabase_page_size
+        select_list = self._select_list(columns)
+        if columns and order not in columns:
+            select_list += f",{order}"
+        
+        last_key = None
+        while True:
+            query = self.client.table(table_name).select(select_list)
+            for key, value in (filters or {}).items():
+                query = query.eq(key, value)
+            if last_key is not None:
+                query = query.gt(order, last_key)
+            
+            rows = query.order(order).limit(page_size).execute().data or []
+            if rows:
+                yield rows
+            if len(rows) < page_size:
+                return
+            last_key = rows[-1][order]
+    
+    def _write_batches(self, table_name: str, rows: List[Dict[str, Any]], action: str,
+                       batch_size: Optional[int], workers: Optional[int],
+                       **options) -> bool:
+        """Send rows in batches over concurrent requests, True if every batch succeeded"""
+        batch_size = batch_size or settings.supabase_batch_size
+        workers = workers or settings.supabase_write_workers
+        batches = [rows[i:i + batch_size] for i in range(0, len(rows), batch_size)]
+        
+        def send(batch: List[Dict[str, Any]]) -> bool:
+            try:
+                table = self.client.table(table_name)
+                getattr(table, action)(batch, returning=ReturnMethod.minimal, **options).execute()
+                return True
+            except Exception as e:
+                logger.error(f"Error in {action} batch of {len(batch)} rows into {table_name}: {e}")
+                return False
+        
+        start = time.perf_counter()
+        if workers > 1 and len(batches) > 1:
+            with ThreadPoolExecutor(max_workers=min(workers, len(batches))) as executor:
+                results = list(executor.map(send, batches))
+        else:
+            results = [send(batch) for batch in batches]
+        seconds = time.perf_counter() - start
+        
+        failed = results.count(False)
+        rate = len(rows) / seconds if seconds > 0 else 0
+        logger.info(f"{action.capitalize()}ed {len(rows):,} rows into {table_name} in "
+                    f"{len(batches)} batches ({rate:,.0f} rows/s, {failed} failed)")
+        return failed == 0
+    
+    def insert_data(self, table_name: str, data: Union[Dict[str, Any], List[Dict[str, Any]]],
+                    batch_size: Optional[int] = None, workers: Optional[int] = None) -> bool:
+        """
+        Insert data into a table
+        
+        Rows are sent in batches of ``batch_size`` over up to ``workers``
+        concurrent requests. Batches are independent, so a failure can leave
+        the other batches inserted; the result is True only if all succeeded.
+        """
         try:
             if not self.client:
                 logger.error("Supabase client not initialized")
                 return False
             
-            result = self.client.table(table_name).insert(data).execute()
-            logger.info(f"Inserted data into {table_name}")
-            return True
+            rows = [data] if isinstance(data, dict) else list(data)
+            return self._write_batches(table_name, rows, 'insert', batch_size, workers)
             
         except Exception as e:
             logger.error(f"Error inserting data into {table_name}: {e}")
             return False
     
+    def upsert_data(self, table_name: str, data: Union[Dict[str, Any], List[Dict[str, Any]]],
+                    on_conflict: str = '', batch_size: Optional[int] = None,
+                    workers: Optional[int] = None) -> bool:
+        """
+        Insert or update data in a table
+        
+        Rows that clash on ``on_conflict`` (comma-separated columns, the primary
+        key by default) are merged. Batching works as in ``insert_data``.
+        """
+        try:
+            if not self.client:
+                logger.error("Supabase client not initialized")
+                return False
+            
+            rows = [data] if isinstance(data, dict) else list(data)
+            return self._write_batches(table_name, rows, 'upsert', batch_size, workers,
+                                       on_conflict=on_conflict)
+            
+        except Exception as e:
+            logger.error(f"Error upserting data into {table_name}: {e}")
+            return False
+    
     def update_data(self, table_name: str, data: Dict[str, Any], 
                    filters: Dict[str, Any]) -> bool:
         """Update data in a table"""
@@ -150,18 +266,46 @@ class MarketingSupabaseClient:
             logger.error(f"Error deleting data from {table_name}: {e}")
             return False
     
-    def get_realtime_subscription(self, table_name: str, callback):
-        """Subscribe to real-time changes on a table"""
+    def get_realtime_subscription(self, table_name: str,
+                                  callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                                  key: str = 'id',
+                                  columns: Optional[Sequence[str]] = None) -> Optional[LiveTable]:
+        """
+        Subscribe to real-time changes on a table
+        
+        The table is loaded once with ``iter_table`` and then kept current by
+        applying insert, update and delete events to a cached DataFrame, so
+        ``frame()`` never re-queries. Its ``version`` changes with every
+        applied batch, which makes it a freshness probe for the refresh
+        scheduler.
+        
+        Args:
+            table_name (str): Table to follow
+            callback (callable, optional): Called with each change once applied
+            key (str): Primary key column
+            columns (list, optional): Columns to keep; all columns by default
+        
+        Returns:
+            LiveTable: The live table, or None if the subscription failed
+        """
         try:
             if not self.client:
                 logger.error("Supabase client not initialized")
                 return None
             
-            # Note: Real-time subscriptions require additional setup
-            # This is a placeholder for future implementation
-            logger.warning("Real-time subscriptions not yet implemented")
-            return None
+            if self.feed is None:
+                url = settings.supabase_realtime_url or f"{self.url.rstrip('/')}/realtime/v1"
+                self.feed = ChangeFeed(url, self.key, timeout=settings.realtime_subscribe_timeout)
+            
+            table = LiveTable(table_name, key=key, columns=columns, callback=callback)
+            return self.feed.subscribe(
+                table, snapshot=lambda: self.iter_table(table_name, columns=table.columns, order=table.key)
+            )
             
         except Exception as e:
             logger.error(f"Error setting up real-time subscription: {e}")
-            return None
\ No newline at end of file
+            return None
+    
+    def get_realtime_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Get event throughput and apply latency of every subscribed table"""
+        return self.feed.metrics() if self.feed else {}
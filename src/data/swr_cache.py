@@ -0,0 +1,261 @@
+"""
+Stale-while-revalidate cache for dashboard data loaders.
+
+Loaders decorated with ``swr_cached`` keep their results in a process-wide
+cache shared by every Streamlit session. An expired entry is still served
+for up to ``max_stale`` seconds while it is re-fetched in the background, and
+a refresher thread re-runs hot entries (accessed repeatedly within their TTL)
+shortly before they expire. Refreshed results replace the old entry in one
+step, so readers see either the old or the new result, never a partial one.
+Concurrent misses for one key share a single load, and a load that started
+before ``clear()`` does not write its result back afterwards.
+"""
+
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+import pandas as pd
+
+from ..config.settings import settings
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Entry:
+    """A cached loader result"""
+    value: Any
+    args: Tuple
+    kwargs: Dict[str, Any]
+    fetched_at: float
+    expires_at: float
+    hits: int = 0
+
+
+def _copy(value: Any) -> Any:
+    """Copy DataFrames so callers cannot mutate the cached result"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy()
+    return value
+
+
+class SWRCache:
+    """Cache of one loader's results, revalidated in the background"""
+
+    def __init__(self, func: Callable, ttl: int, max_stale: int):
+        """Initialize the cache"""
+        self.func = func
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self._entries: Dict[str, _Entry] = {}
+        self._inflight = set()
+        self._loading: Dict[str, Future] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.stats = {'fresh': 0, 'stale': 0, 'misses': 0, 'refreshes': 0, 'errors': 0}
+
+    @staticmethod
+    def key(args: Tuple, kwargs: Dict[str, Any]) -> str:
+        """Build the cache key for a loader call"""
+        return repr((args, sorted(kwargs.items())))
+
+    def get(self, *args, **kwargs) -> Any:
+        """Get a result, serving stale entries while they are re-fetched"""
+        key = self.key(args, kwargs)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.hits += 1
+                if now < entry.expires_at:
+                    state = 'fresh'
+                elif now < entry.expires_at + self.max_stale:
+                    state = 'stale'
+                else:
+                    state = 'misses'
+            else:
+                state = 'misses'
+            self.stats[state] += 1
+
+        if state == 'stale':
+            self.revalidate(key)
+        if state != 'misses':
+            return _copy(entry.value)
+        return _copy(self._load_once(key, args, kwargs))
+
+    def _load_once(self, key: str, args: Tuple, kwargs: Dict[str, Any]) -> Any:
+        """Load a missing entry, sharing one load among concurrent callers"""
+        with self._lock:
+            future = self._loading.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._loading[key] = future
+        if not owner:
+            return future.result()
+
+        try:
+            value = self._load(key, args, kwargs)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                # clear() may have detached this load and a newer one taken its place
+                if self._loading.get(key) is future:
+                    del self._loading[key]
+
+    def _load(self, key: str, args: Tuple, kwargs: Dict[str, Any], hits: int = 1) -> Any:
+        """Run the loader and swap its result into the cache unless cleared meanwhile"""
+        with self._lock:
+            generation = self._generation
+        value = self.func(*args, **kwargs)
+        now = time.monotonic()
+        with self._lock:
+            if generation != self._generation:
+                return value
+            self._entries[key] = _Entry(
+                value=value,
+                args=args,
+                kwargs=kwargs,
+                fetched_at=now,
+                expires_at=now + self.ttl,
+                hits=hits
+            )
+        return value
+
+    def revalidate(self, key: str) -> None:
+        """Re-fetch an entry in the background, once per key at a time"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or key in self._inflight:
+                return
+            self._inflight.add(key)
+        _executor.submit(self._refresh, key, entry)
+
+    def _refresh(self, key: str, entry: _Entry) -> None:
+        """Background refresh of one entry; the old result stays on failure"""
+        start = time.perf_counter()
+        try:
+            # Hits reset with every refresh, so only entries that stay in use keep refreshing
+            self._load(key, entry.args, entry.kwargs, hits=0)
+            with self._lock:
+                self.stats['refreshes'] += 1
+            logger.info(
+                f"Refreshed {self.func.__qualname__} in the background "
+                f"({time.perf_counter() - start:.2f}s)"
+            )
+        except Exception as e:
+            with self._lock:
+                self.stats['errors'] += 1
+            logger.error(f"Error refreshing {self.func.__qualname__}: {e}")
+        finally:
+            with self._lock:
+                self._inflight.discard(key)
+
+    def refresh_hot(self, lead: float, hot_hits: int) -> None:
+        """Re-fetch hot entries about to expire and drop entries too stale to serve"""
+        now = time.monotonic()
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if now >= entry.expires_at + self.max_stale:
+                    del self._entries[key]
+            hot = [key for key, entry in self._entries.items()
+                   if entry.hits >= hot_hits and entry.expires_at - now <= lead]
+        for key in hot:
+            self.revalidate(key)
+
+    def clear(self) -> None:
+        """Drop every cached result, including those of loads still running"""
+        with self._lock:
+            self._entries.clear()
+            # Loads already running neither store their result nor serve later callers
+            self._loading.clear()
+            self._generation += 1
+
+
+# Caches by loader name; Streamlit re-defines loaders on every script run
+_caches: Dict[str, SWRCache] = {}
+_caches_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=settings.swr_refresh_workers,
+                               thread_name_prefix='swr-refresh')
+_refresher: Optional[threading.Thread] = None
+
+
+def _refresh_loop() -> None:
+    """Periodically refresh hot entries of every cache"""
+    while True:
+        time.sleep(settings.swr_check_interval)
+        for cache in list(_caches.values()):
+            try:
+                cache.refresh_hot(settings.swr_refresh_lead, settings.swr_hot_hits)
+            except Exception as e:
+                logger.error(f"Error scheduling refreshes for {cache.func.__qualname__}: {e}")
+
+
+def _start_refresher() -> None:
+    """Start the refresher thread once per process"""
+    global _refresher
+    if _refresher is None:
+        _refresher = threading.Thread(target=_refresh_loop, name='swr-refresher', daemon=True)
+        _refresher.start()
+
+
+def swr_cached(ttl: Optional[int] = None, max_stale: Optional[int] = None) -> Callable:
+    """
+    Cache a data loader with stale-while-revalidate semantics
+
+    The cache key is built from the call's arguments only, and refreshes run
+    on a background thread without a Streamlit script context. Loaders must
+    therefore take every input that affects their result as an argument (not
+    read session state or script globals) and must not call ``st.*``.
+
+    Args:
+        ttl (int, optional): Seconds a result is fresh; defaults to ``settings.cache_ttl``
+        max_stale (int, optional): Seconds an expired result may still be served
+            while it refreshes; defaults to ``settings.swr_max_stale``
+
+    Returns:
+        callable: Decorator; the wrapped loader gains a ``clear()`` method
+    """
+    def decorator(func: Callable) -> Callable:
+        name = f"{func.__module__}.{func.__qualname__}"
+        with _caches_lock:
+            cache = _caches.get(name)
+            if cache is None:
+                cache = SWRCache(
+                    func,
+                    ttl if ttl is not None else settings.cache_ttl,
+                    max_stale if max_stale is not None else settings.swr_max_stale
+                )
+                _caches[name] = cache
+            else:
+                # Keep the cached results, run the latest definition from now on
+                cache.func = func
+            _start_refresher()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return cache.get(*args, **kwargs)
+
+        wrapper.clear = cache.clear
+        wrapper.cache = cache
+        return wrapper
+    return decorator
+
+
+def get_swr_cache_stats() -> Dict[str, Dict[str, int]]:
+    """Get hit, stale-serve, miss and refresh counts per loader"""
+    stats = {}
+    for name, cache in list(_caches.items()):
+        with cache._lock:
+            stats[name] = dict(cache.stats, entries=len(cache._entries))
+    return stats